@@ -0,0 +1,63 @@
+"""Test the collate function."""
+
+import torch
+
+from topobenchmarkx.dataloader import DataloadDataset
+from topobenchmarkx.dataloader.utils import block_diag, collate_fn, to_data_list
+from topobenchmarkx.transforms.liftings.graph2simplicial import SimplicialCliqueLifting
+
+
+class TestCollateFn:
+    """Test collate_fn."""
+
+    def test_collate(self, simple_graph_1):
+        """Test the block-diagonal batching of lifted graphs.
+
+        Parameters
+        ----------
+        simple_graph_1 : torch_geometric.data.Data
+            A simple graph.
+        """
+        lifting = SimplicialCliqueLifting(complex_dim=2)
+        data_list = [lifting(simple_graph_1), lifting(simple_graph_1.clone())]
+        for data in data_list:
+            del data.num_nodes
+        # An uncoalesced input is coalesced in the batch
+        incidence = data_list[1].incidence_1
+        data_list[1].incidence_1 = torch.sparse_coo_tensor(
+            incidence.indices().flip(1),
+            incidence.values().flip(0),
+            incidence.shape,
+        )
+        dataset = DataloadDataset(data_list)
+        batch = collate_fn([dataset.get(i) for i in range(len(dataset))])
+
+        expected = torch.block_diag(
+            *[data.incidence_1.to_dense() for data in data_list]
+        )
+        assert batch.incidence_1.is_coalesced()
+        assert torch.equal(batch.incidence_1.to_dense(), expected)
+        n_edges = data_list[0].x_1.shape[0]
+        assert batch.batch_1.tolist() == [0] * n_edges + [1] * n_edges
+        assert batch.cell_statistics.dtype == torch.long
+        assert batch.cell_statistics.shape[0] == 2
+
+        for data, separated in zip(data_list, to_data_list(batch), strict=True):
+            assert torch.equal(
+                data.incidence_1.to_dense(), separated.incidence_1.to_dense()
+            )
+            assert torch.equal(data.x_1, separated.x_1)
+
+    def test_block_diag(self):
+        """Test the block-diagonal stacking of sparse matrices."""
+        matrices = [
+            torch.randn(2, 3).relu().to_sparse(),
+            torch.randn(0, 1).to_sparse(),
+            torch.randn(4, 2).relu().to_sparse(),
+        ]
+        matrix, slices = block_diag(matrices)
+        assert torch.equal(
+            matrix.to_dense(),
+            torch.block_diag(*[m.to_dense() for m in matrices]),
+        )
+        assert slices.tolist() == [[0, 0], [2, 3], [2, 4], [6, 6]]
@@ -0,0 +1,52 @@
+import torch
+from torch_geometric.data import Data
+
+from topobenchmarkx.dataloader import ColumnarDataset, DataloadDataset
+from topobenchmarkx.dataloader.utils import collate_fn
+
+
+class TestColumnarDataset:
+
+    def setup_method(self):
+        incidence = torch.sparse_coo_tensor(
+            torch.tensor([[0, 2], [0, 0]]), torch.ones(2), size=(3, 1)
+        ).coalesce()
+        self.data_list = [
+            Data(
+                x=torch.randn(4, 6),
+                edge_index=torch.randint(0, 4, (2, 4)),
+                incidence_1=incidence,
+            ),
+            Data(
+                x=torch.randn(3, 6),
+                edge_index=torch.randint(0, 3, (2, 3)),
+                incidence_1=incidence,
+                x_1=torch.randn(5, 6),
+            ),
+        ]
+        self.dataset = ColumnarDataset(self.data_list)
+
+    def test_len(self):
+        assert len(self.dataset) == 2
+
+    def test_get(self):
+        expected = DataloadDataset(self.data_list)
+        for i in range(len(self.data_list)):
+            values, keys = self.dataset.get(i)
+            expected_values, expected_keys = expected.get(i)
+
+            assert sorted(keys) == sorted(expected_keys)
+            for key, value in zip(keys, values, strict=True):
+                expected_value = expected_values[expected_keys.index(key)]
+                if value.is_sparse:
+                    value = value.to_dense()
+                    expected_value = expected_value.to_dense()
+                assert torch.equal(value, expected_value)
+
+        # Graphs with every field share the key list of the schema
+        assert self.dataset.get(1)[1] is self.dataset.schema
+
+    def test_collate(self):
+        batch = collate_fn([self.dataset.get(i) for i in range(2)])
+        assert batch.x.shape == (7, 6)
+        assert batch.incidence_1.shape == (6, 2)
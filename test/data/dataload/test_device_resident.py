@@ -0,0 +1,40 @@
+import torch
+from torch_geometric.data import Data
+
+from topobenchmarkx.dataloader import DataloadDataset, TBXDataloader
+
+
+class TestDeviceResident:
+
+    def setup_method(self):
+        data = Data(
+            x=torch.randn(5, 2),
+            x_0=torch.randn(5, 2),
+            y=torch.tensor([0, 1, 0, 1, 0]),
+            incidence_1=torch.eye(5, 3).to_sparse(),
+            train_mask=torch.tensor([0, 1]),
+        )
+        self.datamodule = TBXDataloader(
+            DataloadDataset([data]), device_resident=True
+        )
+
+    def test_dataloaders(self):
+        # The complex is collated once and served by all the dataloaders
+        train_loader = self.datamodule.train_dataloader()
+        assert len(train_loader) == 1
+        batch = next(iter(train_loader))
+        assert next(iter(self.datamodule.val_dataloader())) is batch
+        assert next(iter(self.datamodule.test_dataloader())) is batch
+        assert batch.batch_0.tolist() == [0] * 5
+
+    def test_transfer_batch_to_device(self):
+        batch = next(iter(self.datamodule.train_dataloader()))
+        device = torch.device("cpu")
+        step_batch = self.datamodule.transfer_batch_to_device(batch, device, 0)
+        cached = self.datamodule._device_batch
+        # Fields replaced during a step do not leak into the next steps
+        step_batch.x_0 = torch.zeros(5, 2)
+        other = self.datamodule.transfer_batch_to_device(batch, device, 0)
+        assert self.datamodule._device_batch is cached
+        assert other.x_0 is cached.x_0
+        assert not torch.equal(other.x_0, step_batch.x_0)
@@ -0,0 +1,73 @@
+import torch
+from torch_geometric.data import Data
+
+from topobenchmarkx.dataloader import BucketBatchSampler, DataloadDataset, TBXDataloader
+from topobenchmarkx.dataloader.sampler import get_sample_sizes
+
+
+class TestBucketBatchSampler:
+
+    def setup_method(self):
+        self.sizes = torch.randint(1, 20, (50,))
+
+    def test_batch_size(self):
+        sampler = BucketBatchSampler(self.sizes, batch_size=4, bucket_size=3)
+        batches = list(sampler)
+        assert sorted(idx for batch in batches for idx in batch) == list(range(50))
+        assert all(len(batch) <= 4 for batch in batches)
+        # Batches are cut from size-sorted buckets of 12 samples
+        assert len(batches) == 4 * 3 + 1
+
+    def test_drop_last(self):
+        sampler = BucketBatchSampler(self.sizes, batch_size=4, bucket_size=2, drop_last=True)
+        batches = list(sampler)
+        # Only the last incomplete batch of the epoch is dropped
+        assert all(len(batch) == 4 for batch in batches)
+        indices = [idx for batch in batches for idx in batch]
+        assert len(indices) == len(set(indices)) == 48
+
+    def test_max_cost(self):
+        sampler = BucketBatchSampler(self.sizes, max_cost=30)
+        batches = sampler.get_batches()
+        assert sorted(idx for batch in batches for idx in batch) == list(range(50))
+        for batch in batches:
+            assert len(batch) == 1 or self.sizes[batch].sum() <= 30
+        assert len(sampler) == len(batches)
+
+    def test_determinism(self):
+        sampler = BucketBatchSampler(self.sizes, batch_size=4, seed=1)
+        other = BucketBatchSampler(self.sizes, batch_size=4, seed=1)
+        assert list(sampler) == list(other)
+        # The permutation changes across epochs
+        sampler.set_epoch(0)
+        first_epoch = list(sampler)
+        assert list(sampler) != first_epoch
+        sampler.set_epoch(0)
+        assert list(sampler) == first_epoch
+
+    def test_partial_epoch(self):
+        sampler = BucketBatchSampler(self.sizes, batch_size=4, seed=1)
+        first_epoch = list(sampler)
+        # A pass stopped early still moves to the next permutation
+        sampler.set_epoch(0)
+        assert next(iter(sampler)) == first_epoch[0]
+        second_epoch = list(sampler)
+        assert second_epoch != first_epoch
+        assert len(sampler) == len(second_epoch)
+
+    def test_dataloader(self):
+        data_list = [
+            Data(x=torch.randn(n, 2), x_0=torch.randn(n, 2), x_1=torch.randn(2 * n, 2), y=torch.tensor([0]))
+            for n in range(1, 9)
+        ]
+        dataset = DataloadDataset(data_list)
+        assert get_sample_sizes(dataset).tolist() == [3 * n for n in range(1, 9)]
+
+        datamodule = TBXDataloader(
+            dataset, dataset, dataset, batch_size=2, bucket_by="cells", max_batch_cost=12
+        )
+        num_graphs = 0
+        for batch in datamodule.train_dataloader():
+            assert batch.x_0.shape[0] + batch.x_1.shape[0] <= 12 or batch.num_graphs == 1
+            num_graphs += batch.num_graphs
+        assert num_graphs == len(data_list)
@@ -0,0 +1,125 @@
+import pytest
+import torch
+
+from topobenchmarkx.dataloader import DataloadDataset, TBXDataloader
+from topobenchmarkx.dataloader.subcomplex import (
+    SubComplexDataset,
+    induced_subcomplex,
+    partition_nodes,
+)
+from topobenchmarkx.transforms.data_manipulations import (
+    CalculateSimplicialCurvature,
+    InterrankIncidences,
+    NodeDegrees,
+)
+from topobenchmarkx.transforms.liftings.graph2cell import CellCycleLifting
+
+
+class TestSubComplex:
+
+    def setup_method(self):
+        self.lifting = CellCycleLifting()
+
+    def lift(self, data):
+        data = self.lifting.forward(data.clone())
+        data.y = torch.arange(data.num_nodes)
+        data.train_mask = torch.arange(0, data.num_nodes, 2)
+        return data
+
+    def test_partition_nodes(self, simple_graph_1):
+        parts = partition_nodes(
+            simple_graph_1.edge_index, simple_graph_1.num_nodes, 3
+        )
+        assert parts.shape == (simple_graph_1.num_nodes,)
+        assert torch.bincount(parts).tolist() == [3, 3, 2]
+
+    def test_induced_subcomplex(self, simple_graph_1):
+        data = self.lift(simple_graph_1)
+        nodes = torch.tensor([0, 1, 2, 3, 4])
+        sub = induced_subcomplex(data, nodes)
+
+        assert torch.equal(sub.x_0, data.x_0[nodes])
+        assert torch.equal(sub.y, nodes)
+        assert sub.train_mask.tolist() == [True, False, True, False, True]
+        assert sub.shape == [sub.x_0.shape[0], sub.x_1.shape[0], sub.x_2.shape[0]]
+
+        # The kept edges are the edges between kept nodes
+        incidence_1 = data.incidence_1.to_dense()
+        edges = incidence_1[nodes].abs().sum(0) == 2
+        assert torch.equal(
+            sub.incidence_1.to_dense(), incidence_1[nodes][:, edges]
+        )
+        # The kept 2-cells are the cells whose edges are all kept
+        incidence_2 = data.incidence_2.to_dense()
+        cells = (incidence_2[~edges] == 0).all(0)
+        assert torch.equal(
+            sub.incidence_2.to_dense(), incidence_2[edges][:, cells]
+        )
+        assert torch.equal(
+            sub.down_laplacian_1.to_dense(),
+            data.down_laplacian_1.to_dense()[edges][:, edges],
+        )
+        assert sub.edge_index.max() < nodes.shape[0]
+
+    def test_interrank_incidences(self, simple_graph_1):
+        data = self.lift(simple_graph_1)
+        data = InterrankIncidences(
+            routes=[[[0, 1], "coboundary"], [[2, 1], "boundary"]]
+        )(data)
+        nodes = torch.tensor([0, 1, 2, 3, 4])
+        sub = induced_subcomplex(data, nodes)
+
+        edges = data.incidence_1.to_dense()[nodes].abs().sum(0) == 2
+        cells = (data.incidence_2.to_dense()[~edges] == 0).all(0)
+        # The coboundary incidence has the edges as rows
+        coboundary = data.interrank_incidence_0_1.to_dense()
+        assert coboundary.shape[0] != coboundary.shape[1]
+        assert torch.equal(
+            sub.interrank_incidence_0_1.to_dense(),
+            coboundary[edges][:, nodes],
+        )
+        assert torch.equal(
+            sub.interrank_incidence_2_1.to_dense(),
+            data.interrank_incidence_2_1.to_dense()[edges][:, cells],
+        )
+
+    def test_per_cell_fields(self, simple_graph_1):
+        data = self.lift(simple_graph_1)
+        data = NodeDegrees(selected_fields=["edge_index", "incidence"])(data)
+        data = CalculateSimplicialCurvature()(data)
+        nodes = torch.tensor([0, 1, 2, 3, 4])
+        sub = induced_subcomplex(data, nodes)
+
+        edges = data.incidence_1.to_dense()[nodes].abs().sum(0) == 2
+        assert torch.equal(sub.node_degrees, data.node_degrees[nodes])
+        assert torch.equal(sub["0_cell_degrees"], data["0_cell_degrees"][nodes])
+        assert torch.equal(sub["1_cell_degrees"], data["1_cell_degrees"][edges])
+        assert torch.equal(
+            sub["0_cell_curvature"], data["0_cell_curvature"][nodes]
+        )
+        assert torch.equal(
+            sub["1_cell_curvature"], data["1_cell_curvature"][edges]
+        )
+
+        # Per-cell fields of unknown rank cannot be restricted
+        data.unknown = torch.zeros(data.num_nodes)
+        with pytest.raises(ValueError):
+            induced_subcomplex(data, nodes)
+
+    def test_dataloader(self, simple_graph_1):
+        data = self.lift(simple_graph_1)
+        dataset = SubComplexDataset(data, num_parts=3)
+        assert len(dataset) == 3
+
+        dataloader = TBXDataloader(
+            DataloadDataset([data]), batch_size=2, num_parts=3
+        )
+        batches = list(dataloader.train_dataloader())
+        assert len(batches) == 2
+        assert sum(batch.x_0.shape[0] for batch in batches) == data.num_nodes
+        for batch in batches:
+            assert batch.train_mask.dtype == torch.bool
+            assert batch.incidence_1.shape == (
+                batch.x_0.shape[0],
+                batch.x_1.shape[0],
+            )
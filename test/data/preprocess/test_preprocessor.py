@@ -1,8 +1,10 @@
 """Test the GraphLoader class."""
 
+import os
 from unittest.mock import ANY, MagicMock, patch
 
 import pytest
+import torch
 import torch_geometric
 from omegaconf import DictConfig
 
@@ -154,3 +156,81 @@ class TestPreProcessor:
         split_params = DictConfig({"learning_setting": "invalid"})
         with pytest.raises(ValueError):
             self.preprocessor.load_dataset_splits(split_params)
+
+    def test_apply_pre_transform_parallel(self):
+        """Test that the process pool keeps the output of the serial mode."""
+        data_list = [
+            torch_geometric.data.Data(
+                x=torch.rand(n, 2),
+                edge_index=torch.tensor([[0, 1], [1, 0]]),
+                num_nodes=n,
+            )
+            for n in range(2, 9)
+        ]
+        self.preprocessor.pre_transform = torch_geometric.transforms.AddSelfLoops()
+
+        self.preprocessor.num_workers = 0
+        expected = self.preprocessor.apply_pre_transform(data_list)
+
+        self.preprocessor.num_workers = 2
+        self.preprocessor.chunk_size = 3
+        result = self.preprocessor.apply_pre_transform(data_list)
+
+        assert len(result) == len(expected)
+        for res, exp in zip(result, expected):
+            assert torch.equal(res.x, exp.x)
+            assert torch.equal(res.edge_index, exp.edge_index)
+
+    def test_stage_data_dirs(self):
+        """Test that the last cached stage is the processed data dir."""
+        pre_transforms_dict = {
+            "lifting": MagicMock(parameters={"complex_dim": 2}),
+            "degrees": MagicMock(parameters={"max_degree": 5}),
+        }
+        transforms_config = DictConfig(
+            {"lifting": {"a": 1}, "degrees": {"b": 2}}
+        )
+        self.preprocessor.set_processed_data_dir(
+            pre_transforms_dict, self.data_dir, transforms_config
+        )
+        stage_dirs = self.preprocessor.stage_data_dirs
+
+        assert len(stage_dirs) == 2
+        assert stage_dirs[-1] == self.preprocessor.processed_data_dir
+        assert stage_dirs[0].startswith(os.path.join(self.data_dir, "lifting"))
+
+    def test_apply_cached_stages(self, tmp_path):
+        """Test that cached stages are reused.
+
+        Parameters
+        ----------
+        tmp_path : pathlib.Path
+            Temporary directory.
+        """
+        data_list = [
+            torch_geometric.data.Data(
+                x=torch.rand(3, 2), edge_index=torch.tensor([[0, 1], [1, 2]])
+            )
+            for _ in range(4)
+        ]
+        self.preprocessor.num_workers = 0
+        self.preprocessor.transforms_parameters = {"first": {}, "second": {}}
+        self.preprocessor.stage_data_dirs = [
+            str(tmp_path / "first"),
+            str(tmp_path / "first_second"),
+        ]
+        self.preprocessor.pre_transforms_dict = {
+            "first": torch_geometric.transforms.ToUndirected(),
+            "second": torch_geometric.transforms.AddSelfLoops(),
+        }
+        expected = self.preprocessor.apply_cached_stages(data_list)
+        assert os.path.exists(tmp_path / "first" / "data.pt")
+
+        # The first stage is loaded from disk instead of being recomputed
+        first = MagicMock(side_effect=AssertionError("Stage recomputed"))
+        self.preprocessor.pre_transforms_dict["first"] = first
+        result = self.preprocessor.apply_cached_stages(data_list)
+
+        first.assert_not_called()
+        for res, exp in zip(result, expected):
+            assert torch.equal(res.edge_index, exp.edge_index)
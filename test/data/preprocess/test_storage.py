@@ -0,0 +1,88 @@
+"""Test the ShardedStorage class."""
+
+import pytest
+import torch
+import torch_geometric
+
+from topobenchmarkx.data.preprocessor import ShardedStorage
+from topobenchmarkx.data.utils.split_utils import (
+    SplitView,
+    assing_train_val_test_mask_to_graphs,
+)
+
+
+class TestShardedStorage:
+    """Test the ShardedStorage class."""
+
+    def setup_method(self):
+        """Test setup."""
+        self.data_list = []
+        for n in range(1, 6):
+            incidence = torch.sparse_coo_tensor(
+                torch.tensor([[0, n - 1], [0, 0]]),
+                torch.tensor([1.0, 1.0]),
+                size=(n, 1),
+            ).coalesce()
+            self.data_list.append(
+                torch_geometric.data.Data(
+                    x=torch.rand(n, 3),
+                    y=torch.tensor([n]),
+                    incidence_1=incidence,
+                    shape=[n, 1],
+                )
+            )
+
+    def test_save_and_load(self, tmp_path):
+        """Test that the decoded graphs match the saved ones.
+
+        Parameters
+        ----------
+        tmp_path : pathlib.Path
+            Temporary directory.
+        """
+        ShardedStorage.save(self.data_list, str(tmp_path), shard_size=2)
+        storage = ShardedStorage(str(tmp_path))
+
+        assert len(storage) == len(self.data_list)
+        assert storage.num_shards == 3
+        for data, expected in zip(storage, self.data_list):
+            assert torch.equal(data.x, expected.x)
+            assert torch.equal(data.y, expected.y)
+            assert data.shape == expected.shape
+            assert data.incidence_1.is_coalesced()
+            assert torch.equal(
+                data.incidence_1.to_dense(), expected.incidence_1.to_dense()
+            )
+        assert torch.equal(storage[-1].x, self.data_list[-1].x)
+
+    def test_lazy_splits(self, tmp_path):
+        """Test that the splits of a sharded dataset decode graphs lazily.
+
+        Parameters
+        ----------
+        tmp_path : pathlib.Path
+            Temporary directory.
+        """
+        ShardedStorage.save(self.data_list, str(tmp_path), shard_size=2)
+
+        class ShardedDataset:
+            storage = ShardedStorage(str(tmp_path))
+
+        split_idx = {"train": [0, 3, 4], "valid": [1], "test": [2]}
+        train, val, test = assing_train_val_test_mask_to_graphs(
+            ShardedDataset(), split_idx
+        )
+        assert isinstance(train.data_lst, SplitView)
+        assert len(train) == 3 and len(val) == 1 and len(test) == 1
+
+        values, keys = train.get(1)
+        data = dict(zip(keys, values))
+        assert torch.equal(data["x"], self.data_list[3].x)
+        assert data["train_mask"].tolist() == [1]
+        assert data["val_mask"].tolist() == [0]
+        data = val[0]
+        assert dict(zip(data[1], data[0]))["val_mask"].tolist() == [1]
+
+        split_idx["test"] = []
+        with pytest.raises(ValueError):
+            assing_train_val_test_mask_to_graphs(ShardedDataset(), split_idx)
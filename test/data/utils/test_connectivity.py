@@ -0,0 +1,84 @@
+"""Test the connectivity utilities."""
+
+import pytest
+import torch
+from topomodelx.utils.sparse import from_sparse
+from toponetx.classes import SimplicialComplex
+
+from topobenchmarkx.data.utils import (
+    get_complex_connectivity,
+    get_simplicial_closure,
+    get_simplicial_connectivity,
+)
+
+
+class TestSimplicialConnectivity:
+    """Test the native simplicial connectivity builder."""
+
+    def setup_method(self):
+        """Test setup."""
+        self.complex = SimplicialComplex(
+            [(0, 1, 2, 3), (2, 4), (4, 5, 6), (1, 5), (7,)]
+        )
+        self.simplices = [
+            torch.tensor(
+                sorted(tuple(sorted(s)) for s in self.complex.skeleton(rank))
+            ).reshape(-1, rank + 1)
+            for rank in range(self.complex.dim + 1)
+        ]
+
+    @pytest.mark.parametrize("signed", [False, True])
+    def test_matches_toponetx(self, signed):
+        """Test that the matrices match the toponetx ones.
+
+        Parameters
+        ----------
+        signed : bool
+            Whether to compute signed matrices.
+        """
+        connectivity = get_simplicial_connectivity(
+            self.simplices, 3, signed=signed
+        )
+        for rank in range(self.complex.dim + 1):
+            for name in [
+                "incidence",
+                "down_laplacian",
+                "up_laplacian",
+                "adjacency",
+                "hodge_laplacian",
+            ]:
+                try:
+                    expected = from_sparse(
+                        getattr(self.complex, f"{name}_matrix")(
+                            rank=rank, signed=signed
+                        )
+                    )
+                except ValueError:
+                    continue
+                result = connectivity[f"{name}_{rank}"]
+                assert result.shape == expected.shape
+                assert torch.equal(result.indices(), expected.indices())
+                assert torch.equal(result.values(), expected.values())
+        assert list(connectivity["shape"]) == [8, 11, 5, 1]
+
+    def test_neighborhoods(self):
+        """Test that only the selected matrices are computed."""
+        connectivity = get_complex_connectivity(
+            self.complex, 3, neighborhoods=["up_laplacian", "adjacency_1"]
+        )
+        expected_keys = {f"incidence_{rank}" for rank in range(4)}
+        expected_keys |= {f"up_laplacian_{rank}" for rank in range(4)}
+        expected_keys |= {"adjacency_1", "shape"}
+        assert set(connectivity.keys()) == expected_keys
+
+    def test_closure(self):
+        """Test that the closure adds the missing faces."""
+        maximal = [
+            torch.tensor([[7]]),
+            torch.tensor([[2, 4], [1, 5], [2, 4]]),
+            torch.tensor([[4, 5, 6]]),
+            torch.tensor([[0, 1, 2, 3]]),
+        ]
+        closed = get_simplicial_closure(maximal)
+        for result, expected in zip(closed, self.simplices, strict=True):
+            assert torch.equal(result, expected)
@@ -1,11 +1,15 @@
 """Unit tests for TopoTune."""
 
+from pathlib import Path
+
+import hydra
 import pytest
 import torch
 from torch_geometric.data import Data
 from test._utils.nn_module_auto_test import NNModuleAutoTest
-from topobenchmarkx.nn.backbones.combinatorial.gccn import TopoTune, interrank_boundary_index, get_activation
+from topobenchmarkx.nn.backbones.combinatorial.gccn import TopoTune, get_activation
 from torch_geometric.nn import GCNConv
+from torch_geometric.nn.models import GIN
 from omegaconf import OmegaConf
 
 class MockGNN(torch.nn.Module):
@@ -167,39 +171,17 @@ def test_topotune_methods():
     routes = OmegaConf.create([[[0, 0], "adjacency"], [[1, 0], "boundary"]])
     topotune = TopoTune(gnn, routes, 2, False, "relu")
 
-    # Test generate_membership_vectors
-    membership = topotune.generate_membership_vectors(batch)
-    assert 0 in membership and 1 in membership and 2 in membership
-    assert membership[0].shape == (batch.x_0.shape[0],)
-    assert membership[1].shape == (batch.x_1.shape[0],)
-    assert membership[2].shape == (batch.x_2.shape[0],)
-
-    # Test get_nbhd_cache
-    nbhd_cache = topotune.get_nbhd_cache(batch)
-    assert (1, 0) in nbhd_cache
-    assert isinstance(nbhd_cache[(1, 0)], tuple)
-    assert len(nbhd_cache[(1, 0)]) == 2
-
-    # Test intrarank_expand
-    expanded = topotune.intrarank_expand(batch, 0, "adjacency")
-    assert isinstance(expanded, Data)
-    assert expanded.x.shape == (3, 16)
-    assert expanded.edge_index.shape[0] == 2
-
-    # Test intrarank_gnn_forward
-    output = topotune.intrarank_gnn_forward(expanded, 0, 0)
-    assert output.shape == (3, 16) 
-
-    # Test interrank_expand
-    membership = topotune.generate_membership_vectors(batch)
-    expanded = topotune.interrank_expand(batch, 1, 0, nbhd_cache[(1, 0)], membership)
-    assert isinstance(expanded, Data)
-    assert expanded.x.shape[1] == 16
-    assert expanded.edge_index.shape[0] == 2
-
-    # Test interrank_gnn_forward
-    output = topotune.interrank_gnn_forward(expanded, 0, 0, 3)
-    assert output.shape == (3, 16)  
+    # Test get_route_index and routes_forward
+    route_index = topotune.get_route_index(batch)
+    assert set(route_index) == {0, 1}
+    assert route_index[1].shape == (2, batch.incidence_1._nnz())
+    x_out_per_route = topotune.routes_forward(batch, 0, route_index)
+    assert x_out_per_route[0].shape == (3, 16)
+    # The interrank route only returns the destination cells
+    assert x_out_per_route[1].shape == (3, 16)
+    x_in = torch.vstack([torch.zeros_like(batch.x_0), batch.x_1])
+    expected = topotune.graph_routes[0][1](x_in, route_index[1])[:3]
+    assert torch.allclose(x_out_per_route[1], expected)
 
     # Test aggregate_inter_nbhd
     x_out_per_route = {0: torch.randn(3, 16), 1: torch.randn(3, 16)}
@@ -212,16 +194,66 @@ def test_topotune_methods():
     output = topotune.readout(x)
     assert output.shape == (16,)
 
-def test_interrank_boundary_index():
-    """Test the interrank_boundary_index function."""
-    x_src = torch.randn(15, 16)
-    boundary_index = [torch.randint(0, 10, (30,)), torch.randint(0, 15, (30,))]
-    n_dst_nodes = 10
-    
-    edge_index, edge_attr = interrank_boundary_index(x_src, boundary_index, n_dst_nodes)
-    
-    assert edge_index.shape == (2, 30)
-    assert edge_attr.shape == (30, 16)
+def test_get_route_index():
+    """Test the edge indices of the Hasse graphs of the routes."""
+    batch = create_mock_complex_batch()
+    gnn = MockGNN(16, 32, 16)
+    routes = OmegaConf.create([[[0, 0], "adjacency"], [[1, 0], "boundary"], [[0, 1], "coboundary"]])
+    topotune = TopoTune(gnn, routes, 2, False, "relu")
+
+    route_index = topotune.get_route_index(batch)
+    assert torch.equal(route_index[0], batch.adjacency_0.indices())
+    # Source cells are shifted after the 3 destination cells
+    assert route_index[1].tolist() == [[0, 0, 1, 1, 2, 2], [3, 5, 3, 4, 4, 5]]
+    assert route_index[2].tolist() == [[0, 0, 1, 1, 2, 2], [3, 4, 4, 5, 3, 5]]
+
+    # Precomputed interrank incidences are read from the batch
+    batch.interrank_incidence_1_0 = torch.sparse_coo_tensor(
+        torch.tensor([[0], [0]]), torch.ones(1), (3, 3)
+    ).coalesce()
+    assert topotune.get_route_index(batch)[1].tolist() == [[0], [3]]
+
+def test_fuse_routes():
+    """Test that the fused execution of the routes matches the sequential one."""
+    gnn = GIN(16, 16, 2, 16)
+    gnn.hidden_channels = 16
+    routes = OmegaConf.create([[[0, 0], "adjacency"], [[1, 0], "boundary"], [[2, 1], "boundary"], [[2, 2], "adjacency"]])
+    topotune = TopoTune(gnn, routes, 2, False, "relu")
+    fused = TopoTune(gnn, routes, 2, False, "relu", fuse_routes=True)
+    fused.load_state_dict(topotune.state_dict())
+
+    batch = create_mock_complex_batch()
+    out = topotune(batch.clone())
+    fused_out = fused(batch.clone())
+    for rank in out:
+        assert torch.allclose(out[rank], fused_out[rank], atol=1e-6)
+
+    for gnn_norm in ["batch_norm", "layer_norm", "graph_norm"]:
+        with pytest.raises(ValueError):
+            TopoTune(GIN(16, 16, 2, 16, norm=gnn_norm), routes, 2, False, "relu", fuse_routes=True)
+    batch_norm = GIN(16, 16, 2, 16, norm="batch_norm", norm_kwargs={"track_running_stats": False})
+    with pytest.raises(ValueError):
+        TopoTune(batch_norm, routes, 2, False, "relu", fuse_routes=True)
+
+@pytest.mark.parametrize("domain", ["cell", "simplicial"])
+def test_fused_config(domain):
+    """Test that the fused TopoTune configs run like the sequential routes."""
+    config_path = Path(__file__).parents[4] / "configs" / "model" / domain
+    cfg = OmegaConf.create(
+        {"model": OmegaConf.load(config_path / "topotune_fused.yaml")}
+    )
+    cfg.model.feature_encoder.out_channels = 16
+    fused = hydra.utils.instantiate(cfg.model.backbone)
+    assert fused.fuse_routes
+    cfg.model.backbone.fuse_routes = False
+    topotune = hydra.utils.instantiate(cfg.model.backbone)
+    topotune.load_state_dict(fused.state_dict())
+
+    batch = create_mock_complex_batch()
+    out = topotune(batch.clone())
+    fused_out = fused(batch.clone())
+    for rank in out:
+        assert torch.allclose(out[rank], fused_out[rank], atol=1e-6)
 
 def test_get_activation():
     """Test the get_activation function."""
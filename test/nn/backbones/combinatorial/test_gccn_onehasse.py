@@ -179,20 +179,19 @@ def test_topotune_onehasse_methods():
     assert membership[0].shape == (batch.x_0.shape[0],)
     assert membership[1].shape == (batch.x_1.shape[0],)
     assert membership[2].shape == (batch.x_2.shape[0],)
+    two_graphs = Data(cell_statistics=torch.tensor([[2, 1], [1, 0]]))
+    assert topotune.generate_membership_vectors(two_graphs)[0].tolist() == [0, 0, 1]
+    assert topotune.generate_membership_vectors(two_graphs)[1].tolist() == [0]
 
     # Set the membership attribute (simulating the forward method)
     topotune.membership = membership
 
-    # Test all_nbhds_expand
-    expanded = topotune.all_nbhds_expand(batch, membership)
-    assert isinstance(expanded, Data)
-    assert expanded.x.shape == (7, 16)  # (3 nodes + 3 edges + 1 face) * 2 batches
-    assert expanded.edge_index.shape[0] == 2
-    assert expanded.batch.shape == (7,)
-
-    # Test all_nbhds_gnn_forward
-    output = topotune.all_nbhds_gnn_forward(expanded, 0)
-    assert output.shape == (7, 16)
+    # Test get_hasse_index, edges being shifted after the 3 nodes
+    edge_index = topotune.get_hasse_index(batch)
+    assert edge_index.tolist() == [
+        [0, 0, 1, 1, 2, 2, 0, 0, 1, 1, 2, 2],
+        [1, 2, 0, 2, 0, 1, 3, 5, 3, 4, 4, 5],
+    ]
 
     # Test aggregate_inter_nbhd
     x_out = torch.randn(7, 16)
@@ -210,6 +209,14 @@ def test_topotune_onehasse_methods():
     assert output[1].shape == (3, 16)  # 3 edges * 2 batches
     assert output[2].shape == (1, 16)  # 1 face * 2 batches
 
+    # A single identity layer runs the GNN once on the Hasse graph
+    topotune = TopoTune_OneHasse(gnn, routes, 1, False, "id")
+    batch = create_mock_complex_batch()
+    x = torch.cat([batch.x_0, batch.x_1, batch.x_2])
+    expected = topotune.graph_routes[0](x, topotune.get_hasse_index(batch))
+    output = topotune(batch)
+    assert torch.allclose(torch.cat([output[0], output[1], output[2]]), expected)
+
 def test_get_activation():
     """Test the get_activation function."""
     relu_func = get_activation("relu")
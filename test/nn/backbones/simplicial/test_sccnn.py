@@ -4,6 +4,7 @@ import torch
 from torch_geometric.utils import get_laplacian
 from ...._utils.nn_module_auto_test import NNModuleAutoTest
 from topobenchmarkx.nn.backbones.simplicial import SCCNNCustom
+from topobenchmarkx.nn.backbones.simplicial.sccnn import SCCNNLayer
 from topobenchmarkx.transforms.liftings.graph2simplicial import (
     SimplicialCliqueLifting,
 )
@@ -36,3 +37,25 @@ def test_SCCNNCustom(simple_graph_1):
         },
     ])
     auto_test.run()
+
+
+def test_SCCNNLayer_neighborhood_size_inv(simple_graph_1):
+    data = SimplicialCliqueLifting(complex_dim=3, signed=True)(simple_graph_1)
+    laplacian = data.down_laplacian_1
+    expected = 1 / laplacian.to_dense().sum(1)
+    expected[~torch.isfinite(expected)] = 0
+
+    result = SCCNNLayer.neighborhood_size_inv(laplacian)
+    assert torch.allclose(result, expected)
+
+    model = SCCNNCustom((data.x.shape[1], 1, 1), (4, 4, 4), 2, 3, aggr_norm=True)
+    x_all = (data.x, torch.ones(data.x_1.shape[0], 1), torch.ones(data.x_2.shape[0], 1))
+    laplacian_all = (
+        data.hodge_laplacian_0,
+        data.down_laplacian_1,
+        data.up_laplacian_1,
+        data.down_laplacian_2,
+        data.up_laplacian_2,
+    )
+    out = model(x_all, laplacian_all, (data.incidence_1, data.incidence_2))
+    assert all(torch.isfinite(x).all() for x in out)
@@ -6,9 +6,11 @@ import torch_geometric
 
 from topobenchmarkx.transforms.data_manipulations import (
     InfereKNNConnectivity,
+    InterrankIncidences,
     InfereRadiusConnectivity,
     KeepSelectedDataFields,
     NodeDegrees,
+    NormalizeLaplacians,
     NodeFeaturesToFloat,
     OneHotDegreeFeatures,
     CalculateSimplicialCurvature,
@@ -95,6 +97,21 @@ class TestCollateFunction:
             data.node_degrees == expected_degrees
         ).all(), "Node degrees do not match"
 
+    def test_node_degrees_incidence(self):
+        """Test node degrees of sparse incidence matrices."""
+        data = self.data_2.clone()
+        data.incidence_1 = torch.tensor(
+            [[-1.0, 1.0, 0.0], [1.0, 0.0, 0.0], [0.0, -1.0, 1.0], [0, 0, 0]]
+        ).to_sparse()
+        data.incidence_2 = torch.tensor([[1.0], [1.0], [1.0]]).to_sparse()
+        data = NodeDegrees(selected_fields=["incidence"])(data)
+        assert torch.equal(
+            data["0_cell_degrees"], torch.tensor([[2.0], [1.0], [2.0], [0.0]])
+        ), "0-cell degrees do not match"
+        assert torch.equal(
+            data["1_cell_degrees"], torch.tensor([[1.0], [1.0], [1.0]])
+        ), "1-cell degrees do not match"
+
     def test_node_feature_float(self):
         """Test node features to float."""
         data = self.node_feature_float(self.data_2.clone())
@@ -132,4 +149,73 @@ class TestCollateFunction:
         data['2_cell_degrees'] = torch.unsqueeze(torch.sum(data['incidence_3'], dim=1).to_dense(), dim=1)
         repr = simplicial_curvature.__repr__()
         
-        res = simplicial_curvature(data)
\ No newline at end of file
+        res = simplicial_curvature(data)
+        incidence_2 = data["incidence_2"].to_dense()
+        incidence_3 = data["incidence_3"].to_dense()
+        up = incidence_3 @ incidence_3.T
+        down = incidence_2.T @ incidence_2
+        term2 = (down - up).fill_diagonal_(0).sum(1, keepdim=True)
+        assert torch.equal(
+            res["2_cell_curvature"], 3 + data["2_cell_degrees"] - term2
+        ), "2-cell curvature does not match"
+
+    def test_simplicial_curvature_missing_rank(self, simple_graph_1):
+        """Test that the curvature of missing ranks is skipped.
+
+        Parameters
+        ----------
+        simple_graph_1 : torch_geometric.data.Data
+            A simple graph.
+        """
+        data = SimplicialCliqueLifting(complex_dim=2)(simple_graph_1)
+        data["0_cell_degrees"] = torch.sum(
+            data["incidence_1"], dim=1
+        ).to_dense().unsqueeze(1)
+        data["1_cell_degrees"] = torch.sum(
+            data["incidence_2"], dim=1
+        ).to_dense().unsqueeze(1)
+        res = CalculateSimplicialCurvature()(data)
+        assert "1_cell_curvature" in res
+        assert "0_cell_curvature" in res
+        assert "2_cell_curvature" not in res
+
+    def test_normalize_laplacians(self, simple_graph_1):
+        """Test the precomputed normalized Hodge Laplacians.
+
+        Parameters
+        ----------
+        simple_graph_1 : torch_geometric.data.Data
+            A simple graph.
+        """
+        data = SimplicialCliqueLifting(complex_dim=2)(simple_graph_1)
+        data = NormalizeLaplacians(
+            selected_fields=["hodge_laplacian_0", "hodge_laplacian_3"]
+        )(data)
+        assert "normalized_hodge_laplacian_3" not in data
+        laplacian = data["hodge_laplacian_0"].to_dense()
+        scale = laplacian.abs().sum(1).rsqrt()
+        expected = scale.unsqueeze(1) * laplacian * scale.unsqueeze(0)
+        assert torch.allclose(
+            data["normalized_hodge_laplacian_0"].to_dense(), expected
+        ), "Normalized Laplacian does not match"
+
+    def test_interrank_incidences(self, simple_graph_1):
+        """Test the precomputed interrank incidences of TopoTune routes.
+
+        Parameters
+        ----------
+        simple_graph_1 : torch_geometric.data.Data
+            A simple graph.
+        """
+        data = SimplicialCliqueLifting(complex_dim=2)(simple_graph_1)
+        routes = [[[1, 1], "adjacency"], [[0, 1], "coboundary"], [[2, 1], "boundary"]]
+        data = InterrankIncidences(routes=routes)(data)
+        assert "interrank_incidence_1_1" not in data
+        assert torch.equal(
+            data["interrank_incidence_0_1"].to_dense(),
+            data["incidence_1"].to_dense().T,
+        )
+        assert torch.equal(
+            data["interrank_incidence_2_1"].to_dense(),
+            data["incidence_2"].to_dense(),
+        )
@@ -98,3 +98,19 @@ class TestConcatentionLifting:
         assert (
             expected_x3 == lifted_data.x_3
         ).all(), "Something is wrong with the lifted features x_3."
+
+    def test_lift_features_unordered_incidence(self):
+        """Test the lift_features method on shuffled incidence entries."""
+        incidence = torch.sparse_coo_tensor(
+            torch.tensor([[3, 0, 2, 1, 0, 2], [1, 2, 0, 1, 0, 2]]),
+            torch.ones(6),
+            size=(4, 3),
+        ).coalesce()
+        data = {
+            "x_0": torch.tensor([[0.0], [1.0], [2.0], [3.0]]),
+            "incidence_1": incidence,
+        }
+        lifted_data = self.lifting.feature_lifting(data)
+
+        expected_x1 = torch.tensor([[0.0, 2.0], [1.0, 3.0], [0.0, 2.0]])
+        assert torch.equal(lifted_data["x_1"], expected_x1)
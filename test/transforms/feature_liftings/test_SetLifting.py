@@ -62,3 +62,29 @@ class TestSetLifting:
         assert (
             expected_x3 == lifted_data.x_3
         ).all(), "Something is wrong with the lifted features x_3."
+
+    def test_lift_features_square_cells(self):
+        """Test the lift_features method on 2-cells with four edges."""
+        # Two squares 0-1-2-3 and 2-3-4-5 sharing the edge (2, 3)
+        edges = torch.tensor(
+            [[0, 1], [0, 3], [1, 2], [2, 3], [2, 5], [3, 4], [4, 5]]
+        )
+        incidence_1 = torch.sparse_coo_tensor(
+            torch.stack(
+                [edges.flatten(), torch.arange(7).repeat_interleave(2)]
+            ),
+            torch.ones(14),
+            size=(6, 7),
+        ).coalesce()
+        incidence_2 = torch.sparse_coo_tensor(
+            torch.tensor([[0, 1, 2, 3, 3, 4, 5, 6], [0, 0, 0, 0, 1, 1, 1, 1]]),
+            torch.ones(8),
+            size=(7, 2),
+        ).coalesce()
+        data = {"incidence_1": incidence_1, "incidence_2": incidence_2}
+        lifted_data = self.lifting.feature_lifting(data)
+
+        assert torch.equal(lifted_data["x_1"], edges)
+        assert torch.equal(
+            lifted_data["x_2"], torch.tensor([[0, 1, 2, 3], [2, 3, 4, 5]])
+        )
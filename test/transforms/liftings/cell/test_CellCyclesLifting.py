@@ -1,8 +1,10 @@
 """Test the message passing module."""
 
+import networkx as nx
 import torch
 
 from topobenchmarkx.transforms.liftings.graph2cell import CellCycleLifting
+from topobenchmarkx.transforms.liftings.graph2cell.cycle import cycle_basis
 
 
 class TestCellCycleLifting:
@@ -167,3 +169,24 @@ class TestCellCycleLifting:
         assert (
             expected_incidence_2 == lifted_data.incidence_2.to_dense()
         ).all(), "Something is wrong with incidence_2."
+
+    def test_max_cell_length(self, simple_graph_1):
+        # Test that longer cycles are not lifted
+        lifting = CellCycleLifting(max_cell_length=3)
+        lifted_data = lifting.forward(simple_graph_1.clone())
+
+        assert lifted_data.incidence_2.shape[1] == 5
+        assert (lifted_data.incidence_2.to_dense().sum(0) == 3).all(), (
+            "Cycles longer than max_cell_length were lifted."
+        )
+
+    def test_cycle_basis(self, simple_graph_1):
+        # Test that the cycle basis matches networkx
+        data = simple_graph_1
+        graph = nx.Graph()
+        graph.add_nodes_from(range(data.num_nodes))
+        graph.add_edges_from(data.edge_index.t().tolist())
+
+        assert cycle_basis(data.edge_index, data.num_nodes) == nx.cycle_basis(
+            graph
+        )
@@ -1,6 +1,9 @@
 """Test the message passing module."""
 
+import time
+
 import torch
+import torch_geometric
 
 from topobenchmarkx.transforms.liftings.graph2simplicial import (
     SimplicialKHopLifting,
@@ -1493,3 +1496,22 @@ class TestSimplicialKHopLifting:
         assert (
             expected_features_2 == lifted_data.x_2
         ).all(), "Something is wrong with x_2 features."
+
+    def test_lift_topology_dense(self):
+        # The sampling of the simplices of a complete graph must be bounded
+        # by max_k_simplices rather than by the degree of the nodes
+        num_nodes = 80
+        edge_index = torch.combinations(torch.arange(num_nodes), 2).T
+        data = torch_geometric.data.Data(
+            x=torch.ones(num_nodes, 1),
+            edge_index=edge_index,
+            num_nodes=num_nodes,
+        )
+        lifting = SimplicialKHopLifting(complex_dim=3, max_k_simplices=10)
+        start = time.perf_counter()
+        lifted_data = lifting.forward(data)
+        assert time.perf_counter() - start < 10, (
+            "The lifting of a dense graph is too slow."
+        )
+        assert lifted_data.incidence_1.shape == (num_nodes, edge_index.shape[1])
+        assert lifted_data.incidence_2.shape == (edge_index.shape[1], 10)
@@ -0,0 +1,46 @@
+"""Test the ArrayGraph class."""
+
+import torch
+
+from topobenchmarkx.transforms.liftings import ArrayGraph
+
+
+class TestArrayGraph:
+    """Test the ArrayGraph class."""
+
+    def setup_method(self):
+        # Directed and repeated edges describe the same undirected edges
+        self.edge_index = torch.tensor(
+            [[0, 1, 2, 1, 3, 2], [1, 0, 1, 2, 3, 0]]
+        )
+        self.edge_attr = torch.arange(6, dtype=torch.float).unsqueeze(1)
+        self.graph = ArrayGraph(
+            self.edge_index,
+            4,
+            x=torch.randn(4, 2),
+            edge_attr=self.edge_attr,
+        )
+
+    def test_edges(self):
+        # Test the undirected edges and their features
+        assert self.graph.edges.tolist() == [[0, 1], [0, 2], [1, 2], [3, 3]]
+        assert self.graph.num_edges == 4
+        assert self.graph.edge_attr.squeeze(1).tolist() == [1.0, 5.0, 3.0, 4.0]
+
+    def test_adjacency(self):
+        # Test the CSR adjacency
+        assert self.graph.degree().tolist() == [2, 2, 2, 1]
+        assert self.graph.neighbors(1).tolist() == [0, 2]
+        assert self.graph.neighbors(3).tolist() == [3]
+        assert self.graph.edge_index.tolist() == [
+            [0, 0, 1, 1, 2, 2, 3],
+            [1, 2, 0, 2, 0, 1, 3],
+        ]
+
+    def test_to_networkx(self):
+        # Test the networkx fallback
+        graph = self.graph.to_networkx()
+        assert graph is self.graph.to_networkx()
+        assert sorted(graph.edges) == [(0, 1), (0, 2), (1, 2), (3, 3)]
+        assert graph.edges[0, 2]["features"].item() == 5.0
+        assert torch.equal(graph.nodes[1]["features"], self.graph.x[1])
@@ -20,7 +20,7 @@ from topobenchmarkx.data.utils import (
     load_manual_graph,
     load_simplicial_dataset,
 )
-from topobenchmarkx.dataloader import DataloadDataset
+from topobenchmarkx.dataloader.dataload_dataset import DataloadDataset
 
 
 class GraphLoader(AbstractLoader):
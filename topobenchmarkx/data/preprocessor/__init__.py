@@ -1,7 +1,9 @@
 """Init file for Preprocessor module."""
 
 from .preprocessor import PreProcessor
+from .storage import ShardedStorage
 
 __all__ = [
     "PreProcessor",
+    "ShardedStorage",
 ]
@@ -1,20 +1,24 @@
 """Preprocessor for datasets."""
 
+import io
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
 
 import hydra
 import torch
 import torch_geometric
+from torch_geometric.data.separate import separate
 from torch_geometric.io import fs
 
+from topobenchmarkx.data.preprocessor.storage import ShardedStorage
 from topobenchmarkx.data.utils import (
     ensure_serializable,
     load_inductive_splits,
     load_transductive_splits,
     make_hash,
 )
-from topobenchmarkx.dataloader import DataloadDataset
+from topobenchmarkx.dataloader.dataload_dataset import DataloadDataset
 from topobenchmarkx.transforms.data_transform import DataTransform
 
 
@@ -29,11 +33,50 @@ class PreProcessor(torch_geometric.data.InMemoryDataset):
         Path to the directory containing the data.
     transforms_config : DictConfig, optional
         Configuration parameters for the transforms (default: None).
+    num_workers : int, optional
+        Number of worker processes used to apply the pre-transforms. Values
+        lower than 2 apply the transforms serially in the main process
+        (default: 0).
+    chunk_size : int, optional
+        Number of graphs sent to a worker process at once (default: 16).
+    storage_backend : str, optional
+        Storage of the transformed data, either "in_memory" (one collated
+        file loaded in RAM) or "sharded" (memory-mapped shards decoded
+        lazily per graph). Only used when transforms are applied
+        (default: "in_memory").
+    shard_size : int, optional
+        Number of graphs per shard of the "sharded" backend (default: 1024).
+    cache_stages : bool, optional
+        Whether to cache the output of every stage of the transforms chain,
+        so that only the transforms following the longest already computed
+        prefix are applied (default: False).
     **kwargs : optional
         Optional additional arguments.
     """
 
-    def __init__(self, dataset, data_dir, transforms_config=None, **kwargs):
+    def __init__(
+        self,
+        dataset,
+        data_dir,
+        transforms_config=None,
+        num_workers=0,
+        chunk_size=16,
+        storage_backend="in_memory",
+        shard_size=1024,
+        cache_stages=False,
+        **kwargs,
+    ):
+        if storage_backend not in ["in_memory", "sharded"]:
+            raise ValueError(
+                f"Invalid storage backend '{storage_backend}'. Please "
+                "choose either 'in_memory' or 'sharded'."
+            )
+        self.num_workers = num_workers
+        self.chunk_size = chunk_size
+        self.storage_backend = storage_backend
+        self.shard_size = shard_size
+        self.cache_stages = cache_stages
+        self.storage = None
         if isinstance(dataset, torch_geometric.data.Dataset):
             data_list = [dataset.get(idx) for idx in range(len(dataset))]
         elif isinstance(dataset, torch.utils.data.Dataset):
@@ -56,7 +99,12 @@ class PreProcessor(torch_geometric.data.InMemoryDataset):
             super().__init__(data_dir, None, None, **kwargs)
             self.load(data_dir + "/processed/data.pt")
 
-        self.data_list = [self.get(idx) for idx in range(len(self))]
+        # The sharded storage already acts as a lazily decoded data list
+        self.data_list = (
+            self.storage
+            if self.storage is not None
+            else [self.get(idx) for idx in range(len(self))]
+        )
         # Some datasets have fixed splits, and those are stored as split_idx during loading
         # We need to store this information to be able to reproduce the splits afterwards
         if hasattr(dataset, "split_idx"):
@@ -85,8 +133,39 @@ class PreProcessor(torch_geometric.data.InMemoryDataset):
         str
             Name of the processed file.
         """
+        if self.transforms_applied and self.storage_backend == "sharded":
+            return ShardedStorage.index_file_name
         return "data.pt"
 
+    def len(self) -> int:
+        """Return the number of graphs in the dataset.
+
+        Returns
+        -------
+        int
+            Number of graphs.
+        """
+        if self.storage is not None:
+            return len(self.storage)
+        return super().len()
+
+    def get(self, idx) -> torch_geometric.data.Data:
+        """Get the graph at position `idx`.
+
+        Parameters
+        ----------
+        idx : int
+            Index of the graph.
+
+        Returns
+        -------
+        torch_geometric.data.Data
+            Data object of the graph.
+        """
+        if self.storage is not None:
+            return self.storage.get(idx)
+        return super().get(idx)
+
     def instantiate_pre_transform(
         self, data_dir, transforms_config
     ) -> torch_geometric.transforms.Compose:
@@ -112,6 +191,7 @@ class PreProcessor(torch_geometric.data.InMemoryDataset):
         pre_transforms = torch_geometric.transforms.Compose(
             list(pre_transforms_dict.values())
         )
+        self.pre_transforms_dict = pre_transforms_dict
         self.set_processed_data_dir(
             pre_transforms_dict, data_dir, transforms_config
         )
@@ -142,6 +222,20 @@ class PreProcessor(torch_geometric.data.InMemoryDataset):
         self.processed_data_dir = os.path.join(
             *[data_dir, repo_name, f"{params_hash}"]
         )
+        # Each stage of the chain is keyed on the parameters of all the
+        # transforms up to it, the last stage being the processed data dir
+        transform_names = list(transforms_config.keys())
+        self.stage_data_dirs = []
+        for i in range(len(transform_names)):
+            stage_names = transform_names[: i + 1]
+            stage_hash = make_hash(
+                {name: transforms_parameters[name] for name in stage_names}
+            )
+            self.stage_data_dirs.append(
+                os.path.join(
+                    *[data_dir, "_".join(stage_names), f"{stage_hash}"]
+                )
+            )
 
     def save_transform_parameters(self) -> None:
         """Save the transform parameters."""
@@ -166,13 +260,149 @@ class PreProcessor(torch_geometric.data.InMemoryDataset):
                 f"Transform parameters are the same, using existing data_dir: {self.processed_data_dir}"
             )
 
+    def apply_pre_transform(self, data_list, pre_transform=None) -> list:
+        """Apply the pre-transforms to a list of data objects.
+
+        When `num_workers` is larger than 1 the data objects are split into
+        chunks of `chunk_size` graphs that are lifted in a pool of worker
+        processes. The output keeps the order of the input list.
+
+        Parameters
+        ----------
+        data_list : list
+            List of data objects.
+        pre_transform : callable, optional
+            Transform to apply. If None, `self.pre_transform` is applied
+            (default: None).
+
+        Returns
+        -------
+        list
+            List of transformed data objects.
+        """
+        if pre_transform is None:
+            pre_transform = self.pre_transform
+        if self.num_workers < 2 or len(data_list) < 2:
+            return [pre_transform(d) for d in data_list]
+
+        chunk_size = max(1, self.chunk_size)
+        chunks = [
+            _serialize(data_list[i : i + chunk_size])
+            for i in range(0, len(data_list), chunk_size)
+        ]
+        with ProcessPoolExecutor(
+            max_workers=min(self.num_workers, len(chunks)),
+            mp_context=torch.multiprocessing.get_context(),
+            initializer=_init_pre_transform_worker,
+            initargs=(pre_transform,),
+        ) as executor:
+            # Executor.map yields the results in submission order.
+            return [
+                data
+                for payload in executor.map(_pre_transform_chunk, chunks)
+                for data in _deserialize(payload)
+            ]
+
+    def apply_cached_stages(self, data_list) -> list:
+        """Apply the transforms chain reusing the cached stages.
+
+        The output of the longest prefix of the chain that has already been
+        computed is loaded from disk, and only the remaining transforms are
+        applied. The output of every newly computed intermediate stage is
+        saved in its stage directory.
+
+        Parameters
+        ----------
+        data_list : list
+            List of data objects.
+
+        Returns
+        -------
+        list
+            List of transformed data objects.
+        """
+        transforms = list(self.pre_transforms_dict.values())
+        start = 0
+        for i in reversed(range(len(transforms) - 1)):
+            stage_path = os.path.join(self.stage_data_dirs[i], "data.pt")
+            if os.path.exists(stage_path):
+                print(f"Loading cached transform stage: {stage_path}")
+                data_list = self.load_stage(stage_path)
+                start = i + 1
+                break
+
+        for i in range(start, len(transforms)):
+            data_list = self.apply_pre_transform(data_list, transforms[i])
+            if i < len(transforms) - 1:
+                self.save_stage(data_list, i)
+        return data_list
+
+    def save_stage(self, data_list, stage_idx) -> None:
+        """Save the output of an intermediate stage of the transforms chain.
+
+        Parameters
+        ----------
+        data_list : list
+            List of data objects output by the stage.
+        stage_idx : int
+            Index of the stage in the transforms chain.
+        """
+        stage_dir = self.stage_data_dirs[stage_idx]
+        os.makedirs(stage_dir, exist_ok=True)
+        stage_names = list(self.pre_transforms_dict.keys())[: stage_idx + 1]
+        with open(
+            os.path.join(stage_dir, "path_transform_parameters_dict.json"),
+            "w",
+        ) as f:
+            json.dump(
+                {
+                    name: self.transforms_parameters[name]
+                    for name in stage_names
+                },
+                f,
+                indent=4,
+            )
+        self.save(data_list, os.path.join(stage_dir, "data.pt"))
+
+    @staticmethod
+    def load_stage(path) -> list:
+        """Load the output of an intermediate stage of the transforms chain.
+
+        Parameters
+        ----------
+        path : str
+            The path to the stage data.
+
+        Returns
+        -------
+        list
+            List of data objects output by the stage.
+        """
+        data, slices, data_cls = fs.torch_load(path)
+        data = data_cls.from_dict(data)
+        return [
+            separate(
+                cls=data.__class__,
+                batch=data,
+                idx=idx,
+                slice_dict=slices,
+                decrement=False,
+            )
+            for idx in range(len(next(iter(slices.values()))) - 1)
+        ]
+
     def process(self) -> None:
         """Method that processes the data."""
-        self.data_list = (
-            [self.pre_transform(d) for d in self.data_list]
-            if self.pre_transform is not None
-            else self.data_list
-        )
+        if self.pre_transform is not None and self.cache_stages:
+            self.data_list = self.apply_cached_stages(self.data_list)
+        elif self.pre_transform is not None:
+            self.data_list = self.apply_pre_transform(self.data_list)
+
+        if self.transforms_applied and self.storage_backend == "sharded":
+            ShardedStorage.save(
+                self.data_list, self.processed_dir, self.shard_size
+            )
+            return
 
         self._data, self.slices = self.collate(self.data_list)
         self._data_list = None  # Reset cache.
@@ -188,6 +418,10 @@ class PreProcessor(torch_geometric.data.InMemoryDataset):
         path : str
             The path to the processed data.
         """
+        if self.transforms_applied and self.storage_backend == "sharded":
+            self.storage = ShardedStorage(os.path.dirname(path))
+            return
+
         out = fs.torch_load(path)
         assert isinstance(out, tuple)
         assert len(out) >= 2 and len(out) <= 4
@@ -232,3 +466,75 @@ class PreProcessor(torch_geometric.data.InMemoryDataset):
                 f"Invalid '{split_params.learning_setting}' learning setting.\
                 Please define either 'inductive' or 'transductive'."
             )
+
+
+_worker_pre_transform = None
+
+
+def _serialize(obj) -> bytes:
+    r"""Serialize an object with `torch.save`.
+
+    Data objects are exchanged with the worker processes as bytes to avoid
+    sharing every tensor through a separate shared memory handle.
+
+    Parameters
+    ----------
+    obj : object
+        Object to serialize.
+
+    Returns
+    -------
+    bytes
+        Serialized object.
+    """
+    buffer = io.BytesIO()
+    torch.save(obj, buffer)
+    return buffer.getvalue()
+
+
+def _deserialize(payload: bytes):
+    r"""Deserialize an object serialized with `_serialize`.
+
+    Parameters
+    ----------
+    payload : bytes
+        Serialized object.
+
+    Returns
+    -------
+    object
+        Deserialized object.
+    """
+    return torch.load(io.BytesIO(payload), weights_only=False)
+
+
+def _init_pre_transform_worker(pre_transform) -> None:
+    r"""Store the pre-transform in a worker process.
+
+    Parameters
+    ----------
+    pre_transform : torch_geometric.transforms.Compose
+        Pre-transform applied by the worker.
+    """
+    global _worker_pre_transform
+    _worker_pre_transform = pre_transform
+    # Avoid oversubscribing the cores with intra-op threads.
+    torch.set_num_threads(1)
+
+
+def _pre_transform_chunk(payload: bytes) -> bytes:
+    r"""Apply the worker pre-transform to a serialized chunk of graphs.
+
+    Parameters
+    ----------
+    payload : bytes
+        Serialized list of data objects.
+
+    Returns
+    -------
+    bytes
+        Serialized list of transformed data objects.
+    """
+    return _serialize(
+        [_worker_pre_transform(d) for d in _deserialize(payload)]
+    )
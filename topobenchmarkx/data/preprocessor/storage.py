@@ -0,0 +1,144 @@
+"""Sharded on-disk storage for preprocessed datasets."""
+
+import os
+
+import torch
+import torch_geometric
+
+from topobenchmarkx.data.utils.columnar_utils import (
+    decode_columns,
+    encode_columns,
+)
+
+
+class ShardedStorage:
+    r"""Sharded, memory-mapped storage of a list of data objects.
+
+    The data objects are grouped in shards of `shard_size` graphs. Inside a
+    shard, every tensor field of the graphs is stored as one flat buffer
+    together with an offset index, and sparse COO fields as flat index and
+    value buffers. Shards are memory-mapped when loaded, so decoding a graph
+    only creates views of the buffers and touches the pages it needs.
+
+    Parameters
+    ----------
+    root : str
+        Path to the directory containing the shards.
+    """
+
+    index_file_name = "shard_index.pt"
+
+    def __init__(self, root):
+        self.root = root
+        index = torch.load(
+            os.path.join(root, self.index_file_name), weights_only=False
+        )
+        self.num_graphs = index["num_graphs"]
+        self.shard_size = index["shard_size"]
+        self.num_shards = index["num_shards"]
+        self.data_cls = index["data_cls"]
+        self._shards = {}
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.num_graphs})"
+
+    def __len__(self):
+        return self.num_graphs
+
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx += self.num_graphs
+        if not 0 <= idx < self.num_graphs:
+            raise IndexError(f"Index {idx} out of range.")
+        return self.get(idx)
+
+    def __iter__(self):
+        for idx in range(self.num_graphs):
+            yield self.get(idx)
+
+    @staticmethod
+    def shard_file_name(shard_idx) -> str:
+        r"""Return the file name of a shard.
+
+        Parameters
+        ----------
+        shard_idx : int
+            Index of the shard.
+
+        Returns
+        -------
+        str
+            File name of the shard.
+        """
+        return f"shard_{shard_idx:05d}.pt"
+
+    @classmethod
+    def save(cls, data_list, root, shard_size=1024) -> None:
+        r"""Write a list of data objects as shards to `root`.
+
+        Parameters
+        ----------
+        data_list : list[torch_geometric.data.Data]
+            List of data objects.
+        root : str
+            Path to the directory where the shards are saved.
+        shard_size : int, optional
+            Number of graphs per shard (default: 1024).
+        """
+        os.makedirs(root, exist_ok=True)
+        num_shards = 0
+        for start in range(0, len(data_list), shard_size):
+            shard = encode_columns(data_list[start : start + shard_size])
+            torch.save(
+                shard, os.path.join(root, cls.shard_file_name(num_shards))
+            )
+            num_shards += 1
+
+        index = {
+            "num_graphs": len(data_list),
+            "shard_size": shard_size,
+            "num_shards": num_shards,
+            "data_cls": (
+                data_list[0].__class__
+                if len(data_list) > 0
+                else torch_geometric.data.Data
+            ),
+        }
+        torch.save(index, os.path.join(root, cls.index_file_name))
+
+    def load_shard(self, shard_idx) -> dict:
+        r"""Load (memory-mapped) and cache a shard.
+
+        Parameters
+        ----------
+        shard_idx : int
+            Index of the shard.
+
+        Returns
+        -------
+        dict
+            Encoded shard.
+        """
+        if shard_idx not in self._shards:
+            self._shards[shard_idx] = torch.load(
+                os.path.join(self.root, self.shard_file_name(shard_idx)),
+                mmap=True,
+                weights_only=False,
+            )
+        return self._shards[shard_idx]
+
+    def get(self, idx) -> torch_geometric.data.Data:
+        r"""Decode the data object at position `idx`.
+
+        Parameters
+        ----------
+        idx : int
+            Index of the data object.
+
+        Returns
+        -------
+        torch_geometric.data.Data
+            Decoded data object. Its tensors are views of the shard buffers.
+        """
+        shard = self.load_shard(idx // self.shard_size)
+        return self.data_cls(**decode_columns(shard, idx % self.shard_size))
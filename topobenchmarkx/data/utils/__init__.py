@@ -4,15 +4,27 @@ from .utils import (
     ensure_serializable,  # noqa: F401
     generate_zero_sparse_connectivity,  # noqa: F401
     get_complex_connectivity,  # noqa: F401
+    get_connectivity_from_incidences,  # noqa: F401
+    get_interrank_incidence,  # noqa: F401
+    get_simplicial_boundary,  # noqa: F401
+    get_simplicial_closure,  # noqa: F401
+    get_simplicial_connectivity,  # noqa: F401
     load_cell_complex_dataset,  # noqa: F401
     load_manual_graph,  # noqa: F401
     load_simplicial_dataset,  # noqa: F401
     make_hash,  # noqa: F401
+    normalize_sparse_matrix,  # noqa: F401
 )
 
 utils_functions = [
     "get_complex_connectivity",
+    "get_simplicial_connectivity",
+    "get_simplicial_boundary",
+    "get_simplicial_closure",
+    "get_connectivity_from_incidences",
+    "get_interrank_incidence",
     "generate_zero_sparse_connectivity",
+    "normalize_sparse_matrix",
     "load_cell_complex_dataset",
     "load_simplicial_dataset",
     "load_manual_graph",
@@ -44,4 +56,19 @@ io_helper_functions = [
     "download_file_from_drive",
 ]
 
-__all__ = utils_functions + split_helper_functions + io_helper_functions
+from .columnar_utils import (  # noqa: E402
+    decode_columns,  # noqa: F401
+    encode_columns,  # noqa: F401
+)
+
+columnar_helper_functions = [
+    "encode_columns",
+    "decode_columns",
+]
+
+__all__ = (
+    utils_functions
+    + split_helper_functions
+    + io_helper_functions
+    + columnar_helper_functions
+)
@@ -0,0 +1,208 @@
+"""Columnar encoding of lists of data objects."""
+
+import torch
+
+
+def encode_columns(data_list) -> dict:
+    r"""Encode a list of data objects into flat buffers.
+
+    Dense tensors of a field are flattened and concatenated, sparse COO
+    tensors are stored as concatenated indices and values. A field falls back
+    to a list of Python objects when its values cannot be concatenated (for
+    example when their dtypes differ).
+
+    Parameters
+    ----------
+    data_list : list[torch_geometric.data.Data]
+        List of data objects.
+
+    Returns
+    -------
+    dict
+        Encoded columns.
+    """
+    keys = []
+    for data in data_list:
+        keys.extend(key for key, _ in data if key not in keys)
+
+    fields = {}
+    for key in keys:
+        values = [data.get(key) for data in data_list]
+        present = [value is not None for value in values]
+        tensors = [value for value in values if value is not None]
+        if _is_sparse_field(tensors):
+            fields[key] = _encode_sparse(values, present)
+        elif _is_dense_field(tensors):
+            fields[key] = _encode_dense(values, present)
+        else:
+            fields[key] = {"kind": "object", "values": values}
+    return {"num_graphs": len(data_list), "fields": fields}
+
+
+def decode_columns(columns, idx) -> dict:
+    r"""Decode the fields of one graph of encoded columns.
+
+    Parameters
+    ----------
+    columns : dict
+        Encoded columns, as returned by `encode_columns`.
+    idx : int
+        Index of the graph within the columns.
+
+    Returns
+    -------
+    dict
+        Dictionary with the fields of the graph.
+    """
+    out = {}
+    for key, field in columns["fields"].items():
+        if field["kind"] == "object":
+            if field["values"][idx] is not None:
+                out[key] = field["values"][idx]
+            continue
+        if not field["present"][idx]:
+            continue
+        start = int(field["offsets"][idx])
+        end = int(field["offsets"][idx + 1])
+        if field["kind"] == "dense":
+            out[key] = field["buffer"][start:end].view(field["shapes"][idx])
+        else:
+            out[key] = torch.sparse_coo_tensor(
+                field["indices"][:, start:end],
+                field["values"][start:end],
+                size=field["sizes"][idx],
+                is_coalesced=field["coalesced"][idx],
+            )
+    return out
+
+
+def _is_dense_field(values) -> bool:
+    r"""Check whether the values can be stored in one dense buffer.
+
+    Parameters
+    ----------
+    values : list
+        Values of a field.
+
+    Returns
+    -------
+    bool
+        Whether the values are strided tensors sharing one dtype.
+    """
+    return (
+        len(values) > 0
+        and all(
+            isinstance(value, torch.Tensor) and value.layout == torch.strided
+            for value in values
+        )
+        and len({value.dtype for value in values}) == 1
+    )
+
+
+def _is_sparse_field(values) -> bool:
+    r"""Check whether the values can be stored as flat COO buffers.
+
+    Parameters
+    ----------
+    values : list
+        Values of a field.
+
+    Returns
+    -------
+    bool
+        Whether the values are 2-dimensional sparse COO tensors sharing one
+        dtype.
+    """
+    return (
+        len(values) > 0
+        and all(
+            isinstance(value, torch.Tensor)
+            and value.layout == torch.sparse_coo
+            and value.sparse_dim() == 2
+            and value.dense_dim() == 0
+            for value in values
+        )
+        and len({value.dtype for value in values}) == 1
+    )
+
+
+def _encode_dense(values, present) -> dict:
+    r"""Encode dense tensors as a flat buffer with offsets.
+
+    Parameters
+    ----------
+    values : list
+        Tensors of the field (None where the field is missing).
+    present : list[bool]
+        Whether each graph contains the field.
+
+    Returns
+    -------
+    dict
+        Encoded field.
+    """
+    flat = [value.reshape(-1) for value in values if value is not None]
+    counts = [value.numel() if value is not None else 0 for value in values]
+    return {
+        "kind": "dense",
+        "buffer": torch.cat(flat),
+        "offsets": _offsets(counts),
+        "shapes": [
+            tuple(value.shape) if value is not None else None
+            for value in values
+        ],
+        "present": present,
+    }
+
+
+def _encode_sparse(values, present) -> dict:
+    r"""Encode sparse COO tensors as flat index and value buffers.
+
+    Parameters
+    ----------
+    values : list
+        Sparse tensors of the field (None where the field is missing).
+    present : list[bool]
+        Whether each graph contains the field.
+
+    Returns
+    -------
+    dict
+        Encoded field.
+    """
+    tensors = [value for value in values if value is not None]
+    coalesced = [
+        value.is_coalesced() if value is not None else False
+        for value in values
+    ]
+    counts = [value._nnz() if value is not None else 0 for value in values]
+    return {
+        "kind": "sparse",
+        "indices": torch.cat([value._indices() for value in tensors], dim=1),
+        "values": torch.cat([value._values() for value in tensors]),
+        "offsets": _offsets(counts),
+        "sizes": [
+            tuple(value.shape) if value is not None else None
+            for value in values
+        ],
+        "coalesced": coalesced,
+        "present": present,
+    }
+
+
+def _offsets(counts) -> torch.Tensor:
+    r"""Return the offsets of consecutive segments.
+
+    Parameters
+    ----------
+    counts : list[int]
+        Length of each segment.
+
+    Returns
+    -------
+    torch.Tensor
+        Offsets of the segments, with a leading zero.
+    """
+    offsets = torch.zeros(len(counts) + 1, dtype=torch.long)
+    offsets[1:] = torch.tensor(counts, dtype=torch.long).cumsum(0)
+    return offsets
@@ -6,7 +6,10 @@ import numpy as np
 import torch
 from sklearn.model_selection import StratifiedKFold
 
-from topobenchmarkx.dataloader import DataloadDataset
+# The module is imported, not the class, as the dataloader package imports
+# the columnar codec of this package
+from topobenchmarkx.dataloader import columnar_dataset
+from topobenchmarkx.dataloader.dataload_dataset import DataloadDataset
 
 
 # Generate splits in different fasions
@@ -172,6 +175,52 @@ def random_splitting(labels, parameters, global_data_seed=42):
     return split_idx
 
 
+class SplitView:
+    r"""Lazily decoded graphs of a split of a sharded dataset.
+
+    The graphs are decoded from the storage when they are accessed and
+    receive the train, validation and test masks of the split, so the split
+    never holds the whole dataset in memory.
+
+    Parameters
+    ----------
+    storage : ShardedStorage
+        Storage of the graphs.
+    indices : array-like
+        Indices of the graphs of the split in the storage.
+    split : str
+        Name of the split, either "train", "valid" or "test".
+    """
+
+    def __init__(self, storage, indices, split):
+        self.storage = storage
+        self.indices = np.asarray(indices).reshape(-1).tolist()
+        self.masks = {
+            key: torch.Tensor([int(name == split)]).long()
+            for key, name in [
+                ("train_mask", "train"),
+                ("val_mask", "valid"),
+                ("test_mask", "test"),
+            ]
+        }
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({len(self)})"
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, idx):
+        graph = self.storage.get(self.indices[idx])
+        for key, mask in self.masks.items():
+            graph[key] = mask
+        return graph
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+
 def assing_train_val_test_mask_to_graphs(dataset, split_idx):
     r"""Split the graph dataset into train, validation, and test datasets.
 
@@ -187,6 +236,19 @@ def assing_train_val_test_mask_to_graphs(dataset, split_idx):
     list:
         List containing the train, validation, and test datasets.
     """
+    # Graphs stored in shards are decoded lazily by the split datasets
+    storage = getattr(dataset, "storage", None)
+    if storage is not None:
+        assigned = np.zeros(len(storage), dtype=bool)
+        for split in ["train", "valid", "test"]:
+            assigned[split_idx[split]] = True
+        if not assigned.all():
+            raise ValueError("Graph not in any split")
+        return tuple(
+            DataloadDataset(SplitView(storage, split_idx[split], split))
+            for split in ["train", "valid", "test"]
+        )
+
     data_train_lst, data_val_lst, data_test_lst = [], [], []
 
     # Go over each of the graph and assign correct label
@@ -319,6 +381,13 @@ def load_inductive_splits(dataset, parameters):
         assing_train_val_test_mask_to_graphs(dataset, split_idx)
     )
 
+    # Store the splits column-wise
+    if parameters.get("columnar", False):
+        train_dataset, val_dataset, test_dataset = (
+            columnar_dataset.ColumnarDataset(split.data_lst)
+            for split in (train_dataset, val_dataset, test_dataset)
+        )
+
     return train_dataset, val_dataset, test_dataset
 
 
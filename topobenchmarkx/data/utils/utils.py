@@ -9,9 +9,20 @@ import toponetx.datasets.graph as graph
 import torch
 import torch_geometric
 from topomodelx.utils.sparse import from_sparse
+from toponetx.classes import SimplicialComplex
 
+CONNECTIVITY_TYPES = [
+    "incidence",
+    "down_laplacian",
+    "up_laplacian",
+    "adjacency",
+    "hodge_laplacian",
+]
 
-def get_complex_connectivity(complex, max_rank, signed=False):
+
+def get_complex_connectivity(
+    complex, max_rank, signed=False, neighborhoods=None
+):
     """Get the connectivity matrices for the complex.
 
     Parameters
@@ -22,24 +33,40 @@ def get_complex_connectivity(complex, max_rank, signed=False):
         Maximum rank of the complex.
     signed : bool, optional
         If True, returns signed connectivity matrices.
+    neighborhoods : list[str], optional
+        Connectivity matrices to compute, either as types (e.g.
+        "up_laplacian") or as keys (e.g. "up_laplacian_1"). Incidence
+        matrices are always computed. If None, all the connectivity matrices
+        are computed (default: None).
 
     Returns
     -------
     dict
         Dictionary containing the connectivity matrices.
     """
+    if isinstance(complex, SimplicialComplex):
+        simplices = [
+            torch.tensor(
+                sorted(
+                    tuple(sorted(simplex))
+                    for simplex in complex.skeleton(rank)
+                ),
+                dtype=torch.long,
+            ).reshape(-1, rank + 1)
+            for rank in range(complex.dim + 1)
+        ]
+        return get_simplicial_connectivity(
+            simplices, max_rank, signed=signed, neighborhoods=neighborhoods
+        )
+
     practical_shape = list(
         np.pad(list(complex.shape), (0, max_rank + 1 - len(complex.shape)))
     )
     connectivity = {}
     for rank_idx in range(max_rank + 1):
-        for connectivity_info in [
-            "incidence",
-            "down_laplacian",
-            "up_laplacian",
-            "adjacency",
-            "hodge_laplacian",
-        ]:
+        for connectivity_info in CONNECTIVITY_TYPES:
+            if not _is_selected(connectivity_info, rank_idx, neighborhoods):
+                continue
             try:
                 connectivity[f"{connectivity_info}_{rank_idx}"] = from_sparse(
                     getattr(complex, f"{connectivity_info}_matrix")(
@@ -65,6 +92,379 @@ def get_complex_connectivity(complex, max_rank, signed=False):
     return connectivity
 
 
+def get_simplicial_connectivity(
+    simplices, max_rank, signed=False, neighborhoods=None
+):
+    """Get the connectivity matrices of a simplicial complex.
+
+    Parameters
+    ----------
+    simplices : list[torch.Tensor]
+        The r-th tensor has shape (num_r_simplices, r + 1) and contains the
+        r-simplices of the complex. Every row is sorted in increasing order,
+        and the rows are sorted lexicographically.
+    max_rank : int
+        Maximum rank of the complex.
+    signed : bool, optional
+        If True, returns signed connectivity matrices.
+    neighborhoods : list[str], optional
+        Connectivity matrices to compute, see `get_complex_connectivity`
+        (default: None).
+
+    Returns
+    -------
+    dict
+        Dictionary containing the connectivity matrices, with the same keys
+        and values as `get_complex_connectivity` for the equivalent
+        toponetx.SimplicialComplex.
+    """
+    incidences = [None] + [
+        get_simplicial_boundary(simplices[rank], simplices[rank - 1])
+        for rank in range(1, len(simplices))
+    ]
+    shape = [simplex.shape[0] for simplex in simplices]
+    return get_connectivity_from_incidences(
+        incidences, shape, max_rank, signed=signed, neighborhoods=neighborhoods
+    )
+
+
+def normalize_sparse_matrix(matrix):
+    """Symmetrically normalize a sparse matrix by its absolute row sums.
+
+    The matrix is rescaled as D^{-1/2} A D^{-1/2}, D being the diagonal
+    matrix of the sums of the absolute values of the rows of A (rows that
+    sum to zero are left to zero). The row sums are scattered from the
+    nonzero entries and the values are rescaled in place of sparse
+    products.
+
+    Parameters
+    ----------
+    matrix : torch.sparse_coo_tensor
+        Square sparse matrix.
+
+    Returns
+    -------
+    torch.sparse_coo_tensor
+        Normalized matrix.
+    """
+    matrix = matrix.coalesce()
+    row, col = matrix.indices()
+    values = matrix.values()
+    row_sums = torch.zeros(
+        matrix.shape[0], dtype=values.dtype, device=values.device
+    ).index_add_(0, row, values.abs())
+    scale = torch.where(
+        row_sums != 0, row_sums.rsqrt(), torch.zeros_like(row_sums)
+    )
+    return torch.sparse_coo_tensor(
+        matrix.indices(),
+        values * scale[row] * scale[col],
+        matrix.shape,
+        is_coalesced=True,
+    )
+
+
+def get_interrank_incidence(data, src_rank, dst_rank):
+    """Return the incidence of the cells of `src_rank` on `dst_rank`.
+
+    The matrix has the destination cells as rows and the source cells as
+    columns. It is the incidence matrix of `src_rank` for boundary relations
+    (src_rank = dst_rank + 1) and the transposed incidence matrix of
+    `dst_rank` for coboundary relations (src_rank = dst_rank - 1).
+
+    Parameters
+    ----------
+    data : torch_geometric.data.Data
+        Data object containing the incidence matrices.
+    src_rank : int
+        Rank of the source cells.
+    dst_rank : int
+        Rank of the destination cells.
+
+    Returns
+    -------
+    torch.sparse_coo_tensor
+        Coalesced incidence of shape (n_dst_cells, n_src_cells).
+    """
+    if src_rank == dst_rank + 1:
+        return data[f"incidence_{src_rank}"].coalesce()
+    if src_rank == dst_rank - 1:
+        return data[f"incidence_{dst_rank}"].T.coalesce()
+    raise NotImplementedError(
+        "Only 1-hop dimensional boundaries are implemented."
+    )
+
+
+def get_simplicial_closure(simplices):
+    """Close a set of simplices under taking faces.
+
+    Parameters
+    ----------
+    simplices : list[torch.Tensor]
+        The r-th tensor has shape (num_r_simplices, r + 1) and contains
+        r-simplices as sorted rows, in any order and possibly repeated.
+
+    Returns
+    -------
+    list[torch.Tensor]
+        The simplices and all their faces, without repetitions, the rows of
+        every tensor being sorted lexicographically.
+    """
+    closed = list(simplices)
+    for rank in range(len(closed) - 1, -1, -1):
+        closed[rank] = torch.unique(closed[rank].reshape(-1, rank + 1), dim=0)
+        if rank > 0:
+            closed[rank - 1] = torch.cat(
+                [closed[rank - 1].reshape(-1, rank)]
+                + [
+                    torch.cat(
+                        [closed[rank][:, :i], closed[rank][:, i + 1 :]], dim=1
+                    )
+                    for i in range(rank + 1)
+                ]
+            )
+    return closed
+
+
+def get_simplicial_boundary(simplices, faces):
+    """Get the signed boundary matrix of a set of simplices.
+
+    The face obtained by removing the i-th node of a simplex has sign
+    (-1)^i.
+
+    Parameters
+    ----------
+    simplices : torch.Tensor
+        Simplices of rank r, of shape (num_r_simplices, r + 1), with sorted
+        rows.
+    faces : torch.Tensor
+        Simplices of rank r - 1, of shape (num_faces, r), with sorted rows
+        in lexicographic order. It must contain all the faces of
+        `simplices`.
+
+    Returns
+    -------
+    torch.sparse_coo_tensor
+        Signed boundary matrix of shape (num_faces, num_r_simplices).
+    """
+    num_simplices, size = simplices.shape
+    if num_simplices == 0:
+        return generate_zero_sparse_connectivity(faces.shape[0], 0)
+    all_faces = torch.cat(
+        [
+            torch.cat([simplices[:, :i], simplices[:, i + 1 :]], dim=1)
+            for i in range(size)
+        ]
+    )
+    # The unique rows are sorted lexicographically, so they are indexed as
+    # `faces`
+    _, inverse = torch.unique(
+        torch.cat([faces, all_faces]), dim=0, return_inverse=True
+    )
+    face_idx = inverse[faces.shape[0] :]
+    simplex_idx = torch.arange(num_simplices).repeat(size)
+    signs = (1 - 2 * (torch.arange(size) % 2)).repeat_interleave(num_simplices)
+    return torch.sparse_coo_tensor(
+        torch.stack([face_idx, simplex_idx]),
+        signs.float(),
+        (faces.shape[0], num_simplices),
+    ).coalesce()
+
+
+def get_connectivity_from_incidences(
+    incidences, shape, max_rank, signed=False, neighborhoods=None
+):
+    """Get the connectivity matrices of a complex from its incidences.
+
+    Every boundary matrix is built once, and the Laplacians and adjacencies
+    are derived from it by sparse products, following the conventions of
+    toponetx.
+
+    Parameters
+    ----------
+    incidences : list[torch.sparse_coo_tensor]
+        The r-th matrix is the signed incidence matrix between the cells of
+        rank r - 1 and rank r. The first element is the incidence matrix of
+        the nodes, a row of ones (as for simplicial complexes) if None.
+    shape : list[int]
+        Number of cells of each rank of the complex.
+    max_rank : int
+        Maximum rank of the complex.
+    signed : bool, optional
+        If True, returns signed connectivity matrices.
+    neighborhoods : list[str], optional
+        Connectivity matrices to compute, see `get_complex_connectivity`
+        (default: None).
+
+    Returns
+    -------
+    dict
+        Dictionary containing the connectivity matrices.
+    """
+    # Highest rank with at least one cell
+    dim = max(
+        [rank for rank, n_cells in enumerate(shape) if n_cells > 0],
+        default=0,
+    )
+    practical_shape = list(np.pad(shape[: dim + 1], (0, max_rank - dim)))
+
+    def postprocess(matrix):
+        return matrix if signed else torch.abs(matrix)
+
+    def up_laplacian(rank):
+        incidence = incidences[rank + 1]
+        return _sparse_mm(incidence, incidence.t())
+
+    def down_laplacian(rank):
+        incidence = incidences[rank]
+        return _sparse_mm(incidence.t(), incidence)
+
+    connectivity = {}
+    for rank_idx in range(max_rank + 1):
+        n_cells = practical_shape[rank_idx]
+        zeros = generate_zero_sparse_connectivity(m=n_cells, n=n_cells)
+        for connectivity_info in CONNECTIVITY_TYPES:
+            if not _is_selected(connectivity_info, rank_idx, neighborhoods):
+                continue
+            key = f"{connectivity_info}_{rank_idx}"
+            if connectivity_info == "incidence":
+                if rank_idx == 0 and incidences[0] is None:
+                    matrix = torch.ones(1, n_cells).to_sparse().coalesce()
+                elif rank_idx == 0:
+                    matrix = postprocess(incidences[0])
+                elif rank_idx <= dim:
+                    matrix = postprocess(incidences[rank_idx])
+                else:
+                    matrix = generate_zero_sparse_connectivity(
+                        m=practical_shape[rank_idx - 1], n=n_cells
+                    )
+            elif connectivity_info == "down_laplacian":
+                matrix = (
+                    postprocess(down_laplacian(rank_idx))
+                    if 0 < rank_idx <= dim
+                    else zeros
+                )
+            elif connectivity_info == "up_laplacian":
+                matrix = (
+                    postprocess(up_laplacian(rank_idx))
+                    if rank_idx < dim
+                    else zeros
+                )
+            elif connectivity_info == "adjacency":
+                matrix = (
+                    postprocess(_zero_diagonal(up_laplacian(rank_idx)))
+                    if rank_idx < dim
+                    else zeros
+                )
+            elif rank_idx > dim or (rank_idx == 0 and dim == 0):
+                matrix = zeros
+            elif rank_idx == 0:
+                matrix = postprocess(up_laplacian(rank_idx))
+            elif rank_idx == dim:
+                matrix = postprocess(down_laplacian(rank_idx))
+            else:
+                matrix = postprocess(
+                    _drop_zeros(
+                        down_laplacian(rank_idx) + up_laplacian(rank_idx)
+                    )
+                )
+            connectivity[key] = matrix
+    connectivity["shape"] = practical_shape
+    return connectivity
+
+
+def _is_selected(connectivity_info, rank_idx, neighborhoods):
+    """Check whether a connectivity matrix has to be computed.
+
+    Parameters
+    ----------
+    connectivity_info : str
+        Type of connectivity matrix.
+    rank_idx : int
+        Rank of the connectivity matrix.
+    neighborhoods : list[str] or None
+        Selected connectivity types or keys.
+
+    Returns
+    -------
+    bool
+        Whether the connectivity matrix has to be computed.
+    """
+    return (
+        neighborhoods is None
+        or connectivity_info == "incidence"
+        or connectivity_info in neighborhoods
+        or f"{connectivity_info}_{rank_idx}" in neighborhoods
+    )
+
+
+def _sparse_mm(a, b):
+    """Multiply two sparse matrices, dropping the cancelled entries.
+
+    Parameters
+    ----------
+    a : torch.sparse_coo_tensor
+        Left sparse matrix.
+    b : torch.sparse_coo_tensor
+        Right sparse matrix.
+
+    Returns
+    -------
+    torch.sparse_coo_tensor
+        Coalesced product of the matrices.
+    """
+    if a._nnz() == 0 or b._nnz() == 0:
+        return generate_zero_sparse_connectivity(a.shape[0], b.shape[1])
+    return _drop_zeros(torch.sparse.mm(a, b))
+
+
+def _drop_zeros(matrix):
+    """Remove the explicit zeros of a sparse matrix.
+
+    Parameters
+    ----------
+    matrix : torch.sparse_coo_tensor
+        Sparse matrix.
+
+    Returns
+    -------
+    torch.sparse_coo_tensor
+        Coalesced sparse matrix without explicit zeros.
+    """
+    matrix = matrix.coalesce()
+    mask = matrix.values() != 0
+    return torch.sparse_coo_tensor(
+        matrix.indices()[:, mask], matrix.values()[mask], matrix.shape
+    ).coalesce()
+
+
+def _zero_diagonal(matrix):
+    """Set the diagonal of a square sparse matrix to explicit zeros.
+
+    This matches `scipy.sparse` `setdiag(0)`, which stores every diagonal
+    entry.
+
+    Parameters
+    ----------
+    matrix : torch.sparse_coo_tensor
+        Square sparse matrix.
+
+    Returns
+    -------
+    torch.sparse_coo_tensor
+        Coalesced sparse matrix with a zero diagonal.
+    """
+    matrix = matrix.coalesce()
+    indices, values = matrix.indices(), matrix.values()
+    off_diagonal = indices[0] != indices[1]
+    diagonal = torch.arange(matrix.shape[0]).repeat(2, 1)
+    return torch.sparse_coo_tensor(
+        torch.cat([indices[:, off_diagonal], diagonal], dim=1),
+        torch.cat([values[off_diagonal], values.new_zeros(matrix.shape[0])]),
+        matrix.shape,
+    ).coalesce()
+
+
 def generate_zero_sparse_connectivity(m, n):
     """Generate a zero sparse connectivity matrix.
 
@@ -1,6 +1,15 @@
 """This module implements the dataloader for the topobenchmarkx package."""
 
+from .columnar_dataset import ColumnarDataset
 from .dataload_dataset import DataloadDataset
 from .dataloader import TBXDataloader
+from .sampler import BucketBatchSampler
+from .subcomplex import SubComplexDataset
 
-__all__ = ["TBXDataloader", "DataloadDataset"]
+__all__ = [
+    "BucketBatchSampler",
+    "ColumnarDataset",
+    "DataloadDataset",
+    "SubComplexDataset",
+    "TBXDataloader",
+]
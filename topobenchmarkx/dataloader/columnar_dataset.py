@@ -0,0 +1,66 @@
+"""Columnar dataset class compatible with TBXDataloader."""
+
+import torch_geometric
+
+from topobenchmarkx.data.utils.columnar_utils import (
+    decode_columns,
+    encode_columns,
+)
+
+
+class ColumnarDataset(torch_geometric.data.Dataset):
+    r"""Dataset storing each field of its graphs as one concatenated tensor.
+
+    The graphs are encoded once with a fixed schema: dense fields are stored
+    as one flat buffer with offsets, sparse COO fields as concatenated
+    indices and values with offsets. Getting a graph only slices views of
+    these buffers, and the key list of the schema is shared by all items
+    instead of being rebuilt for every sample. Items have the same format as
+    those of `DataloadDataset`, so the dataset works with `collate_fn`. The
+    batches are still assembled item by item by `collate_fn`: contiguous
+    ranges of graphs are not sliced from the buffers as a whole.
+
+    Parameters
+    ----------
+    data_lst : list[torch_geometric.data.Data]
+        List of torch_geometric.data.Data objects.
+    """
+
+    def __init__(self, data_lst):
+        super().__init__()
+        self.columns = encode_columns(list(data_lst))
+        for field in self.columns["fields"].values():
+            if field["kind"] != "object":
+                field["offsets"] = field["offsets"].tolist()
+        self.schema = list(self.columns["fields"])
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.len()})"
+
+    def get(self, idx):
+        """Get the values of a graph from the column buffers.
+
+        Parameters
+        ----------
+        idx : int
+            Index of the data object to get.
+
+        Returns
+        -------
+        tuple
+            Tuple containing a list of all the values for the data and the corresponding keys.
+        """
+        out = decode_columns(self.columns, idx)
+        if len(out) == len(self.schema):
+            return list(out.values()), self.schema
+        return list(out.values()), list(out)
+
+    def len(self):
+        """Return the length of the dataset.
+
+        Returns
+        -------
+        int
+            Length of the dataset.
+        """
+        return self.columns["num_graphs"]
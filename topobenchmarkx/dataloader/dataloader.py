@@ -1,12 +1,20 @@
 "TBXDataloader class."
 
+import copy
 from typing import Any
 
+import torch
+import torch_geometric
 from lightning import LightningDataModule
 from torch.utils.data import DataLoader
 
 from topobenchmarkx.dataloader.dataload_dataset import DataloadDataset
-from topobenchmarkx.dataloader.utils import collate_fn
+from topobenchmarkx.dataloader.sampler import (
+    BucketBatchSampler,
+    get_sample_sizes,
+)
+from topobenchmarkx.dataloader.subcomplex import SubComplexDataset
+from topobenchmarkx.dataloader.utils import ResidentLoader, collate_fn
 
 
 class TBXDataloader(LightningDataModule):
@@ -29,7 +37,20 @@ class TBXDataloader(LightningDataModule):
     pin_memory : bool, optional
         If True, the data loader will copy tensors into pinned memory before returning them (default: False).
     **kwargs : optional
-        Additional arguments.
+        Additional arguments. Setting `bucket_by` to "cells" or "nnz" batches
+        the training samples with a `BucketBatchSampler` grouping samples of
+        similar numbers of cells or of nonzero connectivity entries. Its
+        batches hold `batch_size` samples, or samples whose total size fits
+        in `max_batch_cost` when given. `bucket_size` sets the number of
+        batches per bucket and `seed` the seed of the permutations (default:
+        the initial torch seed). In the transductive setting, setting
+        `num_parts` partitions the complex into `num_parts` clusters of
+        nodes and trains on the sub-complexes induced by `batch_size`
+        clusters at a time (see `SubComplexDataset`), while validation and
+        test use the whole complex. Otherwise, setting `device_resident` to
+        True collates the single complex once and serves the same batch at
+        every step without a `DataLoader`. It is moved to the device on the
+        first step only (see `transfer_batch_to_device`).
 
     References
     ----------
@@ -57,20 +78,31 @@ class TBXDataloader(LightningDataModule):
         )
         self.dataset_train = dataset_train
         self.batch_size = batch_size
+        self.num_parts = kwargs.get("num_parts")
+        self.device_resident = False
 
         if dataset_val is None and dataset_test is None:
             # Transductive setting
             self.dataset_val = dataset_train
             self.dataset_test = dataset_train
-            assert (
-                self.batch_size == 1
-            ), "Batch size must be 1 for transductive setting."
+            assert self.batch_size == 1 or self.num_parts is not None, (
+                "Batch size must be 1 for transductive setting."
+            )
+            if self.num_parts is None:
+                self.device_resident = kwargs.get("device_resident", False)
         else:
             self.dataset_val = dataset_val
             self.dataset_test = dataset_test
         self.num_workers = num_workers
         self.pin_memory = pin_memory
         self.persistent_workers = kwargs.get("persistent_workers", False)
+        self.bucket_by = kwargs.get("bucket_by")
+        self.max_batch_cost = kwargs.get("max_batch_cost")
+        self.bucket_size = kwargs.get("bucket_size", 100)
+        self.seed = kwargs.get("seed", torch.initial_seed())
+        self._resident_batch = None
+        self._device_batch = None
+        self._device = None
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(dataset_train={self.dataset_train}, dataset_val={self.dataset_val}, dataset_test={self.dataset_test}, batch_size={self.batch_size})"
@@ -83,6 +115,43 @@ class TBXDataloader(LightningDataModule):
         torch.utils.data.DataLoader
             The train dataloader.
         """
+        if self.device_resident:
+            return self.resident_dataloader()
+        transductive = self.dataset_val is self.dataset_train
+        if self.num_parts is not None and transductive:
+            # Batches of sub-complexes of the single complex
+            values, keys = self.dataset_train.get(0)
+            dataset = SubComplexDataset(
+                torch_geometric.data.Data(
+                    **dict(zip(keys, values, strict=True))
+                ),
+                self.num_parts,
+            )
+            return DataLoader(
+                dataset=dataset,
+                batch_size=self.batch_size,
+                num_workers=self.num_workers,
+                pin_memory=self.pin_memory,
+                shuffle=True,
+                collate_fn=dataset.collate,
+                persistent_workers=self.persistent_workers,
+            )
+        if self.bucket_by is not None:
+            batch_sampler = BucketBatchSampler(
+                get_sample_sizes(self.dataset_train, self.bucket_by),
+                batch_size=self.batch_size,
+                max_cost=self.max_batch_cost,
+                bucket_size=self.bucket_size,
+                seed=self.seed,
+            )
+            return DataLoader(
+                dataset=self.dataset_train,
+                batch_sampler=batch_sampler,
+                num_workers=self.num_workers,
+                pin_memory=self.pin_memory,
+                collate_fn=collate_fn,
+                persistent_workers=self.persistent_workers,
+            )
         return DataLoader(
             dataset=self.dataset_train,
             batch_size=self.batch_size,
@@ -101,6 +170,8 @@ class TBXDataloader(LightningDataModule):
         torch.utils.data.DataLoader
             The validation dataloader.
         """
+        if self.device_resident:
+            return self.resident_dataloader()
         return DataLoader(
             dataset=self.dataset_val,
             batch_size=self.batch_size,
@@ -121,6 +192,8 @@ class TBXDataloader(LightningDataModule):
         """
         if self.dataset_test is None:
             raise ValueError("There is no test dataloader.")
+        if self.device_resident:
+            return self.resident_dataloader()
         return DataLoader(
             dataset=self.dataset_test,
             batch_size=self.batch_size,
@@ -131,6 +204,54 @@ class TBXDataloader(LightningDataModule):
             persistent_workers=self.persistent_workers,
         )
 
+    def resident_dataloader(self) -> ResidentLoader:
+        r"""Return a loader of the single batch of the transductive setting.
+
+        The complex is collated on the first call only.
+
+        Returns
+        -------
+        ResidentLoader
+            Loader yielding the collated complex.
+        """
+        if self._resident_batch is None:
+            self._resident_batch = collate_fn([self.dataset_train[0]])
+        return ResidentLoader(self._resident_batch)
+
+    def transfer_batch_to_device(
+        self, batch: Any, device: torch.device, dataloader_idx: int
+    ) -> Any:
+        r"""Move a batch to the device, keeping the resident batch there.
+
+        The resident batch is moved on the first call for a device and
+        cached. Every step receives a shallow copy of the cached batch, so
+        that fields replaced by the model (e.g. by the feature encoder) do
+        not leak into the next steps. The copy shares its tensors with the
+        cached batch though, so in-place operations on them (e.g.
+        `batch.x_0.mul_(2)`) leak into every later step: the model must not
+        modify the tensors of a resident batch in place.
+
+        Parameters
+        ----------
+        batch : Any
+            The batch to move.
+        device : torch.device
+            The target device.
+        dataloader_idx : int
+            The index of the dataloader of the batch.
+
+        Returns
+        -------
+        Any
+            The batch on the device.
+        """
+        if self.device_resident and batch is self._resident_batch:
+            if self._device_batch is None or self._device != device:
+                self._device_batch = batch.to(device)
+                self._device = device
+            return copy.copy(self._device_batch)
+        return super().transfer_batch_to_device(batch, device, dataloader_idx)
+
     def teardown(self, stage: str | None = None) -> None:
         r"""Lightning hook for cleaning up after `trainer.fit()`, `trainer.validate()`, `trainer.test()`, and `trainer.predict()`.
 
@@ -0,0 +1,205 @@
+"""Size-aware batch sampler for the TBXDataloader."""
+
+import torch
+import torch_geometric
+from torch.utils.data import Sampler
+
+
+class BucketBatchSampler(Sampler):
+    r"""Batch sampler grouping samples of similar sizes.
+
+    At every epoch the samples are shuffled and split into buckets of
+    `bucket_size` batches worth of samples. Each bucket is sorted by sample
+    size and cut into batches, either of `batch_size` samples or, when
+    `max_cost` is given, of samples whose total size fits in `max_cost` (a
+    sample larger than the budget forms its own batch). The order of the
+    batches is then shuffled. The permutations only depend on `seed` and on
+    the epoch (set with `set_epoch`, or incremented when a new pass starts
+    without it), so runs are deterministic.
+
+    Parameters
+    ----------
+    sizes : list[int] or torch.Tensor
+        Size of each sample, e.g. its number of cells or of nonzero entries.
+    batch_size : int, optional
+        Number of samples per batch (default: 1). Ignored when `max_cost`
+        is given.
+    max_cost : int, optional
+        Maximum total size of a batch (default: None).
+    bucket_size : int, optional
+        Number of batches per bucket (default: 100).
+    shuffle : bool, optional
+        Whether to shuffle the samples and the batches (default: True).
+    seed : int, optional
+        Seed of the permutations (default: 0).
+    drop_last : bool, optional
+        Whether to drop the last batch of the epoch when it contains less
+        than `batch_size` samples (default: False). The samples left over
+        when cutting a bucket into batches of `batch_size` samples are
+        carried over to the next bucket, so only the last batch of the
+        epoch can be incomplete. Ignored when `max_cost` is given.
+    """
+
+    def __init__(
+        self,
+        sizes,
+        batch_size=1,
+        max_cost=None,
+        bucket_size=100,
+        shuffle=True,
+        seed=0,
+        drop_last=False,
+    ):
+        self.sizes = torch.as_tensor(sizes, dtype=torch.long)
+        self.batch_size = batch_size
+        self.max_cost = max_cost
+        self.bucket_size = bucket_size
+        self.shuffle = shuffle
+        self.seed = seed
+        self.drop_last = drop_last
+        self.epoch = 0
+        self._batches = None
+        self._started = False
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(num_samples={len(self.sizes)}, batch_size={self.batch_size}, max_cost={self.max_cost})"
+
+    def set_epoch(self, epoch) -> None:
+        r"""Set the epoch used to seed the permutations.
+
+        Parameters
+        ----------
+        epoch : int
+            The current epoch.
+        """
+        if epoch != self.epoch:
+            self.epoch = epoch
+            self._batches = None
+        self._started = False
+
+    def __iter__(self):
+        # Move to the next permutation when the epoch is not set externally,
+        # even if the previous pass stopped early
+        if self._started:
+            self.set_epoch(self.epoch + 1)
+        self._started = True
+        return iter(self.get_batches())
+
+    def __len__(self) -> int:
+        return len(self.get_batches())
+
+    def get_batches(self) -> list[list[int]]:
+        r"""Return the batches of the current epoch.
+
+        Returns
+        -------
+        list[list[int]]
+            Indices of the samples of each batch.
+        """
+        if self._batches is not None:
+            return self._batches
+
+        num_samples = len(self.sizes)
+        if num_samples == 0:
+            return []
+        generator = torch.Generator().manual_seed(self.seed + self.epoch)
+        if self.shuffle:
+            order = torch.randperm(num_samples, generator=generator)
+        else:
+            order = torch.arange(num_samples)
+
+        if self.max_cost is None:
+            samples_per_bucket = self.bucket_size * self.batch_size
+        else:
+            # Buckets of about bucket_size batches of samples of mean size
+            mean_size = max(float(self.sizes.float().mean()), 1.0)
+            samples_per_bucket = self.bucket_size * max(
+                int(self.max_cost // mean_size), 1
+            )
+
+        batches = []
+        leftover = order[:0]
+        for bucket in order.split(samples_per_bucket):
+            if self.max_cost is not None:
+                bucket = bucket[torch.argsort(self.sizes[bucket], stable=True)]
+                batches.extend(self._split_by_cost(bucket))
+                continue
+            # The incomplete batch of a bucket moves to the next bucket
+            bucket = torch.cat([leftover, bucket])
+            bucket = bucket[torch.argsort(self.sizes[bucket], stable=True)]
+            num_full = len(bucket) // self.batch_size * self.batch_size
+            batches.extend(
+                bucket[start : start + self.batch_size].tolist()
+                for start in range(0, num_full, self.batch_size)
+            )
+            leftover = bucket[num_full:]
+        if len(leftover) > 0 and not self.drop_last:
+            batches.append(leftover.tolist())
+
+        if self.shuffle:
+            batch_order = torch.randperm(len(batches), generator=generator)
+            batches = [batches[idx] for idx in batch_order.tolist()]
+        self._batches = batches
+        return batches
+
+    def _split_by_cost(self, bucket) -> list[list[int]]:
+        r"""Cut sorted samples into batches whose total size fits the budget.
+
+        Parameters
+        ----------
+        bucket : torch.Tensor
+            Indices of the samples, sorted by size.
+
+        Returns
+        -------
+        list[list[int]]
+            Indices of the samples of each batch.
+        """
+        batches, batch, cost = [], [], 0
+        for idx, size in zip(
+            bucket.tolist(), self.sizes[bucket].tolist(), strict=True
+        ):
+            if len(batch) > 0 and cost + size > self.max_cost:
+                batches.append(batch)
+                batch, cost = [], 0
+            batch.append(idx)
+            cost += size
+        if len(batch) > 0:
+            batches.append(batch)
+        return batches
+
+
+def get_sample_sizes(dataset, size_by="cells") -> torch.Tensor:
+    r"""Compute the size of every sample of a dataset.
+
+    Parameters
+    ----------
+    dataset : DataloadDataset or ColumnarDataset
+        Dataset returning lists of values and keys.
+    size_by : str, optional
+        Either "cells", to count the cells of all ranks (rows of the `x_*`
+        features), or "nnz", to count the nonzero entries of the sparse
+        connectivity matrices (default: "cells").
+
+    Returns
+    -------
+    torch.Tensor
+        Size of each sample.
+    """
+    if size_by not in ("cells", "nnz"):
+        raise ValueError(
+            f"Invalid size '{size_by}'. Choose either 'cells' or 'nnz'."
+        )
+    sizes = []
+    for idx in range(len(dataset)):
+        values, keys = dataset.get(idx)
+        size = 0
+        for key, value in zip(keys, values, strict=False):
+            if not isinstance(value, torch.Tensor):
+                continue
+            if size_by == "cells" and key.startswith("x_"):
+                size += value.shape[0]
+            elif size_by == "nnz" and torch_geometric.utils.is_sparse(value):
+                size += value._nnz()
+        sizes.append(size)
+    return torch.tensor(sizes, dtype=torch.long)
@@ -0,0 +1,277 @@
+"""Partition-based mini-batching of a single lifted complex."""
+
+import numpy as np
+import scipy.sparse
+import torch
+import torch_geometric
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+from torch.utils.data import Dataset
+
+from topobenchmarkx.dataloader.utils import collate_fn
+
+
+def partition_nodes(edge_index, num_nodes, num_parts) -> torch.Tensor:
+    r"""Partition the nodes of a graph into clusters of neighboring nodes.
+
+    The nodes are ordered with the reverse Cuthill-McKee algorithm, which
+    places adjacent nodes close to each other, and the ordering is cut into
+    `num_parts` contiguous parts of (almost) equal sizes.
+
+    Parameters
+    ----------
+    edge_index : torch.Tensor
+        Edge indices of the graph.
+    num_nodes : int
+        Number of nodes of the graph.
+    num_parts : int
+        Number of parts.
+
+    Returns
+    -------
+    torch.Tensor
+        Part of each node, of shape (num_nodes,).
+    """
+    row, col = edge_index.cpu().numpy()
+    adjacency = scipy.sparse.coo_matrix(
+        (np.ones(row.shape[0]), (row, col)), shape=(num_nodes, num_nodes)
+    ).tocsr()
+    order = reverse_cuthill_mckee(adjacency + adjacency.T, symmetric_mode=True)
+    order = torch.from_numpy(order.astype(np.int64))
+    parts = torch.empty(num_nodes, dtype=torch.long)
+    parts[order] = torch.arange(num_nodes) * num_parts // max(num_nodes, 1)
+    return parts
+
+
+def get_sparse_ranks(key):
+    r"""Return the ranks of the rows and columns of a sparse field.
+
+    Incidences `incidence_{r}` map the cells of rank r - 1 to those of rank
+    r, `incidence_hyperedges` maps the nodes to the hyperedges, interrank
+    incidences `interrank_incidence_{src}_{dst}` have the cells of rank dst
+    as rows and those of rank src as columns (see
+    `get_interrank_incidence`), and the other fields `{name}_{r}` are square
+    matrices on the cells of rank r.
+
+    Parameters
+    ----------
+    key : str
+        Name of the sparse field.
+
+    Returns
+    -------
+    tuple
+        Ranks of the rows and of the columns.
+    """
+    if key == "incidence_hyperedges":
+        return 0, "hyperedges"
+    if key.startswith("interrank_incidence_"):
+        src_rank, dst_rank = (int(r) for r in key.split("_")[2:])
+        return dst_rank, src_rank
+    rank = key.rsplit("_", 1)[-1]
+    if not rank.isdigit():
+        raise ValueError(f"Cannot find the ranks of the sparse field {key}.")
+    rank = int(rank)
+    if key.startswith("incidence_"):
+        return rank - 1, rank
+    return rank, rank
+
+
+def get_dense_rank(key):
+    r"""Return the rank of the cells of a dense per-cell field.
+
+    The features `x_{r}` and `x_hyperedges`, and the fields `{r}_cell_{name}`
+    (e.g. the degrees computed by `NodeDegrees` or the curvatures computed
+    by `CalculateSimplicialCurvature`) are defined on the cells of rank r
+    or on the hyperedges. The fields `x`, `y`, `pos` and `node_degrees` are
+    defined on the nodes.
+
+    Parameters
+    ----------
+    key : str
+        Name of the dense field.
+
+    Returns
+    -------
+    int or str or None
+        Rank of the cells, or None if the field is not a per-cell field.
+    """
+    if key in ("x", "y", "pos", "node_degrees"):
+        return 0
+    if key == "x_hyperedges":
+        return "hyperedges"
+    if key.startswith("x_") and key[2:].isdigit():
+        return int(key[2:])
+    rank = key.split("_", 1)[0]
+    if rank.isdigit() and key.startswith(f"{rank}_cell_"):
+        return int(rank)
+    return None
+
+
+def induced_subcomplex(data, nodes) -> torch_geometric.data.Data:
+    r"""Return the sub-complex induced by a subset of the nodes.
+
+    A cell of rank r > 0 is kept when all its faces, given by `incidence_r`,
+    are kept, so the sub-complex is closed. A hyperedge is kept when one of
+    its nodes is kept, and is restricted to the kept nodes. The per-cell
+    fields (see `get_dense_rank`), the incidence, adjacency and Laplacian
+    blocks and the graph edges are restricted and reindexed accordingly,
+    `shape` is recomputed, and the node masks (`*_mask`, given as indices or
+    as boolean masks) become boolean masks of the kept nodes. Other dense
+    fields with as many rows as the cells of some rank are rejected, since
+    their rank is unknown.
+
+    Parameters
+    ----------
+    data : torch_geometric.data.Data
+        The lifted complex.
+    nodes : torch.Tensor
+        Indices or boolean mask of the nodes to keep.
+
+    Returns
+    -------
+    torch_geometric.data.Data
+        The induced sub-complex.
+    """
+    num_nodes = data.num_nodes
+    node_mask = torch.zeros(num_nodes, dtype=torch.bool)
+    node_mask[nodes] = True
+
+    # Cells kept for each rank, the faces of a cell being kept
+    keep = {-1: None, 0: node_mask}
+    rank = 1
+    while f"incidence_{rank}" in data:
+        incidence = data[f"incidence_{rank}"].coalesce()
+        rows, cols = incidence.indices()
+        missing = torch.zeros(incidence.shape[1], dtype=torch.long)
+        missing.index_add_(0, cols, (~keep[rank - 1][rows]).long())
+        keep[rank] = missing == 0
+        rank += 1
+    if "incidence_hyperedges" in data:
+        incidence = data["incidence_hyperedges"].coalesce()
+        rows, cols = incidence.indices()
+        keep["hyperedges"] = torch.zeros(incidence.shape[1], dtype=torch.bool)
+        keep["hyperedges"][cols[node_mask[rows]]] = True
+    index = {
+        key: torch.cumsum(mask, 0) - 1
+        for key, mask in keep.items()
+        if mask is not None
+    }
+
+    num_cells = {mask.shape[0] for mask in keep.values() if mask is not None}
+
+    sub = data.__class__()
+    for key, value in data:
+        cell_rank = get_dense_rank(key)
+        if torch_geometric.utils.is_sparse(value):
+            row_rank, col_rank = get_sparse_ranks(key)
+            value = value.coalesce()
+            rows, cols = value.indices()
+            entries = keep[col_rank][cols]
+            size = [value.shape[0], int(keep[col_rank].sum())]
+            if keep[row_rank] is not None:
+                entries &= keep[row_rank][rows]
+                rows = index[row_rank][rows]
+                size[0] = int(keep[row_rank].sum())
+            sub[key] = torch.sparse_coo_tensor(
+                torch.stack([rows[entries], index[col_rank][cols[entries]]]),
+                value.values()[entries],
+                size=(*size, *value.shape[2:]),
+            ).coalesce()
+        elif (
+            cell_rank in keep
+            and torch.is_tensor(value)
+            and value.shape[0] == keep[cell_rank].shape[0]
+        ):
+            sub[key] = value[keep[cell_rank]]
+        elif key.endswith("_mask"):
+            mask = torch.zeros(num_nodes, dtype=torch.bool)
+            mask[value] = True
+            sub[key] = mask[node_mask]
+        elif key == "edge_index":
+            edges = node_mask[value].all(0)
+            sub[key] = index[0][value[:, edges]]
+        elif key in ("edge_attr", "edge_weight"):
+            sub[key] = value[node_mask[data.edge_index].all(0)]
+        elif key == "shape":
+            sub[key] = [
+                int(keep[r].sum()) if r in keep else 0
+                for r in range(len(value))
+            ]
+        elif key == "num_nodes":
+            sub[key] = int(node_mask.sum())
+        elif key == "num_hyperedges":
+            sub[key] = int(keep["hyperedges"].sum())
+        elif (
+            cell_rank is None
+            and torch.is_tensor(value)
+            and value.dim() > 0
+            and value.shape[0] in num_cells
+        ):
+            raise ValueError(
+                f"Cannot find the rank of the cells of the dense field {key}."
+            )
+        else:
+            sub[key] = value
+    return sub
+
+
+class SubComplexDataset(Dataset):
+    r"""Mini-batches of sub-complexes of a single lifted complex.
+
+    The nodes of the complex are partitioned into `num_parts` clusters with
+    `partition_nodes`, in the spirit of ClusterGCN. The items of the dataset
+    are the parts containing nodes of `mask_key`, and a batch of parts is
+    collated into the sub-complex induced by their union with
+    `induced_subcomplex`, so that the cells and connectivity between the
+    parts of a batch are kept.
+
+    Parameters
+    ----------
+    data : torch_geometric.data.Data
+        The lifted complex.
+    num_parts : int
+        Number of parts.
+    mask_key : str, optional
+        Mask of the nodes that the batches must contain (default:
+        "train_mask").
+    """
+
+    def __init__(self, data, num_parts, mask_key="train_mask"):
+        super().__init__()
+        self.data = data
+        self.num_parts = num_parts
+        self.parts = partition_nodes(
+            data.edge_index, data.num_nodes, num_parts
+        )
+        part_ids = torch.unique(self.parts[data[mask_key]])
+        self.part_ids = part_ids.tolist()
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(num_parts={self.num_parts}, "
+            f"len={len(self)})"
+        )
+
+    def __len__(self):
+        return len(self.part_ids)
+
+    def __getitem__(self, idx):
+        return self.part_ids[idx]
+
+    def collate(self, part_ids) -> torch_geometric.data.Batch:
+        r"""Collate parts into the sub-complex induced by their nodes.
+
+        Parameters
+        ----------
+        part_ids : list[int]
+            Parts of the batch.
+
+        Returns
+        -------
+        torch_geometric.data.Batch
+            The batched sub-complex.
+        """
+        nodes = torch.isin(self.parts, torch.tensor(part_ids))
+        sub = induced_subcomplex(self.data, nodes)
+        keys = list(sub.keys())
+        return collate_fn([([sub[key] for key in keys], keys)])
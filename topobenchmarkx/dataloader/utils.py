@@ -87,6 +87,11 @@ def collate_fn(batch):
 
     This ensures that the `torch_geometric` dataloaders work with sparse matrices that are not necessarily named `adj`. The function also generates the batch slices for the different cell dimensions.
 
+    The sparse matrices are stacked block-diagonally in one pass, by
+    offsetting and concatenating their indices and values, and are only
+    coalesced when one of the inputs is not. The batch vectors of the cells
+    are built with a single `repeat_interleave` per cell dimension.
+
     Parameters
     ----------
     batch : list
@@ -98,62 +103,116 @@ def collate_fn(batch):
         A `torch_geometric.data.Batch` object.
     """
     data_list = []
-    batch_idx_dict = defaultdict(list)
+    sparse_values = defaultdict(list)
+    shapes = []
 
-    # Keep track of the running index for each cell dimension
-    running_idx = {}
+    # Number of cells of each graph for each cell dimension
+    cell_counts = defaultdict(lambda: [0] * len(batch))
 
     for batch_idx, b in enumerate(batch):
         values, keys = b[0], b[1]
         data = DomainData()
         for key, value in zip(keys, values, strict=False):
             if torch_geometric.utils.is_sparse(value):
-                value = value.coalesce()
-            data[key] = value
-
-        # Generate batch_slice values for x_1, x_2, x_3, ...
-        x_keys = [el for el in keys if ("x_" in el)]
-        for x_key in x_keys:
-            if x_key != "x_0":
-                if x_key != "x_hyperedges":
-                    cell_dim = int(x_key.split("_")[1])
+                if data.is_valid(key):
+                    sparse_values[key].append(value)
                 else:
-                    cell_dim = x_key.split("_")[1]
-
-                current_number_of_cells = data[x_key].shape[0]
-
-                batch_idx_dict[f"batch_{cell_dim}"].append(
-                    torch.tensor([[batch_idx] * current_number_of_cells])
-                )
-
-                if (
-                    running_idx.get(f"cell_running_idx_number_{cell_dim}")
-                    is None
-                ):
-                    running_idx[f"cell_running_idx_number_{cell_dim}"] = (
-                        current_number_of_cells
-                    )
+                    value = value.coalesce()
+            elif key == "shape":
+                shapes.append(value)
+            data[key] = value
 
+            # Count the cells of x_1, x_2, x_3, ...
+            if "x_" in key and key != "x_0":
+                if key != "x_hyperedges":
+                    cell_dim = int(key.split("_")[1])
                 else:
-                    running_idx[f"cell_running_idx_number_{cell_dim}"] += (
-                        current_number_of_cells
-                    )
+                    cell_dim = key.split("_")[1]
+                cell_counts[cell_dim][batch_idx] = value.shape[0]
 
         data_list.append(data)
 
-    batch = torch_geometric.data.Batch.from_data_list(data_list)
+    exclude_keys = list(sparse_values)
+    if len(shapes) > 0:
+        exclude_keys.append("shape")
+    batch_out = torch_geometric.data.Batch.from_data_list(
+        data_list, exclude_keys=exclude_keys
+    )
+
+    # Stack the sparse matrices block-diagonally
+    for key, matrices in sparse_values.items():
+        batch_out[key], batch_out._slice_dict[key] = block_diag(matrices)
+        batch_out._inc_dict[key] = None
 
     # Rename batch.batch to batch.batch_0 for consistency
-    batch["batch_0"] = batch.pop("batch")
+    batch_out["batch_0"] = batch_out.pop("batch")
 
     # Add batch slices to batch
-    for key, value in batch_idx_dict.items():
-        batch[key] = torch.cat(value, dim=1).squeeze(0).long()
+    graph_idx = torch.arange(len(batch))
+    for cell_dim, counts in cell_counts.items():
+        batch_out[f"batch_{cell_dim}"] = torch.repeat_interleave(
+            graph_idx, torch.tensor(counts)
+        )
 
     # Ensure shape is torch.Tensor
     # "shape" describes the number of n_cells in each graph
-    if batch.get("shape") is not None:
-        cell_statistics = batch.pop("shape")
-        batch["cell_statistics"] = torch.Tensor(cell_statistics).long()
+    if len(shapes) > 0:
+        batch_out["cell_statistics"] = torch.tensor(shapes).long()
+
+    return batch_out
+
+
+def block_diag(matrices):
+    r"""Stack sparse COO matrices block-diagonally.
+
+    Parameters
+    ----------
+    matrices : list[torch.sparse_coo_tensor]
+        Sparse matrices to stack.
+
+    Returns
+    -------
+    torch.sparse_coo_tensor
+        The block-diagonal matrix. It is coalesced.
+    torch.Tensor
+        The cumulated sizes of the matrices, of shape (len(matrices) + 1, 2),
+        as stored by `torch_geometric` to separate the batch.
+    """
+    sizes = torch.tensor([list(matrix.shape[:2]) for matrix in matrices])
+    slices = torch_geometric.utils.cumsum(sizes)
+    nnz = torch.tensor([matrix._nnz() for matrix in matrices])
+    indices = torch.cat([matrix._indices() for matrix in matrices], dim=1)
+    indices = indices + torch.repeat_interleave(slices[:-1], nnz, dim=0).t()
+    values = torch.cat([matrix._values() for matrix in matrices])
+    is_coalesced = all(matrix.is_coalesced() for matrix in matrices)
+    matrix = torch.sparse_coo_tensor(
+        indices,
+        values,
+        size=(*slices[-1].tolist(), *matrices[0].shape[2:]),
+        is_coalesced=is_coalesced,
+    )
+    if not is_coalesced:
+        matrix = matrix.coalesce()
+    return matrix, slices
+
+
+class ResidentLoader:
+    r"""Dataloader yielding the same collated batch at every iteration.
+
+    Parameters
+    ----------
+    batch : torch_geometric.data.Batch
+        The batch to yield.
+    """
+
+    def __init__(self, batch):
+        self.batch = batch
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.batch})"
+
+    def __iter__(self):
+        yield self.batch
 
-    return batch
+    def __len__(self):
+        return 1
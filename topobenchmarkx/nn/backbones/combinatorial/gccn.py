@@ -5,7 +5,10 @@ import copy
 import torch
 import torch.nn.functional as F
 from omegaconf import OmegaConf
-from torch_geometric.data import Data
+from torch.func import functional_call, vmap
+from torch_geometric.nn import norm
+
+from topobenchmarkx.data.utils import get_interrank_incidence
 
 
 class TopoTune(torch.nn.Module):
@@ -25,6 +28,14 @@ class TopoTune(torch.nn.Module):
         Whether to use edge attributes.
     activation : str
         The activation function to use. ex: 'relu', 'tanh', 'sigmoid'.
+    fuse_routes : bool, optional
+        Whether to run all the routes of a layer in one vectorized call
+        instead of one GNN call per route. The GNNs must support
+        `torch.func.vmap` and must not use normalization layers computing
+        statistics over the nodes (see `uses_node_statistics`), as the
+        padding nodes of the routes would change them. The `topotune_fused`
+        model configs use a node-wise layer normalization for this reason.
+        Default is False.
     """
 
     def __init__(
@@ -34,6 +45,7 @@ class TopoTune(torch.nn.Module):
         layers,
         use_edge_attr,
         activation,
+        fuse_routes=False,
     ):
         super().__init__()
         routes = OmegaConf.to_object(routes)
@@ -46,6 +58,14 @@ class TopoTune(torch.nn.Module):
         self.GNN = [i for i in GNN.named_modules()]
         self.final_readout = "sum"
         self.activation = activation
+        self.fuse_routes = fuse_routes
+        if fuse_routes and any(
+            uses_node_statistics(module) for module in GNN.modules()
+        ):
+            raise ValueError(
+                "Fused routes do not support normalization layers computing "
+                "statistics over the nodes."
+            )
 
         # Instantiate GNN layers
         num_routes = len(self.routes)
@@ -58,178 +78,212 @@ class TopoTune(torch.nn.Module):
         self.hidden_channels = GNN.hidden_channels
         self.out_channels = GNN.out_channels
 
-    def get_nbhd_cache(self, params):
-        """Cache the nbhd information into a dict for the complex at hand.
+    def get_interrank_incidence(self, params, src_rank, dst_rank):
+        """Return the incidence of the source cells on the destination cells.
+
+        The incidence precomputed by the `InterrankIncidences` transform is
+        used when it is in the batch.
 
         Parameters
         ----------
         params : dict
             The parameters of the batch, containing the complex.
+        src_rank : int
+            The source rank.
+        dst_rank : int
+            The destination rank.
 
         Returns
         -------
-        dict
-            The neighborhood cache.
+        torch.sparse_coo_tensor
+            The incidence of shape (n_dst_cells, n_src_cells).
         """
-        nbhd_cache = {}
-        for _, route in enumerate(self.routes):
-            src_rank, dst_rank = route
-            if src_rank != dst_rank and (src_rank, dst_rank) not in nbhd_cache:
-                n_dst_nodes = getattr(params, f"x_{dst_rank}").shape[0]
-                if src_rank == dst_rank + 1:
-                    boundary = getattr(
-                        params, f"incidence_{src_rank}"
-                    ).coalesce()
-                    nbhd_cache[(src_rank, dst_rank)] = (
-                        interrank_boundary_index(
-                            getattr(params, f"x_{src_rank}"),
-                            boundary.indices(),
-                            n_dst_nodes,
-                        )
-                    )
-                elif src_rank == dst_rank - 1:
-                    coboundary = getattr(
-                        params, f"incidence_{dst_rank}"
-                    ).T.coalesce()
-                    nbhd_cache[(src_rank, dst_rank)] = (
-                        interrank_boundary_index(
-                            getattr(params, f"x_{src_rank}"),
-                            coboundary.indices(),
-                            n_dst_nodes,
-                        )
-                    )
-                else:
-                    raise NotImplementedError(
-                        "Only 1-hop dimensional boundaries are implemented."
-                    )
-        return nbhd_cache
-
-    def intrarank_expand(self, params, src_rank, nbhd):
-        """Expand the complex into an intrarank Hasse graph.
+        key = f"interrank_incidence_{src_rank}_{dst_rank}"
+        if key in params:
+            return params[key]
+        return get_interrank_incidence(params, src_rank, dst_rank)
+
+    def get_route_index(self, params):
+        """Build the edge indices of the expanded Hasse graph of every route.
+
+        The connectivity of the complex does not change across layers, so the
+        edge indices are built once per batch and every layer only runs the
+        message passing of the GNNs. Intrarank Hasse graphs use the indices of
+        the neighborhood matrices. Interrank Hasse graphs stack the
+        destination cells before the source cells, the source cell ids being
+        shifted by the number of destination cells.
 
         Parameters
         ----------
         params : dict
-            The parameters of the batch, containting the complex.
-        src_rank : int
-            The source rank.
-        nbhd : str
-            The neighborhood to use.
+            The parameters of the batch, containing the complex.
 
         Returns
         -------
-        torch_geometric.data.Data
-            The expanded batch of intrarank Hasse graphs for this route.
+        dict
+            The edge indices of the Hasse graph of each route.
         """
-        batch_route = Data(
-            x=getattr(params, f"x_{src_rank}"),
-            edge_index=getattr(params, f"{nbhd}_{src_rank}").indices(),
-            edge_weight=getattr(params, f"{nbhd}_{src_rank}")
-            .values()
-            .squeeze(),
-            edge_attr=getattr(params, f"{nbhd}_{src_rank}").values().squeeze(),
-            requires_grad=True,
-        )
-
-        return batch_route
+        route_index_cache = {}
+        interrank_cache = {}
+        for route_index, (src_rank, dst_rank) in enumerate(self.routes):
+            if src_rank == dst_rank:
+                nbhd = self.neighborhoods[route_index]
+                edge_index = getattr(params, f"{nbhd}_{src_rank}").indices()
+            elif (src_rank, dst_rank) in interrank_cache:
+                edge_index = interrank_cache[(src_rank, dst_rank)]
+            else:
+                n_dst_nodes = getattr(params, f"x_{dst_rank}").shape[0]
+                node_ids, edge_ids = self.get_interrank_incidence(
+                    params, src_rank, dst_rank
+                ).indices()
+                edge_index = torch.stack([node_ids, edge_ids + n_dst_nodes])
+                interrank_cache[(src_rank, dst_rank)] = edge_index
+            route_index_cache[route_index] = edge_index
+        return route_index_cache
 
-    def intrarank_gnn_forward(self, batch_route, layer_idx, route_index):
-        """Forward pass of the GNN (one layer) for an intrarank Hasse graph.
+    def routes_forward(self, params, layer_idx, route_index_cache):
+        """Forward pass of the routes of a layer, one GNN call per route.
 
         Parameters
         ----------
-        batch_route : torch_geometric.data.Data
-            The batch of intrarank Hasse graphs for this route.
+        params : dict
+            The parameters of the batch, containing the complex.
         layer_idx : int
             The index of the TopoTune layer.
-        route_index : int
-            The index of the route.
+        route_index_cache : dict
+            The edge indices of the Hasse graph of each route.
 
         Returns
         -------
-        torch.tensor
-            The output of the GNN (updated features).
+        dict
+            The outputs of the GNN for each route.
         """
-        if batch_route.x.shape[0] < 2:
-            return batch_route.x
-        out = self.graph_routes[layer_idx][route_index](
-            batch_route.x,
-            batch_route.edge_index,
-            #    batch_route.edge_weight, # TODO Mathilde : some gnns take edge_weight (1d) and some take edge_attr.
-            #    batch_route.edge_attr,
-        )
-        return out
+        x_out_per_route = {}
+        for route_index, (src_rank, dst_rank) in enumerate(self.routes):
+            gnn = self.graph_routes[layer_idx][route_index]
+            edge_index = route_index_cache[route_index]
+            x_src = getattr(params, f"x_{src_rank}")
+
+            if src_rank == dst_rank and x_src.shape[0] < 2:
+                x_out = x_src
+            elif src_rank == dst_rank:
+                x_out = gnn(x_src, edge_index)
+            else:
+                # Destination cells come first in the Hasse graph
+                x_dst = getattr(params, f"x_{dst_rank}")
+                x_in = torch.vstack([torch.zeros_like(x_dst), x_src])
+                x_out = gnn(x_in, edge_index)[: x_dst.shape[0]]
 
-    def interrank_expand(
-        self, params, src_rank, dst_rank, nbhd_cache, membership
-    ):
-        """Expand the complex into an interrank Hasse graph.
+            x_out_per_route[route_index] = x_out
+        return x_out_per_route
+
+    def get_fused_route_index(self, params, route_index_cache):
+        """Stack the edge indices of the routes for the fused execution.
+
+        The Hasse graphs of all routes are padded to the same number of nodes
+        and edges. The padding edges connect an extra padding node to itself,
+        so that they do not change the outputs of the actual nodes.
 
         Parameters
         ----------
         params : dict
-            The parameters of the batch, containting the complex.
-        src_rank : int
-            The source rank.
-        dst_rank : int
-            The destination rank.
-        nbhd_cache : dict
-            The neighborhood cache containing the expanded boundary index and edge attributes.
-        membership : dict
-            The batch membership of the graphs per rank.
+            The parameters of the batch, containing the complex.
+        route_index_cache : dict
+            The edge indices of the Hasse graph of each route.
 
         Returns
         -------
-        torch_geometric.data.Data
-            The expanded batch of interrank Hasse graphs for this route.
+        torch.tensor
+            The padded edge indices, of shape (n_routes, 2, max_n_edges).
+        list[int]
+            The number of nodes of the Hasse graph of each route.
         """
-        src_batch = membership[src_rank]
-        dst_batch = membership[dst_rank]
-        edge_index, edge_attr = nbhd_cache
-        device = getattr(params, f"x_{src_rank}").device
-        feat_on_dst = torch.zeros_like(getattr(params, f"x_{dst_rank}"))
-        x_in = torch.vstack([feat_on_dst, getattr(params, f"x_{src_rank}")])
-        batch_expanded = torch.cat([dst_batch, src_batch], dim=0)
-
-        batch_route = Data(
-            x=x_in,
-            edge_index=edge_index.to(device),
-            edge_attr=edge_attr.to(device),
-            edge_weight=edge_attr.to(device),
-            batch=batch_expanded.to(device),
+        num_nodes = []
+        for src_rank, dst_rank in self.routes:
+            n_src_nodes = getattr(params, f"x_{src_rank}").shape[0]
+            if src_rank == dst_rank:
+                num_nodes.append(n_src_nodes)
+            else:
+                n_dst_nodes = getattr(params, f"x_{dst_rank}").shape[0]
+                num_nodes.append(n_dst_nodes + n_src_nodes)
+        edge_indices = [
+            route_index_cache[route_index]
+            for route_index in range(len(self.routes))
+        ]
+        edge_index = torch.full(
+            (
+                len(edge_indices),
+                2,
+                max(index.shape[1] for index in edge_indices),
+            ),
+            max(num_nodes),
+            dtype=edge_indices[0].dtype,
+            device=edge_indices[0].device,
         )
+        for route_index, index in enumerate(edge_indices):
+            edge_index[route_index, :, : index.shape[1]] = index
+        return edge_index, num_nodes
 
-        return batch_route
+    def fused_routes_forward(self, params, layer_idx, fused_route_index):
+        """Forward pass of all the routes of a layer in one call.
 
-    def interrank_gnn_forward(
-        self, batch_route, layer_idx, route_index, n_dst_cells
-    ):
-        """Forward pass of the GNN (one layer) for an interrank Hasse graph.
+        The input features of the routes are padded and stacked, the
+        parameters and buffers of the GNNs of the layer are stacked, and the
+        GNN is vectorized over the routes with `torch.func.vmap`.
 
         Parameters
         ----------
-        batch_route : torch_geometric.data.Data
-            The batch of interrank Hasse graphs for this route.
+        params : dict
+            The parameters of the batch, containing the complex.
         layer_idx : int
-            The index of the layer.
-        route_index : int
-            The index of the route.
-        n_dst_cells : int
-            The number of destination cells in the whole batch.
+            The index of the TopoTune layer.
+        fused_route_index : tuple
+            The padded edge indices and the number of nodes of the routes, as
+            returned by `get_fused_route_index`.
 
         Returns
         -------
-        torch.tensor
-            The output of the GNN (updated features).
+        dict
+            The outputs of the GNN for each route.
         """
-        expanded_out = self.graph_routes[layer_idx][route_index](
-            batch_route.x,
-            batch_route.edge_index,
-            #    batch_route.edge_weight, # TODO : some gnns take edge_weight (1d) and some take edge_attr.
-            #    batch_route.edge_attr,
+        edge_index, num_nodes = fused_route_index
+        n_padded_nodes = max(num_nodes) + 1
+        gnns = self.graph_routes[layer_idx]
+
+        x_in = []
+        for src_rank, dst_rank in self.routes:
+            x_src = getattr(params, f"x_{src_rank}")
+            if src_rank != dst_rank:
+                x_dst = getattr(params, f"x_{dst_rank}")
+                x_src = torch.vstack([torch.zeros_like(x_dst), x_src])
+            x_in.append(F.pad(x_src, (0, 0, 0, n_padded_nodes - len(x_src))))
+
+        route_tensors = [
+            {**dict(gnn.named_parameters()), **dict(gnn.named_buffers())}
+            for gnn in gnns
+        ]
+        stacked_tensors = {
+            name: torch.stack([tensors[name] for tensors in route_tensors])
+            for name in route_tensors[0]
+        }
+
+        def route_forward(tensors, x, edge_index):
+            return functional_call(gnns[0], tensors, (x, edge_index))
+
+        out = vmap(route_forward, randomness="different")(
+            stacked_tensors, torch.stack(x_in), edge_index
         )
-        out = expanded_out[:n_dst_cells]
-        return out
+
+        x_out_per_route = {}
+        for route_index, (src_rank, dst_rank) in enumerate(self.routes):
+            x_dst = getattr(params, f"x_{dst_rank}")
+            if src_rank == dst_rank and x_dst.shape[0] < 2:
+                x_out_per_route[route_index] = x_dst
+            else:
+                x_out_per_route[route_index] = out[
+                    route_index, : x_dst.shape[0]
+                ]
+        return x_out_per_route
 
     def aggregate_inter_nbhd(self, x_out_per_route):
         """Aggregate the outputs of the GNN for each rank.
@@ -256,35 +310,6 @@ class TopoTune(torch.nn.Module):
                 x_out_per_rank[dst_rank] += x_out_per_route[route_index]
         return x_out_per_rank
 
-    def generate_membership_vectors(self, batch: Data):
-        """Generate membership vectors based on batch.cell_statistics.
-
-        Parameters
-        ----------
-        batch : torch_geometric.data.Data
-            Batch object containing the batched domain data.
-
-        Returns
-        -------
-        dict
-            The batch membership of the graphs per rank.
-        """
-        max_dim = batch.cell_statistics.shape[1]
-        cell_statistics = batch.cell_statistics
-        membership = {
-            j: torch.tensor(
-                [
-                    elem
-                    for list in [
-                        [i] * x for i, x in enumerate(cell_statistics[:, j])
-                    ]
-                    for elem in list
-                ]
-            )
-            for j in range(max_dim)
-        }
-        return membership
-
     def readout(self, x):
         """Readout function for the model.
 
@@ -323,37 +348,22 @@ class TopoTune(torch.nn.Module):
         """
         act = get_activation(self.activation)
 
-        nbhd_cache = self.get_nbhd_cache(batch)
-        membership = self.generate_membership_vectors(batch)
-
-        x_out_per_route = {}
-        for layer_idx in range(self.layers):
-            for route_index, route in enumerate(self.routes):
-                src_rank, dst_rank = route
-
-                if src_rank == dst_rank:
-                    nbhd = self.neighborhoods[route_index]
-                    batch_route = self.intrarank_expand(batch, src_rank, nbhd)
-                    x_out = self.intrarank_gnn_forward(
-                        batch_route, layer_idx, route_index
-                    )
-
-                    x_out_per_route[route_index] = x_out
+        route_index_cache = self.get_route_index(batch)
 
-                elif src_rank != dst_rank:
-                    nbhd = nbhd_cache[(src_rank, dst_rank)]
-
-                    batch_route = self.interrank_expand(
-                        batch, src_rank, dst_rank, nbhd, membership
-                    )
-                    x_out = self.interrank_gnn_forward(
-                        batch_route,
-                        layer_idx,
-                        route_index,
-                        getattr(batch, f"x_{dst_rank}").shape[0],
-                    )
+        if self.fuse_routes:
+            fused_route_index = self.get_fused_route_index(
+                batch, route_index_cache
+            )
 
-                    x_out_per_route[route_index] = x_out
+        for layer_idx in range(self.layers):
+            if self.fuse_routes:
+                x_out_per_route = self.fused_routes_forward(
+                    batch, layer_idx, fused_route_index
+                )
+            else:
+                x_out_per_route = self.routes_forward(
+                    batch, layer_idx, route_index_cache
+                )
 
             # aggregate across neighborhoods
             x_out_per_rank = self.aggregate_inter_nbhd(x_out_per_route)
@@ -370,52 +380,40 @@ class TopoTune(torch.nn.Module):
         return x_out_per_rank
 
 
-def interrank_boundary_index(x_src, boundary_index, n_dst_nodes):
-    """
-    Recover lifted graph.
+def uses_node_statistics(module):
+    """Check whether a module normalizes with statistics over the nodes.
 
-    Edge-to-node boundary relationships of a graph with n_nodes and n_edges
-    can be represented as up-adjacency node relations. There are n_nodes+n_edges nodes in this lifted graph.
-    Desgiend to work for regular (edge-to-node and face-to-edge) boundary relationships.
+    Batch, instance and graph normalizations, as well as graph-mode layer
+    normalization, compute statistics over all the nodes of their input,
+    padding nodes included.
 
     Parameters
     ----------
-    x_src : torch.tensor
-        Source node features. Shape [n_src_nodes, n_features]. Should represent edge or face features.
-    boundary_index : list of lists or list of tensors
-        List boundary_index[0] stores node ids in the boundary of edge stored in boundary_index[1].
-        List boundary_index[1] stores list of edges.
-    n_dst_nodes : int
-        Number of destination nodes.
+    module : torch.nn.Module
+        The module to check.
 
     Returns
     -------
-    edge_index : list of lists
-        The edge_index[0][i] and edge_index[1][i] are the two nodes of edge i.
-    edge_attr : tensor
-        Edge features are given by feature of bounding node represnting an edge. Shape [n_edges, n_features].
+    bool
+        Whether the module uses statistics over the nodes.
     """
-    node_ids = (
-        boundary_index[0]
-        if torch.is_tensor(boundary_index[0])
-        else torch.tensor(boundary_index[0], dtype=torch.int32)
-    )
-    edge_ids = (
-        boundary_index[1]
-        if torch.is_tensor(boundary_index[1])
-        else torch.tensor(boundary_index[1], dtype=torch.int32)
-    )
-
-    max_node_id = n_dst_nodes
-    adjusted_edge_ids = edge_ids + max_node_id
-
-    edge_index = torch.zeros((2, node_ids.numel()), dtype=node_ids.dtype)
-    edge_index[0, :] = node_ids
-    edge_index[1, :] = adjusted_edge_ids
-
-    edge_attr = x_src[edge_ids].squeeze()
-
-    return edge_index, edge_attr
+    if isinstance(
+        module,
+        (
+            torch.nn.modules.batchnorm._BatchNorm,
+            torch.nn.modules.instancenorm._InstanceNorm,
+            norm.BatchNorm,
+            norm.HeteroBatchNorm,
+            norm.InstanceNorm,
+            norm.GraphNorm,
+            norm.GraphSizeNorm,
+            norm.PairNorm,
+            norm.MeanSubtractionNorm,
+            norm.DiffGroupNorm,
+        ),
+    ):
+        return True
+    return isinstance(module, norm.LayerNorm) and module.mode == "graph"
 
 
 def get_activation(nonlinearity, return_module=False):
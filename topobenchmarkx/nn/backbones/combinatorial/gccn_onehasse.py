@@ -7,6 +7,8 @@ import torch.nn.functional as F
 from omegaconf import OmegaConf
 from torch_geometric.data import Data
 
+from topobenchmarkx.data.utils import get_interrank_incidence
+
 
 class TopoTune_OneHasse(torch.nn.Module):
     """Tunes a GNN model using higher-order relations.
@@ -57,183 +59,105 @@ class TopoTune_OneHasse(torch.nn.Module):
         self.hidden_channels = GNN.hidden_channels
         self.out_channels = GNN.out_channels
 
-    def all_nbhds_expand(self, params, membership):
-        """Expand the complex into a single Hasse graph which contains all ranks and all nbhd.
+    def get_interrank_incidence(self, params, src_rank, dst_rank):
+        """Return the incidence of the source cells on the destination cells.
+
+        The incidence precomputed by the `InterrankIncidences` transform is
+        used when it is in the batch.
 
         Parameters
         ----------
         params : dict
             The parameters of the batch, containing the complex.
-        membership : dict
-            The batch membership of the graphs per rank.
+        src_rank : int
+            The source rank.
+        dst_rank : int
+            The destination rank.
 
         Returns
         -------
-        torch_geometric.data.Data
-            The expanded Hasse graph.
+        torch.sparse_coo_tensor
+            The incidence of shape (n_dst_cells, n_src_cells).
         """
+        key = f"interrank_incidence_{src_rank}_{dst_rank}"
+        if key in params:
+            return params[key]
+        return get_interrank_incidence(params, src_rank, dst_rank)
 
-        device = params.x_0.device
+    def get_hasse_index(self, params):
+        """Build the edge index of the Hasse graph containing all nbhds.
 
-        x = torch.cat(
-            [getattr(params, f"x_{i}") for i in range(self.max_rank + 1)],
-            dim=0,
-        ).to(device)
+        The cells are stacked rank by rank, so the cells of each rank are
+        shifted by the number of cells of the lower ranks. The connectivity of
+        the complex does not change across layers, so the edge index is built
+        once per batch.
 
-        max_node_id = params.x_0.shape[0]
-        max_edge_id = params.x_1.shape[0]
+        Parameters
+        ----------
+        params : dict
+            The parameters of the batch, containing the complex.
 
-        edge_indices = []
-        edge_attrs = []
+        Returns
+        -------
+        torch.tensor
+            The edge index of the expanded Hasse graph.
+        """
+        offsets = [0]
+        for rank in range(self.max_rank):
+            offsets.append(offsets[-1] + getattr(params, f"x_{rank}").shape[0])
 
+        edge_indices = []
         for route, neighborhood in zip(
             self.routes, self.neighborhoods, strict=False
         ):
-            src_rank, dst_rank = route
+            src_rank = route[0]
 
             if neighborhood == "up_laplacian" or neighborhood == "adjacency":
-                if src_rank == 0:  # node-to-edge
-                    adjustment = torch.tensor([[0], [0]]).to(device)
-                elif src_rank == 1:  # edge-to-face
-                    adjustment = torch.tensor(
-                        [[max_node_id], [max_node_id]]
-                    ).to(device)
-                else:
+                if src_rank not in (0, 1):  # node-to-node, edge-to-edge
                     raise ValueError(
                         f"Unsupported src_rank for 'up' neighborhood: {src_rank}"
                     )
-
-                edge_indices.append(
-                    getattr(params, f"{neighborhood}_{src_rank}")
-                    .indices()
-                    .to(device)
-                    + adjustment
-                )
-                edge_attrs.append(
-                    getattr(params, f"{neighborhood}_{src_rank}")
-                    .values()
-                    .squeeze()
-                )
+                index = getattr(params, f"{neighborhood}_{src_rank}").indices()
+                dst_offset = src_offset = offsets[src_rank]
 
             elif neighborhood == "down_laplacian":
-                if src_rank == 1:  # edge-to-node
-                    adjustment = torch.tensor(
-                        [[max_node_id], [max_node_id]]
-                    ).to(device)
-                elif src_rank == 2:  # face-to-edge
-                    adjustment = torch.tensor(
-                        [
-                            [max_node_id + max_edge_id],
-                            [max_node_id + max_edge_id],
-                        ]
-                    ).to(device)
-                else:
+                if src_rank not in (1, 2):  # edge-to-edge, face-to-face
                     raise ValueError(
                         f"Unsupported src_rank for 'down' neighborhood: {src_rank}"
                     )
-
-                edge_indices.append(
-                    getattr(params, f"down_laplacian_{src_rank}")
-                    .indices()
-                    .to(device)
-                    + adjustment
-                )
-                edge_attrs.append(
-                    getattr(params, f"down_laplacian_{src_rank}")
-                    .values()
-                    .squeeze()
-                )
+                index = getattr(params, f"down_laplacian_{src_rank}").indices()
+                dst_offset = src_offset = offsets[src_rank]
 
             elif neighborhood == "boundary" or neighborhood == "bdry":
-                if src_rank == 1:  # edge-to-face
-                    adjustment = torch.tensor([[0], [max_node_id]]).to(device)
-                elif src_rank == 2:  # face-to-edge
-                    adjustment = torch.tensor(
-                        [[max_node_id], [max_node_id + max_edge_id]]
-                    ).to(device)
-                else:
+                if src_rank not in (1, 2):  # edge-to-node, face-to-edge
                     raise ValueError(
                         f"Unsupported src_rank for 'boundary' neighborhood: {src_rank}"
                     )
-
-                edge_indices.append(
-                    getattr(params, f"incidence_{src_rank}")
-                    .coalesce()
-                    .indices()
-                    .to(device)
-                    + adjustment
-                )
-                edge_attrs.append(
-                    getattr(params, f"incidence_{src_rank}").values().squeeze()
-                )
+                index = self.get_interrank_incidence(
+                    params, src_rank, src_rank - 1
+                ).indices()
+                dst_offset = offsets[src_rank - 1]
+                src_offset = offsets[src_rank]
 
             elif neighborhood == "coboundary" or neighborhood == "cobdry":
-                if src_rank == 0:  # node-to-edge
-                    adjustment = torch.tensor([[max_node_id], [0]]).to(device)
-                elif src_rank == 1:  # edge-to-face
-                    adjustment = torch.tensor(
-                        [[max_node_id + max_edge_id], [max_node_id]]
-                    ).to(device)
-                else:
+                if src_rank not in (0, 1):  # node-to-edge, edge-to-face
                     raise ValueError(
                         f"Unsupported src_rank for 'cbdry' neighborhood: {src_rank}"
                     )
-                coincidence_indices = (
-                    getattr(params, f"incidence_{src_rank + 1}")
-                    .T.coalesce()
-                    .indices()
-                    .to(device)
-                    + adjustment
-                )
+                index = self.get_interrank_incidence(
+                    params, src_rank, src_rank + 1
+                ).indices()
+                dst_offset = offsets[src_rank + 1]
+                src_offset = offsets[src_rank]
 
-                edge_indices.append(coincidence_indices)
-                # edge_attrs.append(
-                #     getattr(params, f"incidence_{src_rank}")
-                #     .T.coalesce()
-                #     .values()
-                #     .squeeze()
-                # )
-
-        edge_index = torch.cat(edge_indices, dim=1)
-        # edge_attr = torch.cat(edge_attrs, dim=0)
-
-        batch_expanded = torch.cat(
-            [membership[0], membership[1], membership[2]], dim=0
-        ).to(device)
-
-        return Data(
-            x=x,
-            edge_index=edge_index,
-            # edge_attr=edge_attr,
-            batch=batch_expanded,
-        )
+            else:
+                continue
 
-    def all_nbhds_gnn_forward(
-        self,
-        batch_route,
-        layer_idx,
-    ):
-        """Forward pass of the GNN (one layer) for an intrarank Hasse graph.
+            edge_indices.append(
+                torch.stack([index[0] + dst_offset, index[1] + src_offset])
+            )
 
-        Parameters
-        ----------
-        batch_route : torch_geometric.data.Data
-            The batch of intrarank Hasse graphs for this route.
-        layer_idx : int
-            The index of the TopoTune layer.
-
-        Returns
-        -------
-        torch.tensor
-            The output of the GNN (updated features).
-        """
-        out = self.graph_routes[layer_idx](
-            batch_route.x,
-            batch_route.edge_index,
-            #    batch_route.edge_weight, # TODO : some gnns take edge_weight (1d) and some take edge_attr.
-            #    batch_route.edge_attr,
-        )
-        return out
+        return torch.cat(edge_indices, dim=1)
 
     def aggregate_inter_nbhd(self, x_out):
         """Aggregate the outputs of the GNN for each rank.
@@ -268,6 +192,9 @@ class TopoTune_OneHasse(torch.nn.Module):
     def generate_membership_vectors(self, batch: Data):
         """Generate membership vectors based on batch.cell_statistics.
 
+        The batch vectors `batch_{rank}` emitted by the collate function are
+        used when they are available.
+
         Parameters
         ----------
         batch : torch_geometric.data.Data
@@ -278,20 +205,17 @@ class TopoTune_OneHasse(torch.nn.Module):
         dict
             The batch membership of the graphs per rank.
         """
-        max_dim = batch.cell_statistics.shape[1]
         cell_statistics = batch.cell_statistics
-        membership = {
-            j: torch.tensor(
-                [
-                    elem
-                    for list in [
-                        [i] * x for i, x in enumerate(cell_statistics[:, j])
-                    ]
-                    for elem in list
-                ]
-            )
-            for j in range(max_dim)
-        }
+        graph_ids = torch.arange(
+            cell_statistics.shape[0], device=cell_statistics.device
+        )
+        membership = {}
+        for rank in range(cell_statistics.shape[1]):
+            membership[rank] = batch.get(f"batch_{rank}")
+            if membership[rank] is None:
+                membership[rank] = torch.repeat_interleave(
+                    graph_ids, cell_statistics[:, rank]
+                )
         return membership
 
     def forward(self, batch):
@@ -317,12 +241,13 @@ class TopoTune_OneHasse(torch.nn.Module):
             x_out_per_rank[2] = batch.x_2
             return x_out_per_rank
 
+        edge_index = self.get_hasse_index(batch)
         for layer_idx in range(self.layers):
-            batch_route = self.all_nbhds_expand(batch, self.membership)
-            x_out = self.all_nbhds_gnn_forward(
-                batch_route,
-                layer_idx,
+            x = torch.cat(
+                [getattr(batch, f"x_{i}") for i in range(self.max_rank + 1)],
+                dim=0,
             )
+            x_out = self.graph_routes[layer_idx](x, edge_index)
 
             # aggregate across neighborhoods
             x_out_per_rank = self.aggregate_inter_nbhd(x_out)
@@ -85,10 +85,24 @@ class SCCNNCustom(torch.nn.Module):
         in_x_1 = self.in_linear_1(x_1)
         in_x_2 = self.in_linear_2(x_2)
 
+        # The aggregation normalization only depends on the Laplacians, so it
+        # is computed once for all the layers
+        neighborhood_sizes_inv = None
+        if self.layers[0].aggr_norm:
+            neighborhood_sizes_inv = tuple(
+                SCCNNLayer.neighborhood_size_inv(laplacian)
+                for laplacian in laplacian_all
+            )
+
         # Forward through SCCNN
         x_all = (in_x_0, in_x_1, in_x_2)
         for layer in self.layers:
-            x_all = layer(x_all, laplacian_all, incidence_all)
+            x_all = layer(
+                x_all,
+                laplacian_all,
+                incidence_all,
+                neighborhood_sizes_inv=neighborhood_sizes_inv,
+            )
 
         return x_all
 
@@ -209,7 +223,33 @@ class SCCNNLayer(torch.nn.Module):
                 "Should be either xavier_uniform or xavier_normal."
             )
 
-    def aggr_norm_func(self, conv_operator, x):
+    @staticmethod
+    def neighborhood_size_inv(conv_operator):
+        r"""Compute the inverse neighborhood sizes of a convolution operator.
+
+        The neighborhood sizes are the row sums of the operator, scattered
+        from its nonzero entries. Rows that sum to zero get a zero inverse.
+
+        Parameters
+        ----------
+        conv_operator : torch.sparse
+            Convolution operator.
+
+        Returns
+        -------
+        torch.Tensor
+            Inverse neighborhood sizes, one per row of the operator.
+        """
+        conv_operator = conv_operator.coalesce()
+        values = conv_operator.values()
+        neighborhood_size = torch.zeros(
+            conv_operator.shape[0], dtype=values.dtype, device=values.device
+        ).index_add_(0, conv_operator.indices()[0], values)
+        neighborhood_size_inv = 1 / neighborhood_size
+        neighborhood_size_inv[~(torch.isfinite(neighborhood_size_inv))] = 0
+        return neighborhood_size_inv
+
+    def aggr_norm_func(self, conv_operator, x, neighborhood_size_inv=None):
         r"""Perform aggregation normalization.
 
         Parameters
@@ -218,19 +258,20 @@ class SCCNNLayer(torch.nn.Module):
             Convolution operator.
         x : torch.Tensor
             Feature tensor.
+        neighborhood_size_inv : torch.Tensor, optional
+            Precomputed inverse neighborhood sizes of the operator (default:
+            None, in which case they are computed).
 
         Returns
         -------
         torch.Tensor
             Normalized feature tensor.
         """
-        neighborhood_size = torch.sum(conv_operator.to_dense(), dim=1)
-        neighborhood_size_inv = 1 / neighborhood_size
-        neighborhood_size_inv[~(torch.isfinite(neighborhood_size_inv))] = 0
+        if neighborhood_size_inv is None:
+            neighborhood_size_inv = self.neighborhood_size_inv(conv_operator)
 
-        x = torch.einsum("i,ij->ij ", neighborhood_size_inv, x)
-        x[~torch.isfinite(x)] = 0
-        return x
+        x = neighborhood_size_inv.unsqueeze(1) * x
+        return torch.nan_to_num(x, nan=0.0, posinf=0.0, neginf=0.0)
 
     def update(self, x):
         """Update embeddings on each cell (step 4).
@@ -251,7 +292,9 @@ class SCCNNLayer(torch.nn.Module):
             return torch.nn.functional.relu(x)
         return None
 
-    def chebyshev_conv(self, conv_operator, conv_order, x):
+    def chebyshev_conv(
+        self, conv_operator, conv_order, x, neighborhood_size_inv=None
+    ):
         r"""Perform Chebyshev convolution.
 
         Parameters
@@ -262,30 +305,34 @@ class SCCNNLayer(torch.nn.Module):
             Order of the convolution.
         x : torch.Tensor
             Feature tensor.
+        neighborhood_size_inv : torch.Tensor, optional
+            Precomputed inverse neighborhood sizes of the operator, used when
+            `aggr_norm` is True (default: None, in which case they are
+            computed once for all the orders).
 
         Returns
         -------
         torch.Tensor
             Output tensor.
         """
-        num_simplices, num_channels = x.shape
-        X = torch.empty(size=(num_simplices, num_channels, conv_order)).to(
-            x.device
-        )
-
-        if self.aggr_norm:
-            X[:, :, 0] = torch.mm(conv_operator, x)
-            X[:, :, 0] = self.aggr_norm_func(conv_operator, X[:, :, 0])
-            for k in range(1, conv_order):
-                X[:, :, k] = torch.mm(conv_operator, X[:, :, k - 1])
-                X[:, :, k] = self.aggr_norm_func(conv_operator, X[:, :, k])
-        else:
-            X[:, :, 0] = torch.mm(conv_operator, x)
-            for k in range(1, conv_order):
-                X[:, :, k] = torch.mm(conv_operator, X[:, :, k - 1])
-        return X
+        if self.aggr_norm and neighborhood_size_inv is None:
+            neighborhood_size_inv = self.neighborhood_size_inv(conv_operator)
+
+        X = []
+        for _ in range(conv_order):
+            x = torch.mm(conv_operator, x)
+            if self.aggr_norm:
+                x = self.aggr_norm_func(
+                    conv_operator, x, neighborhood_size_inv
+                )
+            X.append(x)
+        # A single allocation of the (num_simplices, num_channels,
+        # conv_order) output
+        return torch.stack(X, dim=2)
 
-    def forward(self, x_all, laplacian_all, incidence_all):
+    def forward(
+        self, x_all, laplacian_all, incidence_all, neighborhood_sizes_inv=None
+    ):
         r"""Forward computation.
 
         Parameters
@@ -296,6 +343,10 @@ class SCCNNLayer(torch.nn.Module):
             Tuple of Laplacian tensors (graph laplacian L0, down edge laplacian L1_d, upper edge laplacian L1_u, face laplacian L2).
         incidence_all : tuple of tensors
             Tuple of order 1 and 2 incidence matrices.
+        neighborhood_sizes_inv : tuple of tensors, optional
+            Inverse neighborhood sizes of the Laplacians, used when
+            `aggr_norm` is True (default: None, in which case they are
+            computed).
 
         Returns
         -------
@@ -308,10 +359,20 @@ class SCCNNLayer(torch.nn.Module):
         """
         x_0, x_1, x_2 = x_all
 
+        # Compute the aggregation normalization once per Laplacian
+        if neighborhood_sizes_inv is None:
+            neighborhood_sizes_inv = tuple(
+                self.neighborhood_size_inv(laplacian)
+                if self.aggr_norm
+                else None
+                for laplacian in laplacian_all
+            )
+
         if self.sc_order == 2:
             laplacian_0, laplacian_down_1, laplacian_up_1, laplacian_2 = (
                 laplacian_all
             )
+            inv_0, inv_down_1, inv_up_1, _ = neighborhood_sizes_inv
         elif self.sc_order > 2:
             (
                 laplacian_0,
@@ -320,6 +381,13 @@ class SCCNNLayer(torch.nn.Module):
                 laplacian_down_2,
                 laplacian_up_2,
             ) = laplacian_all
+            (
+                inv_0,
+                inv_down_1,
+                inv_up_1,
+                inv_down_2,
+                inv_up_2,
+            ) = neighborhood_sizes_inv
 
         # num_nodes, num_edges, num_triangles = x_0.shape[0], x_1.shape[0], x_2.shape[0]
 
@@ -338,7 +406,9 @@ class SCCNNLayer(torch.nn.Module):
         # x_0_to_0 = self.chebyshev_conv(laplacian_0, self.conv_order, x_0)
         # x_0_to_0 = torch.cat((x_identity_0, x_0_to_0), 2)
 
-        x_0_laplacian = self.chebyshev_conv(laplacian_0, self.conv_order, x_0)
+        x_0_laplacian = self.chebyshev_conv(
+            laplacian_0, self.conv_order, x_0, inv_0
+        )
         x_0_to_0 = torch.cat([x_0.unsqueeze(2), x_0_laplacian], dim=2)
         # -------------------
 
@@ -349,7 +419,7 @@ class SCCNNLayer(torch.nn.Module):
 
         x_1_to_0_upper = torch.mm(b1, x_1)
         x_1_to_0_laplacian = self.chebyshev_conv(
-            laplacian_0, self.conv_order, x_1_to_0_upper
+            laplacian_0, self.conv_order, x_1_to_0_upper, inv_0
         )
         x_1_to_0 = torch.cat(
             [x_1_to_0_upper.unsqueeze(2), x_1_to_0_laplacian], dim=2
@@ -369,8 +439,12 @@ class SCCNNLayer(torch.nn.Module):
         # x_1_up = self.chebyshev_conv(laplacian_up_1, self.conv_order, x_1)
         # x_1_to_1 = torch.cat((x_identity_1, x_1_down, x_1_up), 2)
 
-        x_1_down = self.chebyshev_conv(laplacian_down_1, self.conv_order, x_1)
-        x_1_up = self.chebyshev_conv(laplacian_down_1, self.conv_order, x_1)
+        x_1_down = self.chebyshev_conv(
+            laplacian_down_1, self.conv_order, x_1, inv_down_1
+        )
+        x_1_up = self.chebyshev_conv(
+            laplacian_down_1, self.conv_order, x_1, inv_down_1
+        )
         x_1_to_1 = torch.cat((x_1.unsqueeze(2), x_1_down, x_1_up), 2)
 
         # -------------------
@@ -385,12 +459,12 @@ class SCCNNLayer(torch.nn.Module):
 
         # Calculate lowwer chebyshev_conv
         x_0_1_down = self.chebyshev_conv(
-            laplacian_down_1, self.conv_order, x_0_1_lower
+            laplacian_down_1, self.conv_order, x_0_1_lower, inv_down_1
         )
 
         # Calculate upper chebyshev_conv (Note: in case of signed incidence should be always zero)
         x_0_1_up = self.chebyshev_conv(
-            laplacian_up_1, self.conv_order, x_0_1_lower
+            laplacian_up_1, self.conv_order, x_0_1_lower, inv_up_1
         )
 
         # Concatenate output of filters
@@ -408,12 +482,12 @@ class SCCNNLayer(torch.nn.Module):
 
         # Calculate lowwer chebyshev_conv (Note: In case of signed incidence should be always zero)
         x_2_1_down = self.chebyshev_conv(
-            laplacian_down_1, self.conv_order, x_2_1_upper
+            laplacian_down_1, self.conv_order, x_2_1_upper, inv_down_1
         )
 
         # Calculate upper chebyshev_conv
         x_2_1_up = self.chebyshev_conv(
-            laplacian_up_1, self.conv_order, x_2_1_upper
+            laplacian_up_1, self.conv_order, x_2_1_upper, inv_up_1
         )
 
         x_2_to_1 = torch.cat(
@@ -434,8 +508,12 @@ class SCCNNLayer(torch.nn.Module):
         #     x_2_down = self.chebyshev_conv(laplacian_down_2, self.conv_order, x_2)
         #     x_2_up = self.chebyshev_conv(laplacian_up_2, self.conv_order, x_2)
         #     x_2_to_2 = torch.cat((x_identity_2, x_2_down, x_2_up), 2)
-        x_2_down = self.chebyshev_conv(laplacian_down_2, self.conv_order, x_2)
-        x_2_up = self.chebyshev_conv(laplacian_up_2, self.conv_order, x_2)
+        x_2_down = self.chebyshev_conv(
+            laplacian_down_2, self.conv_order, x_2, inv_down_2
+        )
+        x_2_up = self.chebyshev_conv(
+            laplacian_up_2, self.conv_order, x_2, inv_up_2
+        )
         x_2_to_2 = torch.cat((x_2.unsqueeze(2), x_2_down, x_2_up), 2)
 
         # -------------------
@@ -450,10 +528,10 @@ class SCCNNLayer(torch.nn.Module):
 
         x_1_2_lower = torch.mm(b2.T, x_1)
         x_1_2_down = self.chebyshev_conv(
-            laplacian_down_2, self.conv_order, x_1_2_lower
+            laplacian_down_2, self.conv_order, x_1_2_lower, inv_down_2
         )
         x_1_2_down = self.chebyshev_conv(
-            laplacian_up_2, self.conv_order, x_1_2_lower
+            laplacian_up_2, self.conv_order, x_1_2_lower, inv_up_2
         )
 
         x_1_to_2 = torch.cat(
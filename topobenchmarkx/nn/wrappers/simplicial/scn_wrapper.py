@@ -1,7 +1,6 @@
 """Wrapper for the SCNW model."""
 
-import torch
-
+from topobenchmarkx.data.utils import normalize_sparse_matrix
 from topobenchmarkx.nn.wrappers.base import AbstractWrapper
 
 
@@ -25,9 +24,9 @@ class SCNWrapper(AbstractWrapper):
         dict
             Dictionary containing the updated model output.
         """
-        laplacian_0 = self.normalize_matrix(batch.hodge_laplacian_0)
-        laplacian_1 = self.normalize_matrix(batch.hodge_laplacian_1)
-        laplacian_2 = self.normalize_matrix(batch.hodge_laplacian_2)
+        laplacian_0, laplacian_1, laplacian_2 = (
+            self.get_normalized_laplacian(batch, rank) for rank in range(3)
+        )
         x_0, x_1, x_2 = self.backbone(
             batch.x_0,
             batch.x_1,
@@ -44,6 +43,30 @@ class SCNWrapper(AbstractWrapper):
 
         return model_out
 
+    def get_normalized_laplacian(self, batch, rank):
+        r"""Return the normalized Hodge Laplacian of a given rank.
+
+        The normalized Laplacian precomputed by the `NormalizeLaplacians`
+        transform is used when it is in the batch, otherwise it is computed
+        on the fly.
+
+        Parameters
+        ----------
+        batch : torch_geometric.data.Data
+            Batch object containing the batched data.
+        rank : int
+            Rank of the Hodge Laplacian.
+
+        Returns
+        -------
+        torch.sparse.FloatTensor
+            Normalized Hodge Laplacian.
+        """
+        normalized = batch.get(f"normalized_hodge_laplacian_{rank}", None)
+        if normalized is not None:
+            return normalized
+        return self.normalize_matrix(batch[f"hodge_laplacian_{rank}"])
+
     def normalize_matrix(self, matrix):
         r"""Normalize the input matrix.
 
@@ -59,18 +82,4 @@ class SCNWrapper(AbstractWrapper):
         torch.sparse.FloatTensor
             Normalized matrix.
         """
-        matrix_ = matrix.to_dense()
-        n, _ = matrix_.shape
-        abs_matrix = abs(matrix_)
-        diag_sum = abs_matrix.sum(axis=1)
-
-        # Handle division by zero
-        idxs = torch.where(diag_sum != 0)
-        diag_sum[idxs] = 1.0 / torch.sqrt(diag_sum[idxs])
-
-        diag_indices = torch.stack([torch.arange(n), torch.arange(n)])
-        diag_matrix = torch.sparse_coo_tensor(
-            diag_indices, diag_sum, matrix_.shape, device=matrix.device
-        ).coalesce()
-        normalized_matrix = diag_matrix @ (matrix @ diag_matrix)
-        return normalized_matrix
+        return normalize_sparse_matrix(matrix)
@@ -7,10 +7,12 @@ from .equal_gaus_features import EqualGausFeatures
 from .identity_transform import IdentityTransform
 from .infere_knn_connectivity import InfereKNNConnectivity
 from .infere_radius_connectivity import InfereRadiusConnectivity
+from .interrank_incidences import InterrankIncidences
 from .keep_only_connected_component import KeepOnlyConnectedComponent
 from .keep_selected_data_fields import KeepSelectedDataFields
 from .node_degrees import NodeDegrees
 from .node_features_to_float import NodeFeaturesToFloat
+from .normalize_laplacians import NormalizeLaplacians
 from .one_hot_degree_features import OneHotDegreeFeatures
 
 DATA_MANIPULATIONS = {
@@ -24,6 +26,8 @@ DATA_MANIPULATIONS = {
     "CalculateSimplicialCurvature": CalculateSimplicialCurvature,
     "KeepOnlyConnectedComponent": KeepOnlyConnectedComponent,
     "KeepSelectedDataFields": KeepSelectedDataFields,
+    "NormalizeLaplacians": NormalizeLaplacians,
+    "InterrankIncidences": InterrankIncidences,
 }
 
 __all__ = [
@@ -37,5 +41,7 @@ __all__ = [
     "CalculateSimplicialCurvature",
     "OneHotDegreeFeatures",
     "KeepSelectedDataFields",
+    "NormalizeLaplacians",
+    "InterrankIncidences",
     "DATA_MANIPULATIONS",
 ]
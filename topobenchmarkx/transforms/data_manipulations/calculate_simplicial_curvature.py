@@ -34,11 +34,64 @@ class CalculateSimplicialCurvature(torch_geometric.transforms.BaseTransform):
         torch_geometric.data.Data
             The transformed data.
         """
-        data = self.one_cell_curvature(data)
-        data = self.zero_cell_curvature(data)
-        data = self.two_cell_curvature(data)
+        # Ranks whose incidences or degrees are missing are skipped
+        if self._has_fields(
+            data, ["incidence_1", "0_cell_degrees", "1_cell_degrees"]
+        ):
+            data = self.one_cell_curvature(data)
+            data = self.zero_cell_curvature(data)
+        if self._has_fields(
+            data, ["incidence_2", "incidence_3", "2_cell_degrees"]
+        ):
+            data = self.two_cell_curvature(data)
         return data
 
+    @staticmethod
+    def _has_fields(data: torch_geometric.data.Data, fields: list) -> bool:
+        r"""Check whether the input data contains all the given fields.
+
+        Parameters
+        ----------
+        data : torch_geometric.data.Data
+            The input data.
+        fields : list[str]
+            Names of the fields.
+
+        Returns
+        -------
+        bool
+            Whether all the fields are in the data.
+        """
+        return all(data.get(field, None) is not None for field in fields)
+
+    @staticmethod
+    def _off_diagonal_row_sums(incidence: torch.Tensor) -> torch.Tensor:
+        r"""Return the row sums of `incidence.T @ incidence` off its diagonal.
+
+        The sums are obtained from two sparse matrix-vector products, the
+        diagonal being the squared norms of the columns, so the product
+        itself is never materialized.
+
+        Parameters
+        ----------
+        incidence : torch.Tensor
+            Sparse matrix of shape (m, n).
+
+        Returns
+        -------
+        torch.Tensor
+            Tensor of shape (n, 1).
+        """
+        incidence = incidence.coalesce()
+        ones = torch.ones(incidence.shape[1], 1, dtype=incidence.dtype)
+        row_sums = torch.sparse.mm(
+            incidence.t(), torch.sparse.mm(incidence, ones)
+        )
+        diagonal = torch.zeros(
+            incidence.shape[1], dtype=incidence.dtype
+        ).index_add_(0, incidence.indices()[1], incidence.values() ** 2)
+        return row_sums - diagonal.unsqueeze(1)
+
     def zero_cell_curvature(
         self,
         data: torch_geometric.data.Data,
@@ -101,18 +154,11 @@ class CalculateSimplicialCurvature(torch_geometric.transforms.BaseTransform):
         """
         # Term 1 is simply the degree of the 2-cell (i.e. each triangle belong to n tetrahedrons)
         term1 = data["2_cell_degrees"]
-        # Find triangles that belong to multiple tetrahedrons
-        two_cell_degrees = data["2_cell_degrees"].clone()
-        idx = torch.where(data["2_cell_degrees"] > 1)[0]
-        two_cell_degrees[idx] = 0
-        up = data["incidence_3"].to_dense() @ data["incidence_3"].to_dense().T
-        down = (
-            data["incidence_2"].to_dense().T @ data["incidence_2"].to_dense()
-        )
-        mask = torch.eye(up.size()[0]).bool()
-        up.masked_fill_(mask, 0)
-        down.masked_fill_(mask, 0)
-        diff = (down - up) * 1
-        term2 = diff.sum(1, keepdim=True)
+        # Term 2 is the number of lower neighbors of the 2-cell (triangles
+        # sharing an edge) minus its number of upper neighbors (triangles
+        # sharing a tetrahedron)
+        down = self._off_diagonal_row_sums(data["incidence_2"])
+        up = self._off_diagonal_row_sums(data["incidence_3"].t())
+        term2 = down - up
         data["2_cell_curvature"] = 3 + term1 - term2
         return data
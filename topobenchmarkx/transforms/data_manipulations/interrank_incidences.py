@@ -0,0 +1,52 @@
+"""A transform that precomputes the interrank incidences of TopoTune routes."""
+
+import torch_geometric
+
+from topobenchmarkx.data.utils import get_interrank_incidence
+
+
+class InterrankIncidences(torch_geometric.transforms.BaseTransform):
+    r"""A transform that precomputes the interrank incidences of routes.
+
+    For every route [[src_rank, dst_rank], neighborhood] between two
+    different ranks, the incidence of the source cells on the destination
+    cells is stored in the field `interrank_incidence_{src_rank}_{dst_rank}`,
+    with the destination cells as rows. These fields contain "incidence" and
+    are therefore batched block-diagonally, so TopoTune reads the edge
+    indices of its interrank Hasse graphs from the batch instead of
+    transposing and coalescing the incidences at every training step.
+
+    Parameters
+    ----------
+    **kwargs : optional
+        Parameters for the transform. `routes` (list) lists the routes, in
+        the format of the TopoTune backbone.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__()
+        self.type = "interrank_incidences"
+        self.parameters = kwargs
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(type={self.type!r}, parameters={self.parameters!r})"
+
+    def forward(self, data: torch_geometric.data.Data):
+        r"""Apply the transform to the input data.
+
+        Parameters
+        ----------
+        data : torch_geometric.data.Data
+            The input data.
+
+        Returns
+        -------
+        torch_geometric.data.Data
+            The transformed data.
+        """
+        for route in self.parameters["routes"]:
+            src_rank, dst_rank = int(route[0][0]), int(route[0][1])
+            key = f"interrank_incidence_{src_rank}_{dst_rank}"
+            if src_rank != dst_rank and key not in data:
+                data[key] = get_interrank_incidence(data, src_rank, dst_rank)
+        return data
@@ -1,5 +1,6 @@
 """Node degrees transform."""
 
+import torch
 import torch_geometric
 
 
@@ -62,25 +63,27 @@ class NodeDegrees(torch_geometric.transforms.BaseTransform):
             The transformed data.
         """
         if data[field].is_sparse:
-            degrees = abs(data[field].to_dense()).sum(1)
+            incidence = data[field].coalesce()
+            degrees = torch.zeros(
+                incidence.shape[0], dtype=incidence.dtype
+            ).index_add_(0, incidence.indices()[0], incidence.values().abs())
         else:
-            assert (
-                field == "edge_index"
-            ), "Following logic of finding degrees is only implemented for edge_index"
+            assert field == "edge_index", (
+                "Following logic of finding degrees is only implemented for edge_index"
+            )
 
             # Get number of nodes
             if data.get("num_nodes", None):
                 max_num_nodes = data["num_nodes"]
             else:
                 max_num_nodes = data["x"].shape[0]
-            degrees = (
-                torch_geometric.utils.to_dense_adj(
-                    data[field],
-                    max_num_nodes=max_num_nodes,
-                )
-                .squeeze(0)
-                .sum(1)
-            )
+            # Count the edges per source node, ignoring the edges that point
+            # outside of the graph
+            edge_index = data[field]
+            mask = (edge_index < max_num_nodes).all(dim=0)
+            degrees = torch.bincount(
+                edge_index[0, mask], minlength=max_num_nodes
+            ).float()
 
         if "incidence" in field:
             field_name = (
@@ -0,0 +1,54 @@
+"""A transform that precomputes normalized connectivity matrices."""
+
+import torch_geometric
+
+from topobenchmarkx.data.utils import normalize_sparse_matrix
+
+
+class NormalizeLaplacians(torch_geometric.transforms.BaseTransform):
+    r"""A transform that precomputes normalized connectivity matrices.
+
+    Every selected sparse matrix A is normalized as D^{-1/2} A D^{-1/2}, D
+    being the diagonal matrix of its absolute row sums, and stored in the
+    field `normalized_<field>`. Models can then read the normalized
+    operators instead of recomputing them at every training step.
+
+    Parameters
+    ----------
+    **kwargs : optional
+        Parameters for the transform. `selected_fields` (list[str]) lists
+        the fields to normalize, by default the Hodge Laplacians of rank 0
+        to 2.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__()
+        self.type = "normalize_laplacians"
+        self.parameters = kwargs
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(type={self.type!r}, parameters={self.parameters!r})"
+
+    def forward(self, data: torch_geometric.data.Data):
+        r"""Apply the transform to the input data.
+
+        Parameters
+        ----------
+        data : torch_geometric.data.Data
+            The input data.
+
+        Returns
+        -------
+        torch_geometric.data.Data
+            The transformed data.
+        """
+        selected_fields = self.parameters.get(
+            "selected_fields",
+            [f"hodge_laplacian_{rank}" for rank in range(3)],
+        )
+        for field in selected_fields:
+            if field in data:
+                data[f"normalized_{field}"] = normalize_sparse_matrix(
+                    data[field]
+                )
+        return data
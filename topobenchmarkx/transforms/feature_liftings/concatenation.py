@@ -3,6 +3,8 @@
 import torch
 import torch_geometric
 
+from topobenchmarkx.transforms.feature_liftings.utils import get_sorted_faces
+
 
 class Concatenation(torch_geometric.transforms.BaseTransform):
     r"""Lift r-cell features to r+1-cells by concatenation.
@@ -44,14 +46,7 @@ class Concatenation(torch_geometric.transforms.BaseTransform):
                 _, n = incidence.shape
 
                 if n != 0:
-                    idxs_list = []
-                    for n_feature in range(n):
-                        idxs_for_feature = incidence.indices()[
-                            0, incidence.indices()[1, :] == n_feature
-                        ]
-                        idxs_list.append(torch.sort(idxs_for_feature)[0])
-
-                    idxs = torch.stack(idxs_list, dim=0)
+                    idxs = get_sorted_faces(incidence)
                     values = data[f"x_{idx_to_project}"][idxs].view(n, -1)
                 else:
                     values = torch.tensor([])
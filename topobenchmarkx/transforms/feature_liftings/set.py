@@ -3,6 +3,8 @@
 import torch
 import torch_geometric
 
+from topobenchmarkx.transforms.feature_liftings.utils import get_sorted_faces
+
 
 class Set(torch_geometric.transforms.BaseTransform):
     r"""Lift r-cell features to r+1-cells by set operations.
@@ -44,14 +46,7 @@ class Set(torch_geometric.transforms.BaseTransform):
                 _, n = incidence.shape
 
                 if n != 0:
-                    idxs_list = []
-                    for n_feature in range(n):
-                        idxs_for_feature = incidence.indices()[
-                            0, incidence.indices()[1, :] == n_feature
-                        ]
-                        idxs_list.append(torch.sort(idxs_for_feature)[0])
-
-                    idxs = torch.stack(idxs_list, dim=0)
+                    idxs = get_sorted_faces(incidence)
                     if elem == "1":
                         values = idxs
                     else:
@@ -0,0 +1,33 @@
+"""Utilities for the feature liftings."""
+
+import torch
+
+
+def get_sorted_faces(incidence: torch.Tensor) -> torch.Tensor:
+    r"""Return the sorted faces of every cell of an incidence matrix.
+
+    The nonzero entries are sorted once by (cell, face), so that the faces of
+    every cell are contiguous and in increasing order.
+
+    Parameters
+    ----------
+    incidence : torch.Tensor
+        Sparse incidence matrix of shape (num_faces, num_cells). All the cells
+        must have the same number of faces.
+
+    Returns
+    -------
+    torch.Tensor
+        Tensor of shape (num_cells, num_faces_per_cell) with the sorted faces
+        of every cell.
+    """
+    m, n = incidence.shape
+    row, col = incidence.indices()
+    counts = torch.bincount(col, minlength=n)
+    if (counts != counts[0]).any():
+        raise ValueError(
+            "All the cells must have the same number of faces to lift their "
+            "features."
+        )
+    order = torch.argsort(col * m + row)
+    return row[order].view(n, int(counts[0]))
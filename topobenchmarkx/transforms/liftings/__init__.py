@@ -1,6 +1,7 @@
 """This module implements the liftings for the topological transforms."""
 
 from .base import AbstractLifting
+from .graph import ArrayGraph
 from .liftings import (
     CellComplexLifting,
     CombinatorialLifting,
@@ -12,6 +13,7 @@ from .liftings import (
 
 __all__ = [
     "AbstractLifting",
+    "ArrayGraph",
     "GraphLifting",
     "PointCloudLifting",
     "SimplicialLifting",
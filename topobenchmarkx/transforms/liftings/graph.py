@@ -0,0 +1,180 @@
+"""This module implements an array-backed graph used by the liftings."""
+
+import networkx as nx
+import torch
+import torch_geometric
+
+
+class ArrayGraph:
+    r"""Undirected graph stored as index and feature tensors.
+
+    The graph keeps the sorted undirected edges, the adjacency in CSR format
+    and the node and edge features, without creating Python objects per node
+    or per edge. A networkx graph is only built, and cached, when requested
+    with `to_networkx`.
+
+    Parameters
+    ----------
+    edge_index : torch.Tensor
+        Edge indices of the graph. Both directions of an edge, as well as
+        repeated edges, describe the same undirected edge.
+    num_nodes : int
+        Number of nodes of the graph.
+    x : torch.Tensor, optional
+        Node features. Default is None.
+    edge_attr : torch.Tensor, optional
+        Edge features aligned with `edge_index`. The features of an
+        undirected edge are those of its last occurrence in `edge_index`.
+        Default is None.
+    """
+
+    def __init__(self, edge_index, num_nodes, x=None, edge_attr=None):
+        self.num_nodes = num_nodes
+        self.x = x
+
+        # Sorted undirected edges (u, v) with u <= v
+        source, target = edge_index[0], edge_index[1]
+        keys = torch.minimum(source, target) * num_nodes + torch.maximum(
+            source, target
+        )
+        unique_keys, inverse = torch.unique(keys, return_inverse=True)
+        self.edges = torch.stack(
+            [unique_keys // num_nodes, unique_keys % num_nodes], dim=1
+        )
+        self.edge_attr = None
+        if edge_attr is not None:
+            last = torch.full(
+                (unique_keys.shape[0],), -1, dtype=torch.long
+            ).scatter_reduce(
+                0, inverse, torch.arange(keys.shape[0]), reduce="amax"
+            )
+            self.edge_attr = edge_attr[last]
+
+        # Adjacency in CSR format, self-loops being stored once
+        loops = self.edges[:, 0] == self.edges[:, 1]
+        adjacency = torch.cat(
+            [self.edges.t(), self.edges[~loops].t().flip(0)], dim=1
+        )
+        order = torch.argsort(adjacency[0] * num_nodes + adjacency[1])
+        self.col = adjacency[1, order]
+        self.ptr = torch.zeros(num_nodes + 1, dtype=torch.long)
+        self.ptr[1:] = torch.cumsum(
+            torch.bincount(adjacency[0], minlength=num_nodes), dim=0
+        )
+        self._graph = None
+
+    @classmethod
+    def from_data(
+        cls, data: torch_geometric.data.Data, edge_attr=None
+    ) -> "ArrayGraph":
+        r"""Build the graph of a data object.
+
+        Parameters
+        ----------
+        data : torch_geometric.data.Data
+            The input data.
+        edge_attr : torch.Tensor, optional
+            Edge features to attach to the graph. Default is None.
+
+        Returns
+        -------
+        ArrayGraph
+            The graph of the data object.
+        """
+        return cls(
+            data.edge_index, data.x.shape[0], x=data.x, edge_attr=edge_attr
+        )
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(num_nodes={self.num_nodes}, "
+            f"num_edges={self.num_edges})"
+        )
+
+    @property
+    def num_edges(self) -> int:
+        r"""Number of undirected edges, self-loops included.
+
+        Returns
+        -------
+        int
+            Number of edges.
+        """
+        return self.edges.shape[0]
+
+    @property
+    def edge_index(self) -> torch.Tensor:
+        r"""Edge indices in both directions, sorted by source node.
+
+        Returns
+        -------
+        torch.Tensor
+            Edge indices of shape (2, num_directed_edges).
+        """
+        return torch.stack(
+            [
+                torch.repeat_interleave(
+                    torch.arange(self.num_nodes), self.degree()
+                ),
+                self.col,
+            ]
+        )
+
+    def degree(self) -> torch.Tensor:
+        r"""Return the number of neighbors of every node.
+
+        Returns
+        -------
+        torch.Tensor
+            Degrees of the nodes (a self-loop counts once).
+        """
+        return self.ptr[1:] - self.ptr[:-1]
+
+    def neighbors(self, node: int) -> torch.Tensor:
+        r"""Return the sorted neighbors of a node.
+
+        Parameters
+        ----------
+        node : int
+            Index of the node.
+
+        Returns
+        -------
+        torch.Tensor
+            Neighbors of the node.
+        """
+        return self.col[self.ptr[node] : self.ptr[node + 1]]
+
+    def to_networkx(self) -> nx.Graph:
+        r"""Return the graph as a networkx graph.
+
+        The graph is built on the first call and cached. Nodes and edges
+        carry their features as `features` attributes, together with their
+        dimension `dim`.
+
+        Returns
+        -------
+        nx.Graph
+            The networkx graph.
+        """
+        if self._graph is None:
+            graph = nx.Graph()
+            if self.x is not None:
+                graph.add_nodes_from(
+                    (node, {"features": features, "dim": 0})
+                    for node, features in enumerate(self.x)
+                )
+            else:
+                graph.add_nodes_from(range(self.num_nodes), dim=0)
+            edges = self.edges.tolist()
+            if self.edge_attr is not None:
+                graph.add_edges_from(
+                    (u, v, {"features": features, "dim": 1})
+                    for (u, v), features in zip(
+                        edges, self.edge_attr, strict=True
+                    )
+                )
+            else:
+                graph.add_edges_from(edges)
+            self._graph = graph
+        return self._graph
@@ -23,6 +23,7 @@ class Graph2CellLifting(GraphLifting):
         super().__init__(**kwargs)
         self.complex_dim = complex_dim
         self.type = "graph2cell"
+        self.neighborhoods = kwargs.get("neighborhoods")
 
     def _get_lifted_topology(
         self, cell_complex: CellComplex, graph: nx.Graph
@@ -42,7 +43,7 @@ class Graph2CellLifting(GraphLifting):
             The lifted topology.
         """
         lifted_topology = get_complex_connectivity(
-            cell_complex, self.complex_dim
+            cell_complex, self.complex_dim, neighborhoods=self.neighborhoods
         )
         lifted_topology["x_0"] = torch.stack(
             list(cell_complex.get_cell_attributes("features", 0).values())
@@ -1,9 +1,9 @@
 """This module implements the cycle lifting for graphs to cell complexes."""
 
-import networkx as nx
+import torch
 import torch_geometric
-from toponetx.classes import CellComplex
 
+from topobenchmarkx.data.utils import get_connectivity_from_incidences
 from topobenchmarkx.transforms.liftings.graph2cell.base import (
     Graph2CellLifting,
 )
@@ -40,17 +40,179 @@ class CellCycleLifting(Graph2CellLifting):
         dict
             The lifted topology.
         """
-        G = self._generate_graph_from_data(data)
-        cycles = nx.cycle_basis(G)
-        cell_complex = CellComplex(G)
+        graph = self._generate_array_graph(data)
+        num_nodes, edges = graph.num_nodes, graph.edges
 
-        # Eliminate self-loop cycles
-        cycles = [cycle for cycle in cycles if len(cycle) != 1]
+        cycles = cycle_basis(data.edge_index, num_nodes)
         # Eliminate cycles that are greater than the max_cell_lenght
         if self.max_cell_length is not None:
             cycles = [
                 cycle for cycle in cycles if len(cycle) <= self.max_cell_length
             ]
-        if len(cycles) != 0:
-            cell_complex.add_cells_from(cycles, rank=self.complex_dim)
-        return self._get_lifted_topology(cell_complex, G)
+
+        incidences = [
+            torch.sparse_coo_tensor(size=(0, num_nodes)).coalesce(),
+            edges_boundary(edges, num_nodes),
+            cycles_boundary(cycles, edges, num_nodes),
+        ]
+        lifted_topology = get_connectivity_from_incidences(
+            incidences,
+            [num_nodes, edges.shape[0], len(cycles)],
+            self.complex_dim,
+            neighborhoods=self.neighborhoods,
+        )
+        lifted_topology["x_0"] = graph.x
+        if self.contains_edge_attr:
+            lifted_topology["x_1"] = graph.edge_attr
+        return lifted_topology
+
+
+def edges_boundary(edges: torch.Tensor, num_nodes: int) -> torch.Tensor:
+    r"""Return the signed incidence matrix between nodes and edges.
+
+    An edge (u, v), with u < v, has sign -1 on u and +1 on v. A self-loop
+    (v, v) has a single +1 entry on v, as in toponetx.
+
+    Parameters
+    ----------
+    edges : torch.Tensor
+        Sorted edges of the graph, of shape (num_edges, 2).
+    num_nodes : int
+        Number of nodes of the graph.
+
+    Returns
+    -------
+    torch.sparse_coo_tensor
+        Signed incidence matrix of shape (num_nodes, num_edges).
+    """
+    edge_idx = torch.arange(edges.shape[0])
+    mask = edges[:, 0] != edges[:, 1]
+    rows = torch.cat([edges[mask, 0], edges[:, 1]])
+    cols = torch.cat([edge_idx[mask], edge_idx])
+    values = torch.cat(
+        [-torch.ones(int(mask.sum())), torch.ones(edges.shape[0])]
+    )
+    return torch.sparse_coo_tensor(
+        torch.stack([rows, cols]), values, size=(num_nodes, edges.shape[0])
+    ).coalesce()
+
+
+def cycle_basis(edge_index: torch.Tensor, num_nodes: int) -> list[list[int]]:
+    r"""Return a cycle basis of an undirected graph.
+
+    The basis is computed with Paton's spanning tree algorithm. The nodes are
+    visited with the same order as `networkx.cycle_basis` on the graph built
+    from `edge_index`, so that the same cycles are returned (self-loops
+    excepted, which are ignored).
+
+    Parameters
+    ----------
+    edge_index : torch.Tensor
+        Edge indices of the graph.
+    num_nodes : int
+        Number of nodes of the graph.
+
+    Returns
+    -------
+    list[list[int]]
+        Cycles of the basis, as lists of nodes.
+    """
+    # Adjacency lists, neighbors being ordered by first occurrence in
+    # edge_index
+    num_edges = edge_index.shape[1]
+    source = torch.cat([edge_index[0], edge_index[1]])
+    target = torch.cat([edge_index[1], edge_index[0]])
+    position = torch.arange(num_edges).repeat(2)
+    mask = source != target
+    source, target, position = source[mask], target[mask], position[mask]
+    keys = source * num_nodes + target
+    unique_keys, inverse = torch.unique(keys, return_inverse=True)
+    first = torch.full(
+        (unique_keys.shape[0],), num_edges, dtype=torch.long
+    ).scatter_reduce(0, inverse, position, reduce="amin")
+    source = unique_keys // num_nodes
+    target = unique_keys % num_nodes
+    order = torch.argsort(source * (num_edges + 1) + first)
+    ptr = torch.zeros(num_nodes + 1, dtype=torch.long)
+    ptr[1:] = torch.cumsum(torch.bincount(source, minlength=num_nodes), 0)
+    ptr = ptr.tolist()
+    target = target[order].tolist()
+
+    cycles = []
+    visited = [False] * num_nodes
+    for root in range(num_nodes):
+        if visited[root]:
+            continue
+        stack = [root]
+        pred = {root: root}
+        used = {root: set()}
+        while stack:
+            z = stack.pop()
+            z_used = used[z]
+            for nbr in target[ptr[z] : ptr[z + 1]]:
+                if nbr not in used:
+                    pred[nbr] = z
+                    stack.append(nbr)
+                    used[nbr] = {z}
+                elif nbr not in z_used:
+                    nbr_used = used[nbr]
+                    cycle = [nbr, z]
+                    p = pred[z]
+                    while p not in nbr_used:
+                        cycle.append(p)
+                        p = pred[p]
+                    cycle.append(p)
+                    cycles.append(cycle)
+                    used[nbr].add(z)
+        for node in pred:
+            visited[node] = True
+    return cycles
+
+
+def cycles_boundary(
+    cycles: list[list[int]], edges: torch.Tensor, num_nodes: int
+) -> torch.Tensor:
+    r"""Return the signed incidence matrix between edges and 2-cells.
+
+    An edge (u, v), with u < v, has sign +1 in a cell traversing it from u to
+    v and -1 otherwise.
+
+    Parameters
+    ----------
+    cycles : list[list[int]]
+        Boundary cycles of the 2-cells, as lists of nodes.
+    edges : torch.Tensor
+        Sorted edges of the graph, of shape (num_edges, 2).
+    num_nodes : int
+        Number of nodes of the graph.
+
+    Returns
+    -------
+    torch.sparse_coo_tensor
+        Signed incidence matrix of shape (num_edges, num_cells).
+    """
+    lengths = torch.tensor([len(cycle) for cycle in cycles], dtype=torch.long)
+    if lengths.sum() == 0:
+        return torch.sparse_coo_tensor(
+            size=(edges.shape[0], len(cycles))
+        ).coalesce()
+    nodes = torch.tensor(
+        [node for cycle in cycles for node in cycle], dtype=torch.long
+    )
+    # Next node along every cycle
+    starts = torch.cumsum(lengths, 0) - lengths
+    cell_idx = torch.repeat_interleave(torch.arange(len(cycles)), lengths)
+    local = torch.arange(nodes.shape[0]) - starts[cell_idx]
+    next_nodes = nodes[starts[cell_idx] + (local + 1) % lengths[cell_idx]]
+
+    edge_keys = edges[:, 0] * num_nodes + edges[:, 1]
+    keys = torch.minimum(nodes, next_nodes) * num_nodes + torch.maximum(
+        nodes, next_nodes
+    )
+    edge_idx = torch.searchsorted(edge_keys, keys)
+    signs = torch.where(nodes < next_nodes, 1.0, -1.0)
+    return torch.sparse_coo_tensor(
+        torch.stack([edge_idx, cell_idx]),
+        signs,
+        size=(edges.shape[0], len(cycles)),
+    ).coalesce()
@@ -49,33 +49,49 @@ class HypergraphKHopLifting(Graph2HypergraphLifting):
         else:
             num_nodes = data.num_nodes
 
-        incidence_1 = torch.zeros(num_nodes, num_nodes)
-        edge_index = torch_geometric.utils.to_undirected(data.edge_index)
+        edge_index = torch_geometric.utils.to_undirected(
+            data.edge_index, num_nodes=num_nodes
+        )
+        # CSR representation of the graph
+        row, col = edge_index
+        ptr = torch.zeros(num_nodes + 1, dtype=torch.long)
+        ptr[1:] = torch.cumsum(torch.bincount(row, minlength=num_nodes), 0)
 
-        # Detect isolated nodes
-        isolated_nodes = [
-            i for i in range(num_nodes) if i not in edge_index[0]
-        ]
-        if len(isolated_nodes) > 0:
-            # Add completely isolated nodes to the edge_index
-            edge_index = torch.cat(
-                [
-                    edge_index,
-                    torch.tensor(
-                        [isolated_nodes, isolated_nodes], dtype=torch.long
-                    ),
-                ],
-                dim=1,
+        # Breadth-first search from all the nodes at once. The reached
+        # (center, node) pairs are stored as sorted keys center * N + node,
+        # every node reaching itself (which also covers isolated nodes).
+        nodes = torch.arange(num_nodes)
+        reached = nodes * num_nodes + nodes
+        frontier_centers, frontier_nodes = nodes, nodes
+        for _ in range(self.k):
+            counts = ptr[frontier_nodes + 1] - ptr[frontier_nodes]
+            if counts.sum() == 0:
+                break
+            centers = torch.repeat_interleave(frontier_centers, counts)
+            offsets = torch.arange(centers.shape[0]) - torch.repeat_interleave(
+                torch.cumsum(counts, 0) - counts, counts
             )
-
-        for n in range(num_nodes):
-            neighbors, _, _, _ = torch_geometric.utils.k_hop_subgraph(
-                n, self.k, edge_index
+            neighbors = col[
+                torch.repeat_interleave(ptr[frontier_nodes], counts) + offsets
+            ]
+            keys = torch.unique(centers * num_nodes + neighbors)
+            # Discard the pairs reached at a previous hop
+            pos = torch.searchsorted(reached, keys).clamp(
+                max=reached.shape[0] - 1
             )
-            incidence_1[n, neighbors] = 1
+            keys = keys[reached[pos] != keys]
+            if keys.shape[0] == 0:
+                break
+            reached = torch.sort(torch.cat([reached, keys])).values
+            frontier_centers = keys // num_nodes
+            frontier_nodes = keys % num_nodes
 
-        num_hyperedges = incidence_1.shape[1]
-        incidence_1 = torch.Tensor(incidence_1).to_sparse_coo()
+        num_hyperedges = num_nodes
+        incidence_1 = torch.sparse_coo_tensor(
+            torch.stack([reached // num_nodes, reached % num_nodes]),
+            torch.ones(reached.shape[0]),
+            size=(num_nodes, num_hyperedges),
+        ).coalesce()
         return {
             "incidence_hyperedges": incidence_1,
             "num_hyperedges": num_hyperedges,
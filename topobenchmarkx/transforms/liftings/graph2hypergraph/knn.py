@@ -43,45 +43,71 @@ class HypergraphKNNLifting(Graph2HypergraphLifting):
         num_nodes = data.x.shape[0]
         data.pos = data.x
         num_hyperedges = num_nodes
-        incidence_1 = torch.zeros(num_nodes, num_nodes)
         data_lifted = self.transform(data)
+        edge_index = data_lifted.edge_index
         # check for loops, since KNNGraph is inconsistent with nodes with equal features
         if self.loop:
-            for i in range(num_nodes):
-                if not torch.any(
-                    torch.all(
-                        data_lifted.edge_index == torch.tensor([[i, i]]).T,
-                        dim=0,
-                    )
-                ):
-                    connected_nodes = data_lifted.edge_index[
-                        0, data_lifted.edge_index[1] == i
-                    ]
-                    dists = torch.sqrt(
-                        torch.sum(
-                            (
-                                data.pos[connected_nodes]
-                                - data.pos[i].unsqueeze(0) ** 2
-                            ),
-                            dim=1,
-                        )
-                    )
-                    furthest = torch.argmax(dists)
-                    idx = torch.where(
-                        torch.all(
-                            data_lifted.edge_index
-                            == torch.tensor(
-                                [[connected_nodes[furthest], i]]
-                            ).T,
-                            dim=0,
-                        )
-                    )[0]
-                    data_lifted.edge_index[:, idx] = torch.tensor([[i, i]]).T
-
-        incidence_1[data_lifted.edge_index[1], data_lifted.edge_index[0]] = 1
-        incidence_1 = torch.Tensor(incidence_1).to_sparse_coo()
+            edge_index = self._repair_loops(edge_index, data.pos)
+
+        # Hyperedge i contains the nodes pointing to node i
+        keys = torch.unique(edge_index[1] * num_nodes + edge_index[0])
+        incidence_1 = torch.sparse_coo_tensor(
+            torch.stack([keys // num_nodes, keys % num_nodes]),
+            torch.ones(keys.shape[0]),
+            size=(num_nodes, num_hyperedges),
+        ).coalesce()
         return {
             "incidence_hyperedges": incidence_1,
             "num_hyperedges": num_hyperedges,
             "x_0": data.x,
         }
+
+    @staticmethod
+    def _repair_loops(edge_index, pos) -> torch.Tensor:
+        r"""Add the missing self-loops of a k-nearest neighbors graph.
+
+        For every node without self-loop, the edge coming from its farthest
+        neighbor is replaced by a self-loop, so that the number of neighbors
+        is unchanged. All the nodes are processed at once.
+
+        Parameters
+        ----------
+        edge_index : torch.Tensor
+            Edge indices of the k-nearest neighbors graph, the edges pointing
+            from the neighbors to the nodes.
+        pos : torch.Tensor
+            Positions of the nodes.
+
+        Returns
+        -------
+        torch.Tensor
+            Edge indices with one self-loop per node with incoming edges.
+        """
+        num_nodes = pos.shape[0]
+        source, target = edge_index
+        has_loop = torch.zeros(num_nodes, dtype=torch.bool)
+        has_loop[target[source == target]] = True
+        candidates = torch.where(~has_loop[target])[0]
+        if candidates.shape[0] == 0:
+            return edge_index
+
+        # Farthest neighbor of every node without self-loop, the first edge
+        # being selected in case of ties
+        target = target[candidates]
+        dists = torch.sum((pos[source[candidates]] - pos[target]) ** 2, dim=1)
+        max_dists = torch.full(
+            (num_nodes,), float("-inf"), dtype=dists.dtype
+        ).scatter_reduce(0, target, dists, reduce="amax")
+        farthest = torch.full(
+            (num_nodes,), edge_index.shape[1], dtype=torch.long
+        ).scatter_reduce(
+            0,
+            target[dists == max_dists[target]],
+            candidates[dists == max_dists[target]],
+            reduce="amin",
+        )
+        farthest = farthest[farthest < edge_index.shape[1]]
+
+        edge_index = edge_index.clone()
+        edge_index[0, farthest] = edge_index[1, farthest]
+        return edge_index
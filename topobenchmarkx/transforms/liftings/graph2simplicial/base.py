@@ -1,11 +1,12 @@
 """Abstract class for lifting graphs to simplicial complexes."""
 
-import networkx as nx
 import torch
-from toponetx.classes import SimplicialComplex
 
-from topobenchmarkx.data.utils.utils import get_complex_connectivity
-from topobenchmarkx.transforms.liftings import GraphLifting
+from topobenchmarkx.data.utils.utils import (
+    get_simplicial_closure,
+    get_simplicial_connectivity,
+)
+from topobenchmarkx.transforms.liftings import ArrayGraph, GraphLifting
 
 
 class Graph2SimplicialLifting(GraphLifting):
@@ -24,17 +25,20 @@ class Graph2SimplicialLifting(GraphLifting):
         self.complex_dim = complex_dim
         self.type = "graph2simplicial"
         self.signed = kwargs.get("signed", False)
+        self.neighborhoods = kwargs.get("neighborhoods")
 
     def _get_lifted_topology(
-        self, simplicial_complex: SimplicialComplex, graph: nx.Graph
+        self, simplices: list[torch.Tensor], graph: ArrayGraph
     ) -> dict:
         r"""Return the lifted topology.
 
         Parameters
         ----------
-        simplicial_complex : SimplicialComplex
-            The simplicial complex.
-        graph : nx.Graph
+        simplices : list[torch.Tensor]
+            The r-th tensor contains the r-simplices of the simplicial
+            complex as sorted rows. The faces of the simplices are added if
+            they are missing.
+        graph : ArrayGraph
             The input graph.
 
         Returns
@@ -42,25 +46,15 @@ class Graph2SimplicialLifting(GraphLifting):
         dict
             The lifted topology.
         """
-        lifted_topology = get_complex_connectivity(
-            simplicial_complex, self.complex_dim, signed=self.signed
-        )
-        lifted_topology["x_0"] = torch.stack(
-            list(
-                simplicial_complex.get_simplex_attributes(
-                    "features", 0
-                ).values()
-            )
+        simplices = get_simplicial_closure(simplices)
+        lifted_topology = get_simplicial_connectivity(
+            simplices,
+            self.complex_dim,
+            signed=self.signed,
+            neighborhoods=self.neighborhoods,
         )
+        lifted_topology["x_0"] = graph.x
         # If new edges have been added during the lifting process, we discard the edge attributes
-        if self.contains_edge_attr and simplicial_complex.shape[1] == (
-            graph.number_of_edges()
-        ):
-            lifted_topology["x_1"] = torch.stack(
-                list(
-                    simplicial_complex.get_simplex_attributes(
-                        "features", 1
-                    ).values()
-                )
-            )
+        if self.contains_edge_attr and torch.equal(simplices[1], graph.edges):
+            lifted_topology["x_1"] = graph.edge_attr
         return lifted_topology
@@ -1,11 +1,7 @@
 """This module implements the CliqueLifting class, which lifts graphs to simplicial complexes."""
 
-from itertools import combinations
-from typing import Any
-
-import networkx as nx
+import torch
 import torch_geometric
-from toponetx.classes import SimplicialComplex
 
 from topobenchmarkx.transforms.liftings.graph2simplicial import (
     Graph2SimplicialLifting,
@@ -39,18 +35,99 @@ class SimplicialCliqueLifting(Graph2SimplicialLifting):
         dict
             The lifted topology.
         """
-        graph = self._generate_graph_from_data(data)
-        simplicial_complex = SimplicialComplex(graph)
-        cliques = nx.find_cliques(graph)
-        simplices: list[set[tuple[Any, ...]]] = [
-            set() for _ in range(2, self.complex_dim + 1)
+        graph = self._generate_array_graph(data)
+        loops = graph.edges[:, 0] == graph.edges[:, 1]
+        cliques = enumerate_cliques(
+            graph.edges[~loops].t(), graph.num_nodes, self.complex_dim + 1
+        )
+        simplices = [
+            torch.arange(graph.num_nodes).unsqueeze(1),
+            graph.edges[~loops],
+            *cliques,
         ]
-        for clique in cliques:
-            for i in range(2, self.complex_dim + 1):
-                for c in combinations(clique, i + 1):
-                    simplices[i - 2].add(tuple(c))
+        return self._get_lifted_topology(simplices, graph)
+
+
+def enumerate_cliques(
+    edge_index: torch.Tensor, num_nodes: int, max_size: int
+) -> list[torch.Tensor]:
+    r"""Enumerate all the cliques of a graph with 3 to `max_size` nodes.
+
+    The edges are oriented from lower to higher (degree, index) rank, so that
+    every clique is generated exactly once as a rank-increasing sequence. The
+    cliques of size k + 1 are obtained by extending each k-clique with the
+    out-neighbours of its highest ranked node that are adjacent to all the
+    other nodes of the clique. Adjacency is tested on the sorted keys of the
+    oriented edges, so that every extension step is a handful of vectorized
+    operations.
+
+    Parameters
+    ----------
+    edge_index : torch.Tensor
+        Edge indices of the graph, of shape (2, num_edges).
+    num_nodes : int
+        Number of nodes of the graph.
+    max_size : int
+        Maximum number of nodes of the enumerated cliques.
+
+    Returns
+    -------
+    list[torch.Tensor]
+        The k-th tensor has shape (num_cliques, k + 3) and contains the
+        cliques with k + 3 nodes, every row being sorted in increasing
+        order.
+    """
+    # Undirected edges without self-loops
+    edge_index = edge_index[:, edge_index[0] != edge_index[1]]
+    edge_index = torch_geometric.utils.to_undirected(
+        edge_index, num_nodes=num_nodes
+    )
+    degree = torch_geometric.utils.degree(
+        edge_index[0], num_nodes, dtype=torch.long
+    )
+    # Rank of the nodes by (degree, index)
+    order = torch.argsort(degree * num_nodes + torch.arange(num_nodes))
+    rank = torch.empty_like(order)
+    rank[order] = torch.arange(num_nodes)
+
+    # Orient the edges from lower to higher rank and build the CSR structure
+    row, col = edge_index
+    mask = rank[row] < rank[col]
+    row, col = row[mask], col[mask]
+    keys, perm = torch.sort(row * num_nodes + col)
+    row, col = row[perm], col[perm]
+    ptr = torch.zeros(num_nodes + 1, dtype=torch.long)
+    ptr[1:] = torch.cumsum(torch.bincount(row, minlength=num_nodes), dim=0)
 
-        for set_k_simplices in simplices:
-            simplicial_complex.add_simplices_from(list(set_k_simplices))
+    cliques = []
+    # Cliques are stored as rank-increasing sequences of nodes
+    current = torch.stack([row, col], dim=1)
+    for _ in range(3, max_size + 1):
+        if current.shape[0] == 0:
+            break
+        last = current[:, -1]
+        counts = ptr[last + 1] - ptr[last]
+        clique_ids = torch.repeat_interleave(
+            torch.arange(current.shape[0]), counts
+        )
+        # Position of every candidate in the CSR column array
+        starts = torch.repeat_interleave(ptr[last], counts)
+        local = torch.arange(clique_ids.shape[0]) - torch.repeat_interleave(
+            torch.cumsum(counts, dim=0) - counts, counts
+        )
+        candidates = col[starts + local]
 
-        return self._get_lifted_topology(simplicial_complex, graph)
+        # Keep the candidates adjacent to all the other nodes of the clique
+        members = current[clique_ids, :-1]
+        candidate_keys = members * num_nodes + candidates.unsqueeze(1)
+        # Non-empty cliques imply that there is at least one oriented edge
+        pos = torch.searchsorted(keys, candidate_keys).clamp(
+            max=keys.shape[0] - 1
+        )
+        is_clique = (keys[pos] == candidate_keys).all(dim=1)
+        current = torch.cat(
+            [current[clique_ids[is_clique]], candidates[is_clique, None]],
+            dim=1,
+        )
+        cliques.append(torch.sort(current, dim=1).values)
+    return cliques
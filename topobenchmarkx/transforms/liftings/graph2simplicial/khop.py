@@ -1,11 +1,11 @@
 """This module implements the k-hop lifting of graphs to simplicial complexes."""
 
+import itertools
+import math
 import random
-from itertools import combinations
-from typing import Any
 
+import torch
 import torch_geometric
-from toponetx.classes import SimplicialComplex
 
 from topobenchmarkx.transforms.liftings.graph2simplicial.base import (
     Graph2SimplicialLifting,
@@ -49,28 +49,173 @@ class SimplicialKHopLifting(Graph2SimplicialLifting):
         dict
             The lifted topology.
         """
-        graph = self._generate_graph_from_data(data)
-        simplicial_complex = SimplicialComplex(graph)
-        edge_index = torch_geometric.utils.to_undirected(data.edge_index)
-        simplices: list[set[tuple[Any, ...]]] = [
-            set() for _ in range(2, self.complex_dim + 1)
+        graph = self._generate_array_graph(data)
+        loops = graph.edges[:, 0] == graph.edges[:, 1]
+        simplices = [
+            torch.arange(graph.num_nodes).unsqueeze(1),
+            graph.edges[~loops],
         ]
-        for n in range(graph.number_of_nodes()):
-            # Find 1-hop node n neighbors
-            neighbors, _, _, _ = torch_geometric.utils.k_hop_subgraph(
-                n, 1, edge_index
-            )
-            if n not in neighbors:
-                neighbors.append(n)
-            neighbors = neighbors.numpy()
-            neighbors = set(neighbors)
-            for i in range(1, self.complex_dim):
-                for c in combinations(neighbors, i + 1):
-                    simplices[i - 1].add(tuple(c))
-        for set_k_simplices in simplices:
-            list_k_simplices = list(set_k_simplices)
-            if len(set_k_simplices) > self.max_k_simplices:
-                random.shuffle(list_k_simplices)
-                list_k_simplices = list_k_simplices[: self.max_k_simplices]
-            simplicial_complex.add_simplices_from(list_k_simplices)
-        return self._get_lifted_topology(simplicial_complex, graph)
+        ptr, col = closed_neighborhoods(data.edge_index, graph.num_nodes)
+        for size in range(2, self.complex_dim + 1):
+            sampled = torch.tensor(
+                sample_neighborhood_simplices(
+                    ptr, col, size, self.max_k_simplices
+                ),
+                dtype=torch.long,
+            ).reshape(-1, size)
+            if size == 2:
+                simplices[1] = torch.cat([simplices[1], sampled])
+            else:
+                simplices.append(sampled)
+        return self._get_lifted_topology(simplices, graph)
+
+
+def closed_neighborhoods(
+    edge_index: torch.Tensor, num_nodes: int
+) -> tuple[torch.Tensor, torch.Tensor]:
+    r"""Return the closed 1-hop neighborhoods of the nodes in CSR format.
+
+    Parameters
+    ----------
+    edge_index : torch.Tensor
+        Edge indices of the graph.
+    num_nodes : int
+        Number of nodes of the graph.
+
+    Returns
+    -------
+    tuple[torch.Tensor, torch.Tensor]
+        The offsets `ptr` and the column indices `col`, such that
+        `col[ptr[v]:ptr[v + 1]]` is the sorted closed neighborhood of node v
+        (the node itself included).
+    """
+    nodes = torch.arange(num_nodes)
+    edge_index = torch_geometric.utils.coalesce(
+        torch.cat(
+            [edge_index, edge_index.flip(0), torch.stack([nodes, nodes])],
+            dim=1,
+        ),
+        num_nodes=num_nodes,
+    )
+    ptr = torch.zeros(num_nodes + 1, dtype=torch.long)
+    ptr[1:] = torch.cumsum(
+        torch.bincount(edge_index[0], minlength=num_nodes), dim=0
+    )
+    return ptr, edge_index[1]
+
+
+def sample_neighborhood_simplices(
+    ptr: torch.Tensor,
+    col: torch.Tensor,
+    size: int,
+    max_simplices: int,
+    trials_factor: int = 20,
+) -> list[tuple[int, ...]]:
+    r"""Sample simplices contained in the closed neighborhoods of the nodes.
+
+    The candidate simplices are the distinct subsets of `size` nodes of the
+    closed neighborhood of some node. If there are at most `max_simplices` of
+    them, they are all returned, otherwise a uniformly random subset of
+    `max_simplices` of them is returned. Memory and runtime are bounded by
+    `max_simplices` rather than by the maximum degree:
+
+    - When the number of subsets counted with multiplicity is small, they are
+      enumerated from the CSR structure, grouping the nodes by degree.
+    - Otherwise, a node is drawn with probability proportional to the number
+      of its subsets, then one of its subsets uniformly. The draw is kept only
+      if the node is the owner of the subset, i.e. the smallest node whose
+      closed neighborhood contains it, which makes every distinct simplex
+      equally likely.
+    - In dense neighborhoods the owner is rarely drawn, so if the trial budget
+      is exhausted, the draws are kept whatever their owner (favoring the
+      simplices shared by many neighborhoods) for another trial budget. Fewer
+      than `max_simplices` simplices may then be returned.
+
+    Parameters
+    ----------
+    ptr : torch.Tensor
+        CSR offsets of the closed neighborhoods.
+    col : torch.Tensor
+        CSR column indices of the closed neighborhoods.
+    size : int
+        Number of nodes of the simplices.
+    max_simplices : int
+        Maximum number of returned simplices.
+    trials_factor : int, optional
+        Number of sampling trials per requested simplex. Default is 20.
+
+    Returns
+    -------
+    list[tuple[int, ...]]
+        Simplices as sorted tuples of nodes.
+    """
+    degrees = (ptr[1:] - ptr[:-1]).tolist()
+    weights = [math.comb(degree, size) for degree in degrees]
+    total = sum(weights)
+    if total == 0:
+        return []
+
+    if total <= trials_factor * max_simplices:
+        simplices = _enumerate_neighborhood_simplices(ptr, col, size)
+        if len(simplices) > max_simplices:
+            simplices = random.sample(simplices, max_simplices)
+        return simplices
+
+    neighborhoods: dict[int, list[int]] = {}
+
+    def neighborhood(node):
+        if node not in neighborhoods:
+            neighborhoods[node] = col[ptr[node] : ptr[node + 1]].tolist()
+        return neighborhoods[node]
+
+    def owner(simplex):
+        common = set(neighborhood(simplex[0]))
+        for node in simplex[1:]:
+            common.intersection_update(neighborhood(node))
+        return min(common)
+
+    nodes = range(len(degrees))
+    cum_weights = list(itertools.accumulate(weights))
+    num_trials = trials_factor * max_simplices
+    sampled: set[tuple[int, ...]] = set()
+    for trial in range(2 * num_trials):
+        node = random.choices(nodes, cum_weights=cum_weights)[0]
+        simplex = tuple(sorted(random.sample(neighborhood(node), size)))
+        # Owners are only enforced during the first trial budget
+        if trial >= num_trials or owner(simplex) == node:
+            sampled.add(simplex)
+            if len(sampled) == max_simplices:
+                break
+    return list(sampled)
+
+
+def _enumerate_neighborhood_simplices(
+    ptr: torch.Tensor, col: torch.Tensor, size: int
+) -> list[tuple[int, ...]]:
+    r"""Enumerate the distinct subsets of the closed neighborhoods.
+
+    Parameters
+    ----------
+    ptr : torch.Tensor
+        CSR offsets of the closed neighborhoods.
+    col : torch.Tensor
+        CSR column indices of the closed neighborhoods.
+    size : int
+        Number of nodes of the subsets.
+
+    Returns
+    -------
+    list[tuple[int, ...]]
+        Distinct subsets as sorted tuples of nodes.
+    """
+    degrees = ptr[1:] - ptr[:-1]
+    subsets = []
+    for degree in torch.unique(degrees[degrees >= size]).tolist():
+        nodes = torch.where(degrees == degree)[0]
+        # Closed neighborhoods of all the nodes with this degree
+        neighborhoods = col[ptr[nodes].unsqueeze(1) + torch.arange(degree)]
+        combs = torch.combinations(torch.arange(degree), size)
+        subsets.append(neighborhoods[:, combs].reshape(-1, size))
+    if len(subsets) == 0:
+        return []
+    return list(map(tuple, torch.unique(torch.cat(subsets), dim=0).tolist()))
@@ -2,9 +2,9 @@
 
 import networkx as nx
 import torch_geometric
-from torch_geometric.utils.undirected import is_undirected, to_undirected
 
 from topobenchmarkx.transforms.liftings import AbstractLifting
+from topobenchmarkx.transforms.liftings.graph import ArrayGraph
 
 
 class GraphLifting(AbstractLifting):
@@ -44,11 +44,37 @@ class GraphLifting(AbstractLifting):
         """
         return hasattr(data, "edge_attr") and data.edge_attr is not None
 
+    def _generate_array_graph(
+        self, data: torch_geometric.data.Data
+    ) -> ArrayGraph:
+        r"""Generate an array-backed graph from the input data object.
+
+        Parameters
+        ----------
+        data : torch_geometric.data.Data
+            The input data.
+
+        Returns
+        -------
+        ArrayGraph
+            The generated graph, holding the node features and, if they are
+            preserved, the edge features.
+        """
+        self.contains_edge_attr = (
+            self.preserve_edge_attr and self._data_has_edge_attr(data)
+        )
+        return ArrayGraph.from_data(
+            data, edge_attr=data.edge_attr if self.contains_edge_attr else None
+        )
+
     def _generate_graph_from_data(
         self, data: torch_geometric.data.Data
     ) -> nx.Graph:
         r"""Generate a NetworkX graph from the input data object.
 
+        Liftings that do not need networkx algorithms should use
+        `_generate_array_graph` instead.
+
         Parameters
         ----------
         data : torch_geometric.data.Data
@@ -59,42 +85,7 @@ class GraphLifting(AbstractLifting):
         nx.Graph
             The generated NetworkX graph.
         """
-        # Check if data object have edge_attr, return list of tuples as [(node_id, {'features':data}, 'dim':1)] or ??
-        nodes = [
-            (n, dict(features=data.x[n], dim=0))
-            for n in range(data.x.shape[0])
-        ]
-
-        if self.preserve_edge_attr and self._data_has_edge_attr(data):
-            # In case edge features are given, assign features to every edge
-            edge_index, edge_attr = (
-                data.edge_index,
-                (
-                    data.edge_attr
-                    if is_undirected(data.edge_index, data.edge_attr)
-                    else to_undirected(data.edge_index, data.edge_attr)
-                ),
-            )
-            edges = [
-                (i.item(), j.item(), dict(features=edge_attr[edge_idx], dim=1))
-                for edge_idx, (i, j) in enumerate(
-                    zip(edge_index[0], edge_index[1], strict=False)
-                )
-            ]
-            self.contains_edge_attr = True
-        else:
-            # If edge_attr is not present, return list list of edges
-            edges = [
-                (i.item(), j.item(), {})
-                for i, j in zip(
-                    data.edge_index[0], data.edge_index[1], strict=False
-                )
-            ]
-            self.contains_edge_attr = False
-        graph = nx.Graph()
-        graph.add_nodes_from(nodes)
-        graph.add_edges_from(edges)
-        return graph
+        return self._generate_array_graph(data).to_networkx()
 
 
 class PointCloudLifting(AbstractLifting):